@@ -1,4 +1,5 @@
 import logging
+from pathlib import Path
 
 import httpx
 import uvicorn
@@ -9,6 +10,10 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from api import v1
 from api.config import load_config
 from api.main_factory import create_app
+from api.v1.dependencies import CurrencyAPI, PriceHub
+from api.v1.dependencies.price_hub import ReplayPriceFeed
+from api.v1.dependencies.price_providers import create_price_providers
+from api.v1.dependencies.price_refresher import PriceRefresher
 
 
 def main():
@@ -19,13 +24,43 @@ def main():
     config = load_config()
     engine = create_async_engine(url=config.db.make_url, echo=True)
     async_session = async_sessionmaker(engine, expire_on_commit=False)
+    replica_session = None
+    if config.replica_db is not None:
+        replica_engine = create_async_engine(url=config.replica_db.make_url,
+                                             echo=True)
+        replica_session = async_sessionmaker(replica_engine,
+                                             expire_on_commit=False)
 
     client = httpx.AsyncClient()
+    currency_provider, crypto_provider = create_price_providers(
+        config.price_provider, config.fcsapi_access_key, client)
+    currency_api = CurrencyAPI(currency_provider, crypto_provider,
+                               config.price_cache_ttl,
+                               timeout=config.price_api_timeout,
+                               max_stale_age=config.price_max_stale_age,
+                               rejected_code_cooldown=(
+                                   config.price_rejected_code_cooldown))
+    price_hub = PriceHub(config.price_hub_size,
+                         config.price_hub_holdings_ttl)
+    currency_api.subscribe_crypto_prices(price_hub.publish_prices)
+    if config.price_replay_path is not None:
+        replay_feed = ReplayPriceFeed(price_hub,
+                                      Path(config.price_replay_path),
+                                      config.price_replay_speed,
+                                      loop=True)
+        app.add_event_handler('startup', replay_feed.start)
+        app.add_event_handler('shutdown', replay_feed.stop)
+    price_refresher = PriceRefresher(replica_session or async_session,
+                                     currency_api,
+                                     config.price_refresh_interval)
+    app.add_event_handler('startup', price_refresher.start)
+    app.add_event_handler('shutdown', price_refresher.stop)
     app.add_event_handler('shutdown', client.aclose)
 
     api_router_v1 = APIRouter()
 
-    v1.dependencies.setup(app, api_router_v1, async_session, config, client)
+    v1.dependencies.setup(app, api_router_v1, async_session, config,
+                          currency_api, price_hub, replica_session)
     v1.routes.setup_routers(api_router_v1)
 
     main_api_router = APIRouter(prefix='/api')
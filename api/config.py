@@ -3,22 +3,69 @@ from datetime import timedelta
 
 from dotenv import load_dotenv
 
-from finances.models.dto import Config, DatabaseConfig, AuthConfig
+from finances.models.dto import Config, DatabaseConfig, AuthConfig, \
+    PriceProviderConfig
+
+
+def load_replica_db_config(db: DatabaseConfig) -> DatabaseConfig | None:
+    host = os.getenv('PG_REPLICA_HOST')
+    if host is None:
+        return None
+    return DatabaseConfig(
+        host=host,
+        username=os.getenv('PG_REPLICA_USERNAME', db.username),
+        password=os.getenv('PG_REPLICA_PASSWORD', db.password),
+        database=os.getenv('PG_REPLICA_DATABASE', db.database),
+    )
 
 
 def load_config() -> Config:
     load_dotenv()
 
+    db = DatabaseConfig(
+        host=os.getenv('PG_HOST'),
+        username=os.getenv('PG_USERNAME'),
+        password=os.getenv('PG_PASSWORD'),
+        database=os.getenv('PG_DATABASE'),
+    )
     return Config(
-        db=DatabaseConfig(
-            host=os.getenv('PG_HOST'),
-            username=os.getenv('PG_USERNAME'),
-            password=os.getenv('PG_PASSWORD'),
-            database=os.getenv('PG_DATABASE'),
-        ),
+        db=db,
         auth=AuthConfig(
             secret_key=os.getenv('SECRET_KEY'),
-            token_expire=timedelta(days=365)
+            token_expire=timedelta(days=365),
+            password_hash_workers=int(
+                os.getenv('PASSWORD_HASH_WORKERS', 4)),
+            credential_versions_refresh_interval=timedelta(
+                seconds=int(os.getenv('CREDENTIAL_VERSIONS_REFRESH_INTERVAL',
+                                      30)))
+        ),
+        fcsapi_access_key=os.getenv('FCSAPI_API_KEY'),
+        price_cache_ttl=timedelta(
+            seconds=int(os.getenv('PRICE_CACHE_TTL', 300))),
+        price_refresh_interval=timedelta(
+            seconds=int(os.getenv('PRICE_REFRESH_INTERVAL', 60))),
+        price_api_timeout=timedelta(
+            seconds=float(os.getenv('PRICE_API_TIMEOUT', 2))),
+        price_max_stale_age=timedelta(
+            seconds=int(os.getenv('PRICE_MAX_STALE_AGE', 3600))),
+        price_rejected_code_cooldown=timedelta(
+            seconds=int(os.getenv('PRICE_REJECTED_CODE_COOLDOWN', 3600))),
+        price_provider=PriceProviderConfig(
+            name=os.getenv('PRICE_PROVIDER', 'live'),
+            stub_prices_path=os.getenv('STUB_PRICES_PATH'),
+            stub_latency=timedelta(
+                milliseconds=float(os.getenv('STUB_PRICE_LATENCY_MS', 0))),
+            stub_error_rate=float(os.getenv('STUB_PRICE_ERROR_RATE', 0)),
+            fcsapi_chunk_size=int(os.getenv('FCSAPI_CHUNK_SIZE', 20)),
+            fcsapi_max_concurrency=int(
+                os.getenv('FCSAPI_MAX_CONCURRENCY', 4))
         ),
-        fcsapi_access_key=os.getenv('FCSAPI_API_KEY')
+        price_replay_path=os.getenv('PRICE_REPLAY_PATH'),
+        price_replay_speed=float(os.getenv('PRICE_REPLAY_SPEED', 1)),
+        price_hub_size=int(os.getenv('PRICE_HUB_SIZE', 10000)),
+        price_hub_holdings_ttl=timedelta(
+            seconds=int(os.getenv('PRICE_HUB_HOLDINGS_TTL', 60))),
+        replica_db=load_replica_db_config(db),
+        replica_lag=timedelta(
+            seconds=float(os.getenv('PG_REPLICA_LAG', 5)))
     )
@@ -1,11 +1,14 @@
-import httpx
 from fastapi import FastAPI, APIRouter
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from api.v1.dependencies.auth import AuthProvider, get_current_user, \
     get_auth_provider
+from api.v1.dependencies.credential_versions_refresher import \
+    CredentialVersionsRefresher
 from api.v1.dependencies.currency_api import currency_api_provider, CurrencyAPI
-from api.v1.dependencies.db import DatabaseProvider, dao_provider
+from api.v1.dependencies.db import DatabaseProvider, dao_provider, \
+    primary_dao_provider
+from api.v1.dependencies.price_hub import price_hub_provider, PriceHub
 from finances.models.dto.config import Config
 
 
@@ -13,15 +16,26 @@ def setup(app: FastAPI,
           api_router: APIRouter,
           db_sessionmaker: async_sessionmaker,
           config: Config,
-          client: httpx.AsyncClient
+          currency_api: CurrencyAPI,
+          price_hub: PriceHub,
+          replica_sessionmaker: async_sessionmaker | None = None
           ):
-    db_provider = DatabaseProvider(session=db_sessionmaker)
+    db_provider = DatabaseProvider(session=db_sessionmaker,
+                                   replica_session=replica_sessionmaker,
+                                   read_your_writes=config.replica_lag)
     auth_provider = AuthProvider(config.auth)
-    currency_api = CurrencyAPI(config.fcsapi_access_key, client)
 
     api_router.include_router(auth_provider.router)
+    app.add_event_handler('shutdown', auth_provider.shutdown)
+    credential_versions_refresher = CredentialVersionsRefresher(
+        db_sessionmaker, auth_provider,
+        config.auth.credential_versions_refresh_interval)
+    app.add_event_handler('startup', credential_versions_refresher.start)
+    app.add_event_handler('shutdown', credential_versions_refresher.stop)
 
     app.dependency_overrides[dao_provider] = db_provider.dao
+    app.dependency_overrides[primary_dao_provider] = db_provider.primary_dao
     app.dependency_overrides[get_current_user] = auth_provider.get_current_user
     app.dependency_overrides[get_auth_provider] = lambda: auth_provider
     app.dependency_overrides[currency_api_provider] = lambda: currency_api
+    app.dependency_overrides[price_hub_provider] = lambda: price_hub
@@ -1,4 +1,8 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta, datetime
+from typing import Iterable
+from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
@@ -12,6 +16,7 @@ from finances.database.dao import DAO
 from finances.exceptions.user import UserNotFound
 from finances.models import dto
 from finances.models.dto.config import AuthConfig
+from finances.models.enums.user_type import UserType
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='api/v1/auth/login')
 
@@ -24,10 +29,47 @@ def get_auth_provider():
     raise NotImplementedError
 
 
+class CredentialVersions:
+    def __init__(self):
+        self._versions: dict[UUID, int] = {}
+        self._revoked: set[UUID] = set()
+
+    def get(self, user_id: UUID) -> int:
+        return self._versions.get(user_id, 0)
+
+    def is_known(self, user_id: UUID) -> bool:
+        return user_id in self._versions or user_id in self._revoked
+
+    def set(self, user_id: UUID, version: int):
+        if user_id not in self._versions or version > self.get(user_id):
+            self._versions[user_id] = version
+
+    def apply_changes(self, versions: dict[UUID, int],
+                      deleted: Iterable[UUID]):
+        # unknown users are checked against the database on first use
+        for user_id, version in versions.items():
+            if user_id in self._versions:
+                self.set(user_id, version)
+        for user_id in deleted:
+            self.revoke(user_id)
+
+    def revoke(self, user_id: UUID):
+        self._versions.pop(user_id, None)
+        self._revoked.add(user_id)
+
+    def is_valid(self, user_id: UUID, version: int) -> bool:
+        return user_id not in self._revoked and \
+            version >= self.get(user_id)
+
+
 class AuthProvider:
     def __init__(self, config: AuthConfig):
         self.config = config
+        self.credential_versions = CredentialVersions()
         self.pwd_context = CryptContext(schemes=['bcrypt'], deprecated='auto')
+        self.password_hash_executor = ThreadPoolExecutor(
+            max_workers=config.password_hash_workers,
+            thread_name_prefix='password-hash')
         self.secret_key = config.secret_key
         self.algorythm = 'HS256'
         self.access_token_expire = config.token_expire
@@ -41,6 +83,19 @@ class AuthProvider:
     def get_password_hash(self, password: str) -> str:
         return self.pwd_context.hash(password)
 
+    async def verify_password_async(self, plain_password: str,
+                                    hashed_password: str) -> bool:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.password_hash_executor, self.verify_password,
+            plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.password_hash_executor, self.get_password_hash, password)
+
+    def shutdown(self):
+        self.password_hash_executor.shutdown(wait=False, cancel_futures=True)
+
     async def authenticate_user(self, username: str, password: str,
                                 dao: DAO) -> dto.User:
         http_status_401 = HTTPException(
@@ -52,8 +107,10 @@ class AuthProvider:
             user = await dao.user.get_by_username_with_password(username)
         except UserNotFound:
             raise http_status_401
-        if not self.verify_password(password, user.hashed_password or ''):
+        if not await self.verify_password_async(password,
+                                                user.hashed_password or ''):
             raise http_status_401
+        self.credential_versions.set(user.id, user.credential_version)
         return user.without_password()
 
     def create_access_token(self, data: dict,
@@ -67,9 +124,19 @@ class AuthProvider:
 
     def create_user_token(self, user: dto.User) -> Token:
         return self.create_access_token(
-            data={'sub': user.username}, expires_delta=self.access_token_expire
+            data={'sub': user.username,
+                  'uid': str(user.id),
+                  'type': user.user_type.value,
+                  'ver': self.credential_versions.get(user.id)},
+            expires_delta=self.access_token_expire
         )
 
+    def set_credential_version(self, user: dto.User, version: int):
+        self.credential_versions.set(user.id, version)
+
+    def revoke_user(self, user: dto.User):
+        self.credential_versions.revoke(user.id)
+
     async def get_current_user(
             self,
             token: str = Depends(oauth2_scheme),
@@ -86,14 +153,43 @@ class AuthProvider:
             username: str = payload.get('sub')
             if username is None:
                 raise credentials_exception
-        except JWTError:
+            if 'uid' in payload:
+                user = dto.User(id=UUID(payload['uid']),
+                                username=username,
+                                user_type=UserType(payload['type']))
+                version = int(payload['ver'])
+            else:
+                user = None
+                version = 0
+        except (JWTError, KeyError, TypeError, ValueError):
             raise credentials_exception
-        try:
-            user = await dao.user.get_by_username(username=username)
-        except UserNotFound:
+        if user is None:
+            user = await self._get_user_by_username(username, dao)
+        if not self.credential_versions.is_known(user.id):
+            try:
+                self.credential_versions.set(
+                    user.id, await dao.user.get_credential_version(user.id))
+            except UserNotFound:
+                self.credential_versions.revoke(user.id)
+        if not self.credential_versions.is_valid(user.id, version):
             raise credentials_exception
         return user
 
+    async def _get_user_by_username(self, username: str,
+                                    dao: DAO) -> dto.User:
+        try:
+            return await dao.user.get_by_username(username=username)
+        except UserNotFound:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail='Could not validate credentials',
+                headers={'WWW-Authenticate': 'Bearer'},
+            )
+
+    async def load_credential_changes(self, dao: DAO, since: datetime):
+        self.credential_versions.apply_changes(
+            *await dao.user.get_credential_changes(since))
+
     async def login_route(self,
                           form_data: OAuth2PasswordRequestForm = Depends(),
                           dao: DAO = Depends(dao_provider),
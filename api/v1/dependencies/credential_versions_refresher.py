@@ -0,0 +1,32 @@
+from datetime import timedelta, datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.v1.dependencies.auth import AuthProvider
+from api.v1.dependencies.periodic_task import PeriodicTask
+from finances.database.dao import DAO
+
+
+class CredentialVersionsRefresher(PeriodicTask):
+    def __init__(self, session: async_sessionmaker,
+                 auth_provider: AuthProvider, interval: timedelta):
+        super().__init__(interval)
+        self.session = session
+        self.auth_provider = auth_provider
+        # changes are read with an overlap, so that a change committed after
+        # a previous read but stamped before it is not missed
+        self.overlap = interval
+        self._since: datetime | None = None
+
+    async def start(self):
+        await self.run_once()
+        self._start(self.interval)
+
+    async def run_once(self):
+        async with self.session() as s:
+            dao = DAO(session=s)
+            server_time = await dao.user.get_server_time()
+            if self._since is not None:
+                await self.auth_provider.load_credential_changes(dao,
+                                                                 self._since)
+        self._since = server_time - self.overlap
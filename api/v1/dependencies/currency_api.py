@@ -1,84 +1,386 @@
+import asyncio
 import logging
+import time
 from _decimal import Decimal
 from dataclasses import dataclass
+from datetime import timedelta, datetime
+from typing import Iterable, Coroutine, Callable, Awaitable
 
-from httpx import AsyncClient
+from api.v1.dependencies.price_providers import (
+    CantGetPrice, PriceProvider, PriceProviderUnavailable,
+    PriceProviderPartiallyUnavailable, PriceCodesRejected
+)
 
 
 def currency_api_provider():
     raise NotImplementedError
 
 
-class CantGetPrice(Exception):
-    def __init__(self):
-        super().__init__('Unable to get price')
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 3,
+                 reset_timeout: timedelta = timedelta(seconds=30)):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened is not None
+
+    def allow_request(self) -> bool:
+        if self.opened is None:
+            return True
+        if time.monotonic() - self.opened < \
+                self.reset_timeout.total_seconds():
+            return False
+        # half-open: let a single trial request through
+        self.opened = time.monotonic()
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            if self.opened is None:
+                logging.warning(f'[CircuitBreaker:{self.name}] opened')
+            self.opened = time.monotonic()
+
+
+@dataclass
+class CachedPrice:
+    price: Decimal
+    updated: datetime
 
 
-@dataclass(frozen=True)
-class FCSAPI:
-    access_key: str
-    base_url: str = 'https://fcsapi.com/api-v3/forex'
+class PriceCache:
+    def __init__(self, ttl: timedelta,
+                 max_stale_age: timedelta = timedelta(hours=1)):
+        self.ttl = ttl
+        self.max_stale_age = max_stale_age
+        self._prices: dict[tuple[str, str], CachedPrice] = {}
+        self._refreshing: set[tuple[str, str]] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
 
+    def get(self, base: str, quote: str) -> CachedPrice | None:
+        cached_price = self._prices.get((base, quote))
+        if cached_price is not None and self.is_expired(cached_price):
+            del self._prices[(base, quote)]
+            cached_price = None
+        if cached_price is None:
+            self.misses += 1
+        elif self.is_stale(cached_price):
+            self.stale_hits += 1
+        else:
+            self.hits += 1
+        return cached_price
 
-@dataclass(frozen=True)
-class BinanceAPI:
-    base_url: str = 'https://api.binance.com/api/v3/'
+    def put(self, base: str, quote: str, price: Decimal):
+        self._prices[(base, quote)] = CachedPrice(price=price,
+                                                  updated=datetime.utcnow())
+
+    def is_stale(self, cached_price: CachedPrice) -> bool:
+        return datetime.utcnow() - cached_price.updated > self.ttl
+
+    def is_expired(self, cached_price: CachedPrice) -> bool:
+        return datetime.utcnow() - cached_price.updated > self.max_stale_age
+
+    def get_updated(self, pairs: Iterable[tuple[str, str]]) \
+            -> datetime | None:
+        updated = [self._prices[pair].updated for pair in pairs if
+                   pair in self._prices]
+        return min(updated) if updated else None
+
+    def start_refresh(self, pairs: set[tuple[str, str]]) \
+            -> set[tuple[str, str]]:
+        pairs = pairs - self._refreshing
+        self._refreshing.update(pairs)
+        return pairs
+
+    def finish_refresh(self, pairs: set[tuple[str, str]]):
+        self._refreshing.difference_update(pairs)
+
+
+class CryptoPriceBatch:
+    def __init__(self):
+        self.codes: set[str] = set()
+        self.result: asyncio.Future[dict[str, Decimal]] = \
+            asyncio.get_running_loop().create_future()
 
 
 class CurrencyAPI:
-    def __init__(self, access_key: str, client: AsyncClient):
-        self._client = client
-        self.fcsapi = FCSAPI(access_key=access_key)
-        self.binance_api = BinanceAPI()
+    pivot_currency = 'USD'
+
+    def __init__(self, currency_provider: PriceProvider,
+                 crypto_provider: PriceProvider,
+                 price_cache_ttl: timedelta = timedelta(minutes=5),
+                 crypto_batch_window: timedelta = timedelta(milliseconds=10),
+                 timeout: timedelta = timedelta(seconds=2),
+                 max_stale_age: timedelta = timedelta(hours=1),
+                 rejected_code_cooldown: timedelta = timedelta(hours=1)):
+        self.currency_provider = currency_provider
+        self.crypto_provider = crypto_provider
+        self.timeout = timeout.total_seconds()
+        self.currency_breaker = CircuitBreaker(currency_provider.name)
+        self.crypto_breaker = CircuitBreaker(crypto_provider.name)
+        self.price_cache = PriceCache(price_cache_ttl, max_stale_age)
+        self.crypto_batch_window = crypto_batch_window.total_seconds()
+        self._pending_crypto_batch: CryptoPriceBatch | None = None
+        self._crypto_batches: dict[str, CryptoPriceBatch] = {}
+        self.rejected_code_cooldown = rejected_code_cooldown.total_seconds()
+        self._rejected_crypto_codes: dict[str, float] = {}
+        self._background_tasks: set[asyncio.Task] = set()
+        self._crypto_price_listeners: list[
+            Callable[[dict[str, Decimal]], None]] = []
+
+    def subscribe_crypto_prices(
+            self,
+            callback: Callable[[dict[str, Decimal]], None]
+    ):
+        self._crypto_price_listeners.append(callback)
+
+    def _put_crypto_prices(self, prices: dict[str, Decimal]):
+        for code, price in prices.items():
+            self.price_cache.put(code, 'BUSD', price)
+        for callback in self._crypto_price_listeners:
+            callback(prices)
+
+    def _run_in_background(self, coro: Coroutine):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _get_prices(self, provider: PriceProvider,
+                          breaker: CircuitBreaker,
+                          codes: set[str]) -> dict[str, Decimal]:
+        if not breaker.allow_request():
+            raise CantGetPrice
+        timeout = self.timeout * provider.get_request_rounds(codes)
+        try:
+            prices = await asyncio.wait_for(provider.get_prices(codes),
+                                            timeout=timeout)
+        except PriceProviderPartiallyUnavailable as e:
+            breaker.record_failure()
+            logging.error(f'[{breaker.name}:get_prices] {e!r}')
+            return e.prices
+        except (asyncio.TimeoutError, PriceProviderUnavailable) as e:
+            breaker.record_failure()
+            logging.error(f'[{breaker.name}:get_prices] {e!r}')
+            raise CantGetPrice from e
+        breaker.record_success()
+        return prices
+
+    def is_stale(self, updated: datetime | None) -> bool:
+        return updated is not None and \
+            datetime.utcnow() - updated > self.price_cache.ttl
+
+    def _get_cached_prices(self, pairs: set[tuple[str, str]]) \
+            -> tuple[dict[tuple[str, str], Decimal], set[tuple[str, str]]]:
+        prices = {}
+        stale_pairs = set()
+        for pair in pairs:
+            cached_price = self.price_cache.get(*pair)
+            if cached_price is None:
+                continue
+            prices[pair] = cached_price.price
+            if self.price_cache.is_stale(cached_price):
+                stale_pairs.add(pair)
+        return prices, stale_pairs
+
+    def _refresh_in_background(
+            self,
+            pairs: set[tuple[str, str]],
+            refresh: Callable[[set[tuple[str, str]]], Awaitable]
+    ):
+        pairs = self.price_cache.start_refresh(pairs)
+        if not pairs:
+            return
+
+        async def run_refresh():
+            try:
+                await refresh(pairs)
+            except Exception as e:
+                logging.error(f'[CurrencyAPI:refresh_in_background] {e!r}')
+            finally:
+                self.price_cache.finish_refresh(pairs)
+
+        self._run_in_background(run_refresh())
 
     async def get_currency_prices(
             self,
             currencies: set[str],
             base_currency: str = 'USD'
     ) -> dict[str, Decimal]:
-        response = await self._client.get(
-            f'{self.fcsapi.base_url}/latest',
-            params={
-                'symbol': ','.join(
-                    f'{base_currency}/{currency}' for currency in currencies),
-                'access_key': self.fcsapi.access_key
-            }
-        )
-        response_json = response.json()
-        status = response_json.get('status', False)
-        if not status:
-            logging.error(
-                f'[FSCAPI:get_currency_prices] response: {response_json}')
+        pivot_prices = await self._get_pivot_prices(
+            set(currencies) | {base_currency})
+        base_price = pivot_prices.get(base_currency)
+        if base_price is None:
             raise CantGetPrice
 
-        return {currency['s'].split('/')[-1]: Decimal(currency['c']) for
-                currency in response_json['response']}
+        return {currency: pivot_prices[currency] / base_price for currency in
+                currencies if currency in pivot_prices}
+
+    def get_currency_prices_updated(
+            self,
+            currencies: set[str],
+            base_currency: str = 'USD'
+    ) -> datetime | None:
+        return self.price_cache.get_updated(
+            (self.pivot_currency, currency) for currency in
+            set(currencies) | {base_currency})
+
+    async def _get_pivot_prices(self, currencies: set[str]) \
+            -> dict[str, Decimal]:
+        pairs = {(self.pivot_currency, currency) for currency in currencies
+                 if currency != self.pivot_currency}
+        cached_prices, stale_pairs = self._get_cached_prices(pairs)
+        if stale_pairs:
+            self._refresh_in_background(
+                stale_pairs,
+                lambda refreshed: self.refresh_currency_prices(
+                    {quote for _, quote in refreshed})
+            )
+
+        prices = {quote: price for (_, quote), price in cached_prices.items()}
+        prices[self.pivot_currency] = Decimal('1')
+        missing_currencies = currencies - prices.keys()
+        if missing_currencies:
+            try:
+                prices.update(await self.refresh_currency_prices(
+                    missing_currencies))
+            except CantGetPrice:
+                logging.error('[CurrencyAPI:get_pivot_prices] unable to get '
+                              f'{sorted(missing_currencies)}')
+        return prices
+
+    async def refresh_currency_prices(self, currencies: set[str]) \
+            -> dict[str, Decimal]:
+        prices = await self._get_prices(self.currency_provider,
+                                        self.currency_breaker, currencies)
+        for currency, price in prices.items():
+            self.price_cache.put(self.pivot_currency, currency, price)
+        return prices
 
     async def get_crypto_currency_price(self, crypto_code: str) -> Decimal:
-        response = await self._client.get(
-            f'{self.binance_api.base_url}ticker/price?symbol={crypto_code}BUSD'
-        )
-        crypto_currency = response.json()
-        if response.status_code != 200:
-            logging.error(
-                f'[BinanceAPI:get_crypto_currency_price] response: '
-                f'{crypto_currency}')
+        try:
+            prices = await self._get_prices(self.crypto_provider,
+                                            self.crypto_breaker,
+                                            {crypto_code})
+        except CantGetPrice:
+            cached_price = self.price_cache.get(crypto_code, 'BUSD')
+            if cached_price is None:
+                raise
+            return cached_price.price
+
+        price = prices.get(crypto_code)
+        if price is None:
             raise CantGetPrice
-        return crypto_currency['price']
+        self._put_crypto_prices({crypto_code: price})
+        return price
 
     async def get_crypto_currency_prices(self, crypto_codes: list[str]) \
             -> dict[str, Decimal]:
-        response = await self._client.get(
-            self.binance_api.base_url + 'ticker/price?symbols',
-            params={
-                'symbols': '[' + ','.join(
-                    f'"{code}BUSD"' for code in crypto_codes) + ']'
-            }
-        )
-        prices = response.json()
-        if response.status_code != 200:
-            logging.error(
-                f'[BinanceAPI:get_crypto_currency_prices] response: {prices}')
-            raise CantGetPrice
+        pairs = {(code, 'BUSD') for code in crypto_codes}
+        cached_prices, stale_pairs = self._get_cached_prices(pairs)
+        if stale_pairs:
+            self._refresh_in_background(
+                stale_pairs,
+                lambda refreshed: self.refresh_crypto_currency_prices(
+                    {code for code, _ in refreshed})
+            )
+
+        prices = {f'{code}{quote}': price for (code, quote), price in
+                  cached_prices.items()}
+        missing_codes = {code for code, quote in pairs if
+                         (code, quote) not in cached_prices}
+        if missing_codes:
+            prices.update(await self._get_batched_crypto_prices(
+                missing_codes))
+        return prices
+
+    def get_crypto_currency_prices_updated(self, crypto_codes: list[str]) \
+            -> datetime | None:
+        return self.price_cache.get_updated(
+            (code, 'BUSD') for code in crypto_codes)
+
+    async def _get_batched_crypto_prices(self, crypto_codes: set[str]) \
+            -> dict[str, Decimal]:
+        batches = {}
+        for code in crypto_codes:
+            batch = self._crypto_batches.get(code)
+            if batch is None:
+                batch = self._get_pending_crypto_batch()
+                batch.codes.add(code)
+                self._crypto_batches[code] = batch
+            batches[id(batch)] = batch
 
-        return {price['symbol']: Decimal(price['price']) for price in prices}
+        symbols = {f'{code}BUSD' for code in crypto_codes}
+        prices = {}
+        for batch in batches.values():
+            try:
+                batch_prices = await asyncio.shield(batch.result)
+            except CantGetPrice:
+                if batch.codes <= crypto_codes:
+                    raise
+                # the merged request may fail because of another caller's
+                # symbol, so retry with our own symbols only
+                batch_prices = await self.refresh_crypto_currency_prices(
+                    crypto_codes & batch.codes)
+            prices.update({symbol: price for symbol, price in
+                           batch_prices.items() if symbol in symbols})
+        return prices
+
+    def _get_pending_crypto_batch(self) -> CryptoPriceBatch:
+        if self._pending_crypto_batch is None:
+            self._pending_crypto_batch = CryptoPriceBatch()
+            self._run_in_background(
+                self._send_crypto_batch(self._pending_crypto_batch))
+        return self._pending_crypto_batch
+
+    async def _send_crypto_batch(self, batch: CryptoPriceBatch):
+        await asyncio.sleep(self.crypto_batch_window)
+        self._pending_crypto_batch = None
+        try:
+            prices = await self.refresh_crypto_currency_prices(batch.codes)
+        except Exception as e:
+            batch.result.set_exception(e)
+        else:
+            batch.result.set_result(prices)
+        finally:
+            for code in batch.codes:
+                if self._crypto_batches.get(code) is batch:
+                    del self._crypto_batches[code]
+
+    def _skip_rejected_crypto_codes(self, crypto_codes: set[str]) \
+            -> set[str]:
+        now = time.monotonic()
+        for code, rejected in list(self._rejected_crypto_codes.items()):
+            if now - rejected >= self.rejected_code_cooldown:
+                del self._rejected_crypto_codes[code]
+        return crypto_codes - self._rejected_crypto_codes.keys()
+
+    async def refresh_crypto_currency_prices(self, crypto_codes: set[str]) \
+            -> dict[str, Decimal]:
+        crypto_codes = self._skip_rejected_crypto_codes(crypto_codes)
+        if not crypto_codes:
+            raise CantGetPrice
+        try:
+            prices = await self._get_prices(self.crypto_provider,
+                                            self.crypto_breaker, crypto_codes)
+        except PriceCodesRejected:
+            # a request for several codes does not tell which one was
+            # rejected, so only remember single codes
+            if len(crypto_codes) == 1:
+                code, = crypto_codes
+                logging.warning('[CurrencyAPI:refresh_crypto_currency_prices]'
+                                f' {code} rejected')
+                self._rejected_crypto_codes[code] = time.monotonic()
+            raise
+        self._put_crypto_prices(prices)
+        return {f'{code}BUSD': price for code, price in prices.items()}
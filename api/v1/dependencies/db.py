@@ -1,16 +1,86 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from fastapi import Request
 from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from finances.database.dao import DAO
 
+READ_METHODS = {'GET', 'HEAD'}
+READ_PRIMARY_HEADER = 'X-Read-Primary'
+
 
 def dao_provider() -> DAO:
     raise NotImplementedError
 
 
+def primary_dao_provider() -> DAO:
+    raise NotImplementedError
+
+
+class RecentWrites:
+    def __init__(self, window: timedelta):
+        self.window = window
+        self._writes: OrderedDict[str, datetime] = OrderedDict()
+
+    def put(self, client: str):
+        if not self.window:
+            return
+        self._writes[client] = datetime.utcnow()
+        self._writes.move_to_end(client)
+        self._drop_expired()
+
+    def contains(self, client: str) -> bool:
+        written = self._writes.get(client)
+        return written is not None and \
+            datetime.utcnow() - written < self.window
+
+    def _drop_expired(self):
+        while self._writes:
+            written = next(iter(self._writes.values()))
+            if datetime.utcnow() - written < self.window:
+                break
+            self._writes.popitem(last=False)
+
+
 class DatabaseProvider:
-    def __init__(self, session: async_sessionmaker):
+    def __init__(self, session: async_sessionmaker,
+                 replica_session: async_sessionmaker | None = None,
+                 read_your_writes: timedelta = timedelta(seconds=5)):
         self.session = session
+        self.replica_session = replica_session
+        self.recent_writes = RecentWrites(read_your_writes)
+
+    @staticmethod
+    def _get_client(request: Request) -> str:
+        authorization = request.headers.get('Authorization')
+        if authorization is not None:
+            return authorization
+        return request.client.host if request.client else ''
+
+    def _use_replica(self, request: Request) -> bool:
+        return self.replica_session is not None and \
+            request.method in READ_METHODS and \
+            READ_PRIMARY_HEADER not in request.headers and \
+            not self.recent_writes.contains(self._get_client(request))
+
+    async def dao(self, request: Request):
+        if self._use_replica(request):
+            async with self.replica_session() as s:
+                yield DAO(session=s)
+            return
+        if request.method in READ_METHODS:
+            async with self.session() as s:
+                yield DAO(session=s)
+            return
+        client = self._get_client(request)
+        self.recent_writes.put(client)
+        try:
+            async with self.session() as s:
+                yield DAO(session=s)
+        finally:
+            self.recent_writes.put(client)
 
-    async def dao(self):
+    async def primary_dao(self):
         async with self.session() as s:
             yield DAO(session=s)
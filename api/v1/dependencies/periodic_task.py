@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from datetime import timedelta
+
+
+class PeriodicTask:
+    def __init__(self, interval: timedelta):
+        self.interval = interval.total_seconds()
+        self._task: asyncio.Task | None = None
+
+    async def start(self):
+        self._start()
+
+    def _start(self, delay: float = 0):
+        self._task = asyncio.create_task(self._run(delay))
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self):
+        raise NotImplementedError
+
+    def is_done(self) -> bool:
+        return False
+
+    async def _run(self, delay: float):
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.interval
+            try:
+                await self.run_once()
+            except Exception as e:
+                logging.error(f'[{type(self).__name__}:run_once] {e!r}')
+            if self.is_done():
+                return
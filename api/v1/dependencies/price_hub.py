@@ -0,0 +1,158 @@
+import asyncio
+import json
+from _decimal import Decimal
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import monotonic
+from typing import Callable
+from uuid import UUID
+
+from api.v1.dependencies.periodic_task import PeriodicTask
+from finances.models import dto
+
+
+def price_hub_provider():
+    raise NotImplementedError
+
+
+class PortfolioValuation:
+    def __init__(self, holdings: dict[str, Decimal]):
+        self.holdings = holdings
+        self.total = Decimal(0)
+        self.missing_prices = len(holdings)
+        self.tracked = monotonic()
+
+
+class PriceHub:
+    def __init__(self, max_valuations: int = 10000,
+                 holdings_ttl: timedelta = timedelta(minutes=1)):
+        self.max_valuations = max_valuations
+        self.holdings_ttl = holdings_ttl.total_seconds()
+        self.prices: dict[str, Decimal] = {}
+        self.updated: dict[str, datetime] = {}
+        self._valuations: OrderedDict[tuple[UUID, UUID],
+                                      PortfolioValuation] = OrderedDict()
+        self._holders: dict[str, set[tuple[UUID, UUID]]] = {}
+        self._subscribers: list[Callable[[dto.PriceTick], None]] = []
+
+    def subscribe(self, callback: Callable[[dto.PriceTick], None]):
+        self._subscribers.append(callback)
+
+    def publish(self, tick: dto.PriceTick):
+        old_price = self.prices.get(tick.code)
+        self.prices[tick.code] = tick.price
+        self.updated[tick.code] = tick.time
+        for key in self._holders.get(tick.code, ()):
+            valuation = self._valuations[key]
+            amount = valuation.holdings[tick.code]
+            if old_price is None:
+                valuation.missing_prices -= 1
+                valuation.total += amount * tick.price
+            else:
+                valuation.total += amount * (tick.price - old_price)
+
+        for callback in self._subscribers:
+            callback(tick)
+
+    def publish_prices(self, prices: dict[str, Decimal],
+                       time: datetime | None = None):
+        time = time or datetime.utcnow()
+        for code, price in prices.items():
+            self.publish(dto.PriceTick(code=code, price=price, time=time))
+
+    def track(self, user_id: UUID, portfolio_id: UUID,
+              holdings: dict[str, Decimal]):
+        key = (user_id, portfolio_id)
+        self.invalidate(user_id, portfolio_id)
+        valuation = PortfolioValuation(holdings)
+        for code, amount in holdings.items():
+            self._holders.setdefault(code, set()).add(key)
+            price = self.prices.get(code)
+            if price is not None:
+                valuation.missing_prices -= 1
+                valuation.total += amount * price
+        self._valuations[key] = valuation
+        while len(self._valuations) > self.max_valuations:
+            self.invalidate(*next(iter(self._valuations)))
+
+    def invalidate(self, user_id: UUID, portfolio_id: UUID | None = None):
+        if portfolio_id is None:
+            keys = [key for key in self._valuations if key[0] == user_id]
+        else:
+            keys = [(user_id, portfolio_id)]
+
+        for key in keys:
+            valuation = self._valuations.pop(key, None)
+            if valuation is None:
+                continue
+            for code in valuation.holdings:
+                holders = self._holders[code]
+                holders.discard(key)
+                if not holders:
+                    del self._holders[code]
+
+    def get_valuation(self, user_id: UUID, portfolio_id: UUID) \
+            -> tuple[Decimal, datetime | None] | None:
+        valuation = self._valuations.get((user_id, portfolio_id))
+        if valuation is None:
+            return None
+        if monotonic() - valuation.tracked > self.holdings_ttl:
+            # holdings may have been changed through another worker
+            self.invalidate(user_id, portfolio_id)
+            return None
+        if valuation.missing_prices:
+            return None
+        self._valuations.move_to_end((user_id, portfolio_id))
+        updated = [self.updated[code] for code in valuation.holdings]
+        return valuation.total, min(updated) if updated else None
+
+    def get_missing_codes(self, codes: set[str]) -> set[str]:
+        return codes - self.prices.keys()
+
+
+class ReplayPriceFeed(PeriodicTask):
+    def __init__(self, hub: PriceHub, path: Path, speed: float = 1,
+                 loop: bool = False):
+        super().__init__(timedelta())
+        self.hub = hub
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.replayed = 0
+
+    def read_ticks(self) -> list[dto.PriceTick]:
+        ticks = []
+        with open(self.path) as ticks_file:
+            for line in ticks_file:
+                if not line.strip():
+                    continue
+                tick = json.loads(line)
+                ticks.append(dto.PriceTick(
+                    code=tick['code'],
+                    price=Decimal(str(tick['price'])),
+                    time=datetime.fromisoformat(tick['time'])
+                ))
+        return ticks
+
+    async def replay(self) -> int:
+        ticks = self.read_ticks()
+        if not ticks:
+            return 0
+        first_tick_time = ticks[0].time
+        started = datetime.utcnow()
+        for tick in ticks:
+            delay = (tick.time - first_tick_time) / self.speed - \
+                (datetime.utcnow() - started)
+            if delay > timedelta():
+                await asyncio.sleep(delay.total_seconds())
+            self.hub.publish(dto.PriceTick(code=tick.code, price=tick.price,
+                                           time=datetime.utcnow()))
+        return len(ticks)
+
+    async def run_once(self):
+        self.replayed = 0
+        self.replayed = await self.replay()
+
+    def is_done(self) -> bool:
+        return not self.loop or not self.replayed
@@ -0,0 +1,218 @@
+import asyncio
+import json
+import logging
+import random
+import zlib
+from _decimal import Decimal
+from datetime import timedelta
+from pathlib import Path
+from typing import Protocol
+
+import httpx
+from httpx import AsyncClient, Response
+
+from finances.models.dto import PriceProviderConfig
+
+
+class CantGetPrice(Exception):
+    def __init__(self):
+        super().__init__('Unable to get price')
+
+
+class PriceProviderUnavailable(CantGetPrice):
+    pass
+
+
+class PriceCodesRejected(CantGetPrice):
+    pass
+
+
+class PriceProviderPartiallyUnavailable(PriceProviderUnavailable):
+    def __init__(self, prices: dict[str, Decimal]):
+        super().__init__()
+        self.prices = prices
+
+
+class PriceProvider(Protocol):
+    name: str
+
+    async def get_prices(self, codes: set[str]) -> dict[str, Decimal]:
+        ...
+
+    def get_request_rounds(self, codes: set[str]) -> int:
+        ...
+
+
+class FCSAPIProvider:
+    name = 'FCSAPI'
+    base_url = 'https://fcsapi.com/api-v3/forex'
+    pivot_currency = 'USD'
+
+    def __init__(self, access_key: str, client: AsyncClient,
+                 chunk_size: int = 20, max_concurrency: int = 4):
+        self.access_key = access_key
+        self._client = client
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    def get_request_rounds(self, codes: set[str]) -> int:
+        chunks = -(-len(codes) // self.chunk_size)
+        return max(1, -(-chunks // self.max_concurrency))
+
+    async def get_prices(self, codes: set[str]) -> dict[str, Decimal]:
+        codes = sorted(codes)
+        chunks = [codes[i:i + self.chunk_size] for i in
+                  range(0, len(codes), self.chunk_size)]
+        results = await asyncio.gather(
+            *(self._get_chunk_prices(chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        prices = {}
+        errors = []
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, CantGetPrice):
+                errors.append(result)
+                for code in chunk:
+                    logging.error(f'[FCSAPI:get_prices] {code}: {result!r}')
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                prices.update(result)
+        unavailable = next((e for e in errors if
+                            isinstance(e, PriceProviderUnavailable)), None)
+        if errors and not prices:
+            raise unavailable or errors[0]
+        if unavailable is not None:
+            raise PriceProviderPartiallyUnavailable(prices)
+        return prices
+
+    async def _get_chunk_prices(self, codes: list[str]) \
+            -> dict[str, Decimal]:
+        async with self._semaphore:
+            response = await get(
+                self._client,
+                f'{self.base_url}/latest',
+                params={
+                    'symbol': ','.join(
+                        f'{self.pivot_currency}/{code}' for code in codes),
+                    'access_key': self.access_key
+                }
+            )
+        response_json = response.json()
+        status = response_json.get('status', False)
+        if not status:
+            logging.error(
+                f'[FSCAPI:get_currency_prices] response: {response_json}')
+            raise CantGetPrice
+
+        return {currency['s'].split('/')[-1]: Decimal(currency['c']) for
+                currency in response_json['response']}
+
+
+class BinanceProvider:
+    name = 'BinanceAPI'
+    base_url = 'https://api.binance.com/api/v3/'
+    quote = 'BUSD'
+
+    def __init__(self, client: AsyncClient):
+        self._client = client
+
+    def get_request_rounds(self, codes: set[str]) -> int:
+        return 1
+
+    async def get_prices(self, codes: set[str]) -> dict[str, Decimal]:
+        response = await get(
+            self._client,
+            self.base_url + 'ticker/price',
+            params={
+                'symbols': '[' + ','.join(
+                    f'"{code}{self.quote}"' for code in codes) + ']'
+            }
+        )
+        prices = response.json()
+        if response.status_code != 200:
+            logging.error(
+                f'[BinanceAPI:get_crypto_currency_prices] response: {prices}')
+            if response.status_code == 400:
+                raise PriceCodesRejected
+            raise CantGetPrice
+
+        return {price['symbol'].removesuffix(self.quote):
+                Decimal(price['price']) for price in prices}
+
+
+class StubPriceProvider:
+    def __init__(self, prices: dict[str, Decimal] | None = None,
+                 latency: timedelta = timedelta(),
+                 error_rate: float = 0,
+                 seed: int = 0,
+                 name: str = 'stub'):
+        self.name = name
+        self.prices = prices or {}
+        self.latency = latency.total_seconds()
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_file(cls, path: Path, **kwargs) -> 'StubPriceProvider':
+        with open(path) as prices_file:
+            prices = json.load(prices_file)
+        return cls({code: Decimal(str(price)) for code, price in
+                    prices.items()}, **kwargs)
+
+    def get_request_rounds(self, codes: set[str]) -> int:
+        return 1
+
+    def get_price(self, code: str) -> Decimal:
+        price = self.prices.get(code)
+        if price is None:
+            price = Decimal(100 + zlib.crc32(code.encode()) % 10000) / 100
+        return price
+
+    async def get_prices(self, codes: set[str]) -> dict[str, Decimal]:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            raise PriceProviderUnavailable
+        return {code: self.get_price(code) for code in codes}
+
+
+def create_price_providers(config: PriceProviderConfig, access_key: str,
+                           client: AsyncClient) \
+        -> tuple[PriceProvider, PriceProvider]:
+    if config.name == 'live':
+        return FCSAPIProvider(access_key, client, config.fcsapi_chunk_size,
+                              config.fcsapi_max_concurrency), \
+            BinanceProvider(client)
+    if config.name != 'stub':
+        raise ValueError(f'Unknown price provider: {config.name}')
+
+    kwargs = {'latency': config.stub_latency,
+              'error_rate': config.stub_error_rate}
+    if config.stub_prices_path is None:
+        return StubPriceProvider(name='stub-currency', **kwargs), \
+            StubPriceProvider(name='stub-crypto', seed=1, **kwargs)
+    # a single file serves both fiat codes (USD/code) and crypto codes
+    # (code/BUSD)
+    path = Path(config.stub_prices_path)
+    return StubPriceProvider.from_file(path, name='stub-currency',
+                                       **kwargs), \
+        StubPriceProvider.from_file(path, name='stub-crypto', seed=1,
+                                    **kwargs)
+
+
+async def get(client: AsyncClient, url: str,
+              params: dict | None = None) -> Response:
+    try:
+        response = await client.get(url, params=params)
+    except httpx.HTTPError as e:
+        logging.error(f'[PriceProvider:get] {url}: {e!r}')
+        raise PriceProviderUnavailable from e
+
+    if response.status_code >= 500:
+        logging.error(f'[PriceProvider:get] {url}: status '
+                      f'{response.status_code}')
+        raise PriceProviderUnavailable
+    return response
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.v1.dependencies.currency_api import CurrencyAPI
+from api.v1.dependencies.periodic_task import PeriodicTask
+from finances.database.dao import DAO
+from finances.services.currency_prices import refresh_held_prices
+
+
+class PriceRefresher(PeriodicTask):
+    def __init__(self, session: async_sessionmaker, currency_api: CurrencyAPI,
+                 interval: timedelta):
+        super().__init__(interval)
+        self.session = session
+        self.currency_api = currency_api
+
+    async def run_once(self):
+        async with self.session() as s:
+            await refresh_held_prices(DAO(session=s), self.currency_api)
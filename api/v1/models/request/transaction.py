@@ -18,3 +18,17 @@ class TransactionCreate(BaseModel):
 
 class TransactionChange(TransactionCreate):
     id: int
+
+
+class TransactionsImport(BaseModel):
+    transactions: list[TransactionCreate] = Field(min_items=1,
+                                                  max_items=10000)
+
+
+class TransactionsBatchChange(BaseModel):
+    transactions: list[TransactionChange] = Field(min_items=1,
+                                                  max_items=10000)
+
+
+class TransactionsBatchDelete(BaseModel):
+    ids: list[int] = Field(min_items=1, max_items=10000)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from _decimal import Decimal
 from dataclasses import dataclass
+from datetime import date
 from uuid import UUID
 
 from finances.models import dto
@@ -24,3 +25,18 @@ class AssetResponse:
             currency=CurrencyResponse.from_dto(
                 asset_dto.currency) if asset_dto.currency else None
         )
+
+
+@dataclass
+class AssetBalanceResponse:
+    asset_id: UUID
+    day: date
+    amount: Decimal
+
+    @classmethod
+    def from_dto(cls, balance_dto: dto.AssetBalance) -> AssetBalanceResponse:
+        return AssetBalanceResponse(
+            asset_id=balance_dto.asset_id,
+            day=balance_dto.day,
+            amount=balance_dto.amount
+        )
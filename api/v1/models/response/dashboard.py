@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from finances.models import dto
+
+from .total_result import TotalResult
+
+
+@dataclass
+class DashboardResponse:
+    assets: TotalResult
+    income: TotalResult
+    expense: TotalResult
+    categories: list[dto.TotalByCategory]
+    crypto_portfolio: TotalResult | None = None
+
+    @classmethod
+    def from_dto(cls, dashboard_dto: dto.Dashboard) -> DashboardResponse:
+        crypto_portfolio = dashboard_dto.crypto_portfolio
+        return DashboardResponse(
+            assets=TotalResult.from_dto(dashboard_dto.assets),
+            income=TotalResult.from_dto(dashboard_dto.income),
+            expense=TotalResult.from_dto(dashboard_dto.expense),
+            categories=dashboard_dto.categories,
+            crypto_portfolio=TotalResult.from_dto(crypto_portfolio)
+            if crypto_portfolio else None
+        )
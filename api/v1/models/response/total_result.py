@@ -1,13 +1,48 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from dataclasses import dataclass, field
 from datetime import datetime, date
 
+from finances.models import dto
+
 from .transaction import TransactionResponse
 
 
 @dataclass
 class TotalResult:
-    total: float
-    server_time: datetime = datetime.utcnow()
+    total: float | None
+    prices_updated: datetime | None = None
+    stale: bool = False
+    missing_prices: list[str] = field(default_factory=list)
+    server_time: datetime = field(default_factory=datetime.utcnow)
+
+    @classmethod
+    def from_dto(cls, total_dto: dto.Total) -> TotalResult:
+        return TotalResult(
+            total=total_dto.total,
+            prices_updated=total_dto.prices_updated,
+            stale=total_dto.stale,
+            missing_prices=total_dto.missing_prices
+        )
+
+
+@dataclass
+class TotalSeriesResult:
+    series: list[dto.TotalByPeriod]
+    prices_updated: datetime | None = None
+    stale: bool = False
+    missing_prices: list[str] = field(default_factory=list)
+    server_time: datetime = field(default_factory=datetime.utcnow)
+
+    @classmethod
+    def from_dto(cls, total_series_dto: dto.TotalSeries) \
+            -> TotalSeriesResult:
+        return TotalSeriesResult(
+            series=total_series_dto.series,
+            prices_updated=total_series_dto.prices_updated,
+            stale=total_series_dto.stale,
+            missing_prices=total_series_dto.missing_prices
+        )
 
 
 @dataclass
@@ -29,3 +29,8 @@ class TransactionResponse:
             amount=category_dto.amount,
             created=category_dto.created
         )
+
+
+@dataclass
+class TransactionsBatchResult:
+    count: int
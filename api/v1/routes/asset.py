@@ -1,20 +1,22 @@
+from datetime import date
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from starlette import status
 
 from api.v1.dependencies import get_current_user, dao_provider, CurrencyAPI, \
-    currency_api_provider
+    currency_api_provider, primary_dao_provider
 from api.v1.dependencies.currency_api import CantGetPrice
 from api.v1.models.request.asset import AssetCreate, AssetChange
-from api.v1.models.response.asset import AssetResponse
+from api.v1.models.response.asset import AssetResponse, \
+    AssetBalanceResponse
 from api.v1.models.response.total_result import TotalResult
 from finances.database.dao import DAO
 from finances.exceptions.asset import AssetNotFound, AssetExists
 from finances.exceptions.currency import CurrencyNotFound
 from finances.models import dto
 from finances.services.asset import add_new_asset, get_asset_by_id, \
-    change_asset, delete_asset, get_total_assets
+    change_asset, delete_asset, get_total_assets, get_asset_balance
 
 
 async def get_asset_by_id_route(
@@ -62,8 +64,7 @@ async def change_asset_route(
         dao: DAO = Depends(dao_provider)
 ) -> AssetResponse:
     try:
-        asset_dto = await change_asset(asset.dict(), current_user, dao.asset,
-                                       dao.currency)
+        asset_dto = await change_asset(asset.dict(), current_user, dao)
     except (CurrencyNotFound, AssetNotFound) as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=e.message)
@@ -94,7 +95,23 @@ async def get_total_assets_route(
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                             detail='Unable to calculate total price')
     else:
-        return TotalResult(total=total)
+        return TotalResult.from_dto(total)
+
+
+async def get_asset_balance_route(
+        asset_id: UUID = Query(alias='assetId'),
+        balance_date: date = Query(alias='date'),
+        current_user: dto.User = Depends(get_current_user),
+        dao: DAO = Depends(primary_dao_provider)
+) -> AssetBalanceResponse:
+    try:
+        balance = await get_asset_balance(asset_id, balance_date,
+                                          current_user, dao)
+    except AssetNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=e.message)
+    else:
+        return AssetBalanceResponse.from_dto(balance)
 
 
 def get_asset_router() -> APIRouter:
@@ -104,6 +121,8 @@ def get_asset_router() -> APIRouter:
     router.add_api_route('/all', get_all_assets_route, methods=['GET'])
     router.add_api_route('/totalPrices', get_total_assets_route,
                          methods=['GET'])
+    router.add_api_route('/balance', get_asset_balance_route,
+                         methods=['GET'])
     router.add_api_route('/{asset_id}', delete_asset_route,
                          methods=['DELETE'])
     router.add_api_route('/{asset_id}', get_asset_by_id_route, methods=['GET'])
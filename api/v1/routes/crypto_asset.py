@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException
 from fastapi import Query
 from starlette import status
 
-from api.v1.dependencies import get_current_user, dao_provider
+from api.v1.dependencies import get_current_user, dao_provider, PriceHub, \
+    price_hub_provider
 from api.v1.models.response.crypto_asset import CryptoAssetResponse
 from finances.database.dao import DAO
 from finances.exceptions.crypto_asset import CryptoAssetNotFound
@@ -42,11 +43,12 @@ async def get_all_crypto_assets_route(
 async def delete_crypto_asset_route(
         crypto_asset_id: int,
         current_user: dto.User = Depends(get_current_user),
-        dao: DAO = Depends(dao_provider)
+        dao: DAO = Depends(dao_provider),
+        price_hub: PriceHub = Depends(price_hub_provider)
 ):
     try:
         await delete_crypto_asset(crypto_asset_id, current_user,
-                                  dao.crypto_asset)
+                                  dao.crypto_asset, price_hub)
     except CryptoAssetNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=e.message)
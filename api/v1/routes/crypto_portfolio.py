@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from starlette import status
 
 from api.v1.dependencies import get_current_user, dao_provider, CurrencyAPI, \
-    currency_api_provider
+    currency_api_provider, PriceHub, price_hub_provider
+from api.v1.dependencies.currency_api import CantGetPrice
 from api.v1.models.request.crypto_portfolio import CryptoPortfolioCreate, \
     CryptoPortfolioChange
 from api.v1.models.response.crypto_portfolio import CryptoPortfolioResponse
@@ -86,11 +87,12 @@ async def change_crypto_portfolio_route(
 async def delete_crypto_portfolio_route(
         crypto_portfolio_id: UUID,
         current_user: dto.User = Depends(get_current_user),
-        dao: DAO = Depends(dao_provider)
+        dao: DAO = Depends(dao_provider),
+        price_hub: PriceHub = Depends(price_hub_provider)
 ):
     try:
         await delete_crypto_portfolio(crypto_portfolio_id, current_user,
-                                      dao.crypto_portfolio)
+                                      dao.crypto_portfolio, price_hub)
     except CryptoPortfolioNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
                             detail=e.message)
@@ -131,11 +133,17 @@ async def get_total_by_portfolio_route(
         portfolio_id: UUID = Query(),
         current_user: dto.User = Depends(get_current_user),
         dao: DAO = Depends(dao_provider),
-        currency_api: CurrencyAPI = Depends(currency_api_provider)
+        currency_api: CurrencyAPI = Depends(currency_api_provider),
+        price_hub: PriceHub = Depends(price_hub_provider)
 ) -> TotalResult:
-    total = await get_total_by_portfolio(portfolio_id, current_user, dao,
-                                         currency_api)
-    return TotalResult(total=total)
+    try:
+        total = await get_total_by_portfolio(portfolio_id, current_user, dao,
+                                             currency_api, price_hub)
+    except CantGetPrice:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail='Unable to calculate total price')
+    else:
+        return TotalResult.from_dto(total)
 
 
 def get_crypto_portfolio_router() -> APIRouter:
@@ -4,7 +4,8 @@ from fastapi import APIRouter, Depends, Query
 from starlette import status
 from starlette.exceptions import HTTPException
 
-from api.v1.dependencies import get_current_user, dao_provider
+from api.v1.dependencies import get_current_user, dao_provider, PriceHub, \
+    price_hub_provider
 from api.v1.models.request.crypto_transaction import CryptoTransactionCreate, \
     CryptoTransactionChange
 from api.v1.models.response.crypto_transaction import CryptoTransactionResponse
@@ -54,13 +55,15 @@ async def get_all_crypto_transactions_route(
 async def add_crypto_transaction_route(
         crypto_transaction: CryptoTransactionCreate,
         current_user: dto.User = Depends(get_current_user),
-        dao: DAO = Depends(dao_provider)
+        dao: DAO = Depends(dao_provider),
+        price_hub: PriceHub = Depends(price_hub_provider)
 ) -> CryptoTransactionResponse:
     try:
         crypto_transaction_dto = await add_crypto_transaction(
             crypto_transaction.dict(),
             current_user,
-            dao
+            dao,
+            price_hub
         )
     except (AddCryptoAssetError, MergeCryptoAssetError,
             AddCryptoTransactionError) as e:
@@ -76,13 +79,15 @@ async def add_crypto_transaction_route(
 async def change_crypto_transaction_route(
         crypto_transaction: CryptoTransactionChange,
         current_user: dto.User = Depends(get_current_user),
-        dao: DAO = Depends(dao_provider)
+        dao: DAO = Depends(dao_provider),
+        price_hub: PriceHub = Depends(price_hub_provider)
 ) -> CryptoTransactionResponse:
     try:
         crypto_transaction_dto = await change_crypto_transaction(
             crypto_transaction.dict(),
             current_user,
-            dao
+            dao,
+            price_hub
         )
     except CryptoTransactionNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
@@ -97,13 +102,15 @@ async def change_crypto_transaction_route(
 async def delete_crypto_transaction_route(
         crypto_transaction_id: int,
         current_user: dto.User = Depends(get_current_user),
-        dao: DAO = Depends(dao_provider)
+        dao: DAO = Depends(dao_provider),
+        price_hub: PriceHub = Depends(price_hub_provider)
 ):
     try:
         await delete_crypto_transaction(
             crypto_transaction_id,
             current_user,
-            dao
+            dao,
+            price_hub
         )
     except CryptoTransactionNotFound as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,36 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette import status
+
+from api.v1.dependencies import get_current_user, dao_provider, CurrencyAPI, \
+    currency_api_provider, PriceHub, price_hub_provider
+from api.v1.dependencies.currency_api import CantGetPrice
+from api.v1.models.response.dashboard import DashboardResponse
+from finances.database.dao import DAO
+from finances.models import dto
+from finances.services.dashboard import get_dashboard
+
+
+async def get_dashboard_route(
+        start_date: date = Query(alias='startDate'),
+        end_date: date = Query(alias='endDate'),
+        current_user: dto.User = Depends(get_current_user),
+        currency_api: CurrencyAPI = Depends(currency_api_provider),
+        price_hub: PriceHub = Depends(price_hub_provider),
+        dao: DAO = Depends(dao_provider)
+) -> DashboardResponse:
+    try:
+        dashboard = await get_dashboard(start_date, end_date, current_user,
+                                        currency_api, price_hub, dao)
+    except CantGetPrice:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail='Unable to calculate total price')
+    else:
+        return DashboardResponse.from_dto(dashboard)
+
+
+def get_dashboard_router() -> APIRouter:
+    router = APIRouter()
+    router.add_api_route('', get_dashboard_route, methods=['GET'])
+    return router
@@ -1,25 +1,37 @@
+from _decimal import Decimal
 from datetime import date
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from starlette import status
 
 from api.v1.dependencies import get_current_user, dao_provider, CurrencyAPI, \
     currency_api_provider
+from api.v1.dependencies.currency_api import CantGetPrice
 from api.v1.models.request.transaction import TransactionCreate, \
-    TransactionChange
+    TransactionChange, TransactionsImport, TransactionsBatchChange, \
+    TransactionsBatchDelete
 from api.v1.models.response.total_result import TotalResult, \
-    TransactionsResponse
-from api.v1.models.response.transaction import TransactionResponse
+    TransactionsResponse, TotalSeriesResult
+from api.v1.models.response.transaction import TransactionResponse, \
+    TransactionsBatchResult
 from finances.database.dao import DAO
 from finances.exceptions.asset import AssetNotFound, AssetCantBeDeleted
 from finances.exceptions.transaction import TransactionCategoryNotFound, \
     AddTransactionError, TransactionNotFound, MergeTransactionError, \
-    TransactionCantBeChanged, TransactionCantBeDeleted
+    TransactionCantBeChanged, TransactionCantBeDeleted, \
+    InvalidTransactionCursor
 from finances.models import dto
+from finances.exporters.transaction import export_transactions
+from finances.models.enums.export_format import ExportFormat
+from finances.models.enums.series_bucket import SeriesBucket
 from finances.models.enums.transaction_type import TransactionType
 from finances.services.transaction import add_transaction, \
     get_transaction_by_id, change_transaction, delete_transaction, \
-    get_total_transactions_by_period, get_total_categories_by_period
+    get_total_transactions_by_period, get_total_categories_by_period, \
+    import_transactions, change_transactions, delete_transactions, \
+    get_total_series
 
 
 async def get_transaction_by_id_route(
@@ -39,18 +51,77 @@ async def get_transaction_by_id_route(
 
 
 async def get_all_transactions_route(
+        response: Response,
         start_date: date = Query(alias='startDate'),
         end_date: date = Query(alias='endDate'),
         transaction_type: TransactionType = Query(default=None, alias='type'),
+        limit: int | None = Query(default=None, ge=1, le=1000),
+        cursor: str | None = Query(default=None),
+        asset_ids: list[UUID] = Query(default=[], alias='assetId'),
+        category_ids: list[int] = Query(default=[], alias='categoryId'),
+        currency_codes: list[str] = Query(default=[], alias='currency'),
+        min_amount: Decimal | None = Query(default=None, alias='minAmount'),
+        max_amount: Decimal | None = Query(default=None, alias='maxAmount'),
         current_user: dto.User = Depends(get_current_user),
         dao: DAO = Depends(dao_provider)
 ) -> list[TransactionsResponse]:
-    return await dao.transaction.get_all(
+    transaction_filter = dto.TransactionFilter(
+        asset_ids=asset_ids,
+        category_ids=category_ids,
+        currency_codes=currency_codes,
+        min_amount=min_amount,
+        max_amount=max_amount
+    )
+    if limit is None and cursor is None:
+        return await dao.transaction.get_all(
+            current_user,
+            start_date,
+            end_date,
+            transaction_type.value if transaction_type else None,
+            transaction_filter
+        )
+
+    try:
+        page = await dao.transaction.get_page(
+            current_user,
+            start_date,
+            end_date,
+            limit or 100,
+            dto.TransactionCursor.decode(cursor) if cursor else None,
+            transaction_type.value if transaction_type else None,
+            transaction_filter
+        )
+    except InvalidTransactionCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=e.message)
+    if page.next_cursor is not None:
+        response.headers['Next-Cursor'] = page.next_cursor.encode()
+    return page.transactions
+
+
+async def export_transactions_route(
+        start_date: date = Query(default=None, alias='startDate'),
+        end_date: date = Query(default=None, alias='endDate'),
+        transaction_type: TransactionType = Query(default=None, alias='type'),
+        export_format: ExportFormat = Query(default=ExportFormat.NDJSON,
+                                            alias='format'),
+        current_user: dto.User = Depends(get_current_user),
+        dao: DAO = Depends(dao_provider)
+) -> StreamingResponse:
+    batches = dao.transaction.stream_all(
         current_user,
         start_date,
         end_date,
         transaction_type.value if transaction_type else None
     )
+    media_type = 'text/csv' if export_format == ExportFormat.CSV \
+        else 'application/x-ndjson'
+    return StreamingResponse(
+        export_transactions(batches, export_format),
+        media_type=media_type,
+        headers={'Content-Disposition': 'attachment; filename='
+                                        f'transactions.{export_format.value}'}
+    )
 
 
 async def add_transaction_route(
@@ -74,6 +145,28 @@ async def add_transaction_route(
         return TransactionResponse.from_dto(transaction_dto)
 
 
+async def import_transactions_route(
+        transactions_import: TransactionsImport,
+        current_user: dto.User = Depends(get_current_user),
+        dao: DAO = Depends(dao_provider)
+) -> TransactionsBatchResult:
+    try:
+        count = await import_transactions(
+            [transaction.dict() for transaction in
+             transactions_import.transactions],
+            current_user,
+            dao
+        )
+    except (AssetNotFound, TransactionCategoryNotFound) as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=e.message)
+    except AddTransactionError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=e.message)
+    else:
+        return TransactionsBatchResult(count=count)
+
+
 async def change_transaction_route(
         transaction: TransactionChange,
         current_user: dto.User = Depends(get_current_user),
@@ -112,6 +205,44 @@ async def delete_transaction_route(
         raise HTTPException(status_code=status.HTTP_200_OK)
 
 
+async def change_transactions_route(
+        transactions_change: TransactionsBatchChange,
+        current_user: dto.User = Depends(get_current_user),
+        dao: DAO = Depends(dao_provider)
+) -> TransactionsBatchResult:
+    try:
+        count = await change_transactions(
+            [transaction.dict() for transaction in
+             transactions_change.transactions],
+            current_user,
+            dao
+        )
+    except (MergeTransactionError, TransactionCantBeChanged) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
+                            detail=e.message)
+    except (TransactionNotFound, TransactionCategoryNotFound,
+            AssetNotFound) as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=e.message)
+    else:
+        return TransactionsBatchResult(count=count)
+
+
+async def delete_transactions_route(
+        transactions_delete: TransactionsBatchDelete,
+        current_user: dto.User = Depends(get_current_user),
+        dao: DAO = Depends(dao_provider)
+) -> TransactionsBatchResult:
+    try:
+        count = await delete_transactions(transactions_delete.ids,
+                                          current_user, dao)
+    except TransactionNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                            detail=e.message)
+    else:
+        return TransactionsBatchResult(count=count)
+
+
 async def get_total_transactions_by_period_route(
         start_date: date = Query(alias='startDate'),
         end_date: date = Query(alias='endDate'),
@@ -120,15 +251,20 @@ async def get_total_transactions_by_period_route(
         currency_api: CurrencyAPI = Depends(currency_api_provider),
         dao: DAO = Depends(dao_provider)
 ) -> TotalResult:
-    total = await get_total_transactions_by_period(
-        start_date,
-        end_date,
-        transaction_type,
-        current_user,
-        currency_api,
-        dao
-    )
-    return TotalResult(total=total)
+    try:
+        total = await get_total_transactions_by_period(
+            start_date,
+            end_date,
+            transaction_type,
+            current_user,
+            currency_api,
+            dao
+        )
+    except CantGetPrice:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail='Unable to calculate total price')
+    else:
+        return TotalResult.from_dto(total)
 
 
 async def get_total_categories_by_period_route(
@@ -139,24 +275,62 @@ async def get_total_categories_by_period_route(
         currency_api: CurrencyAPI = Depends(currency_api_provider),
         dao: DAO = Depends(dao_provider)
 ) -> list[dto.TotalByCategory]:
-    return await get_total_categories_by_period(
-        start_date,
-        end_date,
-        transaction_type,
-        current_user,
-        currency_api,
-        dao
-    )
+    try:
+        return await get_total_categories_by_period(
+            start_date,
+            end_date,
+            transaction_type,
+            current_user,
+            currency_api,
+            dao
+        )
+    except CantGetPrice:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail='Unable to calculate total price')
+
+
+async def get_total_series_route(
+        start_date: date = Query(alias='startDate'),
+        end_date: date = Query(alias='endDate'),
+        bucket: SeriesBucket = Query(default=SeriesBucket.MONTH),
+        current_user: dto.User = Depends(get_current_user),
+        currency_api: CurrencyAPI = Depends(currency_api_provider),
+        dao: DAO = Depends(dao_provider)
+) -> TotalSeriesResult:
+    try:
+        total_series = await get_total_series(
+            start_date,
+            end_date,
+            bucket,
+            current_user,
+            currency_api,
+            dao
+        )
+    except CantGetPrice:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail='Unable to calculate total price')
+    else:
+        return TotalSeriesResult.from_dto(total_series)
 
 
 def get_transaction_router() -> APIRouter:
     router = APIRouter()
     router.add_api_route('/add', add_transaction_route, methods=['POST'])
+    router.add_api_route('/import', import_transactions_route,
+                         methods=['POST'])
     router.add_api_route('/change', change_transaction_route, methods=['PUT']),
+    router.add_api_route('/batchChange', change_transactions_route,
+                         methods=['PUT'])
+    router.add_api_route('/batchDelete', delete_transactions_route,
+                         methods=['POST'])
     router.add_api_route('/all', get_all_transactions_route, methods=['GET'])
+    router.add_api_route('/export', export_transactions_route,
+                         methods=['GET'])
     router.add_api_route('/totalByPeriod',
                          get_total_transactions_by_period_route,
                          methods=['GET'])
+    router.add_api_route('/totalSeries', get_total_series_route,
+                         methods=['GET'])
     router.add_api_route('/totalCategoriesByPeriod',
                          get_total_categories_by_period_route,
                          methods=['GET'])
@@ -7,7 +7,8 @@ from api.v1.models.request.user import UserCreate
 from finances.database.dao.holder import DAO
 from finances.exceptions.user import UserException, UserExists
 from finances.models import dto
-from finances.services.user import set_password, set_username, signup
+from finances.services.user import set_password, set_username, signup, \
+    delete_user
 
 
 async def get_user_route(
@@ -30,14 +31,16 @@ async def signup_route(
 
 async def set_username_route(
         username: str = Body(embed=True, regex=r'\w{3,32}'),
+        auth: AuthProvider = Depends(get_auth_provider),
         user: dto.User = Depends(get_current_user),
         dao: DAO = Depends(dao_provider),
 ):
     try:
-        await set_username(user, username, dao.user)
+        credential_version = await set_username(user, username, dao.user)
     except UserExists as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST,
                             detail=e.message)
+    auth.set_credential_version(user, credential_version)
     raise HTTPException(status_code=status.HTTP_200_OK)
 
 
@@ -50,14 +53,26 @@ async def set_password_route(
         user: dto.User = Depends(get_current_user),
         dao: DAO = Depends(dao_provider),
 ):
-    hashed_password = auth.get_password_hash(password)
-    await set_password(user, hashed_password, dao.user)
+    hashed_password = await auth.get_password_hash_async(password)
+    credential_version = await set_password(user, hashed_password, dao.user)
+    auth.set_credential_version(user, credential_version)
+    raise HTTPException(status_code=status.HTTP_200_OK)
+
+
+async def delete_user_route(
+        auth: AuthProvider = Depends(get_auth_provider),
+        user: dto.User = Depends(get_current_user),
+        dao: DAO = Depends(dao_provider),
+):
+    await delete_user(user, dao.user)
+    auth.revoke_user(user)
     raise HTTPException(status_code=status.HTTP_200_OK)
 
 
 def get_user_router() -> APIRouter:
     router = APIRouter()
     router.add_api_route('/me', get_user_route, methods=['GET'])
+    router.add_api_route('/me', delete_user_route, methods=['DELETE'])
     router.add_api_route('/signup', signup_route, methods=['POST'])
     router.add_api_route('/setusername', set_username_route, methods=['PUT'])
     router.add_api_route('/setpassword', set_password_route, methods=['PUT'])
@@ -1,7 +1,7 @@
 from _decimal import Decimal
 from uuid import UUID
 
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, delete, update, case
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -69,3 +69,24 @@ class AssetDAO(BaseDAO[Asset]):
             Asset.user_id == user_id
         ).values(amount=Asset.amount + amount)
         await self.session.execute(stmt)
+
+    async def lock_amount(self, asset_id: UUID) -> Decimal:
+        result = await self.session.execute(
+            select(Asset.amount)
+            .where(Asset.id == asset_id)
+            .with_for_update(read=True)
+        )
+        return result.scalar_one()
+
+    async def update_amounts(
+            self,
+            amounts: dict[UUID, Decimal],
+            user_id: UUID
+    ):
+        if not amounts:
+            return
+        stmt = update(Asset).where(
+            Asset.id.in_(amounts),
+            Asset.user_id == user_id
+        ).values(amount=Asset.amount + case(amounts, value=Asset.id))
+        await self.session.execute(stmt)
@@ -0,0 +1,84 @@
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import select, delete, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from finances.database.dao import BaseDAO
+from finances.database.models import AssetBalanceCheckpoint, Asset
+from finances.models import dto
+
+
+class AssetBalanceCheckpointDAO(BaseDAO[AssetBalanceCheckpoint]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(AssetBalanceCheckpoint, session)
+
+    async def get_latest(self, asset_id: UUID, day: date) \
+            -> dto.AssetBalanceCheckpoint | None:
+        stmt = select(AssetBalanceCheckpoint) \
+            .where(AssetBalanceCheckpoint.asset_id == asset_id,
+                   AssetBalanceCheckpoint.day <= day) \
+            .order_by(AssetBalanceCheckpoint.day.desc()) \
+            .limit(1)
+        checkpoint = await self.session.scalar(stmt)
+        return checkpoint.to_dto() if checkpoint else None
+
+    async def get_first(self, asset_id: UUID) \
+            -> dto.AssetBalanceCheckpoint | None:
+        stmt = select(AssetBalanceCheckpoint) \
+            .where(AssetBalanceCheckpoint.asset_id == asset_id) \
+            .order_by(AssetBalanceCheckpoint.day) \
+            .limit(1)
+        checkpoint = await self.session.scalar(stmt)
+        return checkpoint.to_dto() if checkpoint else None
+
+    async def put_many(self, checkpoints: list[dto.AssetBalanceCheckpoint]):
+        if not checkpoints:
+            return
+        stmt = insert(AssetBalanceCheckpoint).values([
+            {'asset_id': checkpoint.asset_id,
+             'day': checkpoint.day,
+             'balance': checkpoint.balance}
+            for checkpoint in checkpoints
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AssetBalanceCheckpoint.asset_id,
+                            AssetBalanceCheckpoint.day],
+            set_={'balance': stmt.excluded.balance}
+        )
+        await self.session.execute(stmt)
+
+    async def _lock_assets(self, asset_ids: list[UUID]):
+        await self.session.execute(
+            select(Asset.id)
+            .where(Asset.id.in_(asset_ids))
+            .order_by(Asset.id)
+            .with_for_update()
+        )
+
+    async def invalidate(self, transactions: list[dto.Transaction]):
+        days = {}
+        for transaction in transactions:
+            day = transaction.created.date()
+            if transaction.asset_id not in days or \
+                    day < days[transaction.asset_id]:
+                days[transaction.asset_id] = day
+        if not days:
+            return
+
+        await self._lock_assets(list(days))
+        await self.session.execute(
+            delete(AssetBalanceCheckpoint).where(or_(*(
+                and_(AssetBalanceCheckpoint.asset_id == asset_id,
+                     AssetBalanceCheckpoint.day >= day)
+                for asset_id, day in days.items()
+            )))
+        )
+
+    async def invalidate_asset(self, asset_id: UUID):
+        await self._lock_assets([asset_id])
+        await self.session.execute(
+            delete(AssetBalanceCheckpoint)
+            .where(AssetBalanceCheckpoint.asset_id == asset_id)
+        )
@@ -7,16 +7,35 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.interfaces import ORMOption
 
 from finances.database.models import Base
-from finances.exceptions.base import AddModelError, MergeModelError
+from finances.exceptions.base import AddModelError, MergeModelError, \
+    SessionReleased
 from finances.interfaces.dto import DTOProtocol
 
 Model = TypeVar('Model', bound=Base)
 
 
+RELEASED = 'released'
+
+
+def get_active_session(session: AsyncSession) -> AsyncSession:
+    if session.info.get(RELEASED):
+        raise SessionReleased
+    return session
+
+
+async def release_session(session: AsyncSession):
+    await session.close()
+    session.info[RELEASED] = True
+
+
 class BaseDAO(Generic[Model]):
     def __init__(self, model: Type[Model], session: AsyncSession):
         self.model = model
-        self.session = session
+        self._session = session
+
+    @property
+    def session(self) -> AsyncSession:
+        return get_active_session(self._session)
 
     async def _get_by_id(self, id_: int | UUID | tuple,
                          options: list[ORMOption] = None) -> Model:
@@ -46,6 +65,9 @@ class BaseDAO(Generic[Model]):
     async def commit(self):
         await self.session.commit()
 
+    async def release(self):
+        await release_session(self._session)
+
     async def _create(self, dto_obj: DTOProtocol) -> Model:
         obj = self.model.from_dto(dto_obj)
         self.save(obj)
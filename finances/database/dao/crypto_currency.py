@@ -2,7 +2,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from finances.database.dao import BaseDAO
-from finances.database.models import CryptoCurrency
+from finances.database.models import CryptoCurrency, CryptoAsset
 from finances.exceptions.base import AddModelError, MergeModelError
 from finances.exceptions.crypto_currency import CryptoCurrencyNotFound, \
     CryptoCurrencyException
@@ -28,6 +28,15 @@ class CryptoCurrencyDAO(BaseDAO[CryptoCurrency]):
         return [crypto_currency.to_dto() for crypto_currency in
                 result.scalars().all()]
 
+    async def get_held_codes(self) -> set[str]:
+        result = await self.session.execute(
+            select(CryptoCurrency.code)
+            .join(CryptoAsset,
+                  CryptoAsset.crypto_currency_id == CryptoCurrency.id)
+            .distinct()
+        )
+        return set(result.scalars().all())
+
     async def create(self, crypto_currency_dto: dto.CryptoCurrency) \
             -> dto.CryptoCurrency:
         try:
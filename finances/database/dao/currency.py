@@ -4,7 +4,7 @@ from sqlalchemy import select, delete, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from finances.database.dao import BaseDAO
-from finances.database.models import Currency
+from finances.database.models import Currency, Asset, UserConfiguration
 from finances.exceptions.currency import CurrencyNotFound
 from finances.models import dto
 
@@ -41,6 +41,24 @@ class CurrencyDAO(BaseDAO[Currency]):
         currencies = await self.session.execute(stmt)
         return [currency.to_dto() for currency in currencies.scalars().all()]
 
+    async def get_held_codes(self) -> set[str]:
+        result = await self.session.execute(
+            select(Currency.code)
+            .join(Asset, Asset.currency_id == Currency.id)
+            .where(Currency.is_custom.is_(False))
+            .distinct()
+        )
+        return set(result.scalars().all())
+
+    async def get_base_codes(self) -> set[str]:
+        result = await self.session.execute(
+            select(Currency.code)
+            .join(UserConfiguration,
+                  UserConfiguration.base_currency_id == Currency.id)
+            .distinct()
+        )
+        return set(result.scalars().all())
+
     async def create(self, currency_dto: dto.Currency) -> dto.Currency:
         currency = await self._create(currency_dto)
         return currency.to_dto()
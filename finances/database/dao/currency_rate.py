@@ -0,0 +1,26 @@
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from finances.database.dao import BaseDAO
+from finances.database.models import CurrencyRate
+from finances.models import dto
+
+
+class CurrencyRateDAO(BaseDAO[CurrencyRate]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(CurrencyRate, session)
+
+    async def upsert_many(self, currency_rates: list[dto.CurrencyRate]):
+        if not currency_rates:
+            return
+        stmt = insert(CurrencyRate).values([
+            {'code': currency_rate.code,
+             'day': currency_rate.day,
+             'rate': currency_rate.rate}
+            for currency_rate in currency_rates
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CurrencyRate.code, CurrencyRate.day],
+            set_={'rate': stmt.excluded.rate}
+        )
+        await self.session.execute(stmt)
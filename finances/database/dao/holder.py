@@ -1,28 +1,83 @@
+from functools import cached_property
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from finances.database.dao.asset import AssetDAO
+from finances.database.dao.base import get_active_session, \
+    release_session
+from finances.database.dao.asset_balance_checkpoint import \
+    AssetBalanceCheckpointDAO
 from finances.database.dao.crypto_asset import CryptoAssetDAO
 from finances.database.dao.crypto_currency import CryptoCurrencyDAO
 from finances.database.dao.crypto_portfolio import CryptoPortfolioDAO
 from finances.database.dao.crypto_transaction import CryptoTransactionDAO
 from finances.database.dao.currency import CurrencyDAO
+from finances.database.dao.currency_rate import CurrencyRateDAO
 from finances.database.dao.transaction import TransactionDAO
 from finances.database.dao.transaction_category import TransactionCategoryDAO
+from finances.database.dao.transaction_daily_total import \
+    TransactionDailyTotalDAO
 from finances.database.dao.user import UserDAO
 
 
 class DAO:
     def __init__(self, session: AsyncSession):
-        self.session = session
-        self.user = UserDAO(self.session)
-        self.currency = CurrencyDAO(self.session)
-        self.asset = AssetDAO(self.session)
-        self.transaction_category = TransactionCategoryDAO(self.session)
-        self.transaction = TransactionDAO(self.session)
-        self.crypto_portfolio = CryptoPortfolioDAO(self.session)
-        self.crypto_currency = CryptoCurrencyDAO(self.session)
-        self.crypto_asset = CryptoAssetDAO(self.session)
-        self.crypto_transaction = CryptoTransactionDAO(self.session)
+        self._session = session
+
+    @property
+    def session(self) -> AsyncSession:
+        return get_active_session(self._session)
+
+    @cached_property
+    def user(self) -> UserDAO:
+        return UserDAO(self._session)
+
+    @cached_property
+    def currency(self) -> CurrencyDAO:
+        return CurrencyDAO(self._session)
+
+    @cached_property
+    def currency_rate(self) -> CurrencyRateDAO:
+        return CurrencyRateDAO(self._session)
+
+    @cached_property
+    def asset(self) -> AssetDAO:
+        return AssetDAO(self._session)
+
+    @cached_property
+    def transaction_category(self) -> TransactionCategoryDAO:
+        return TransactionCategoryDAO(self._session)
+
+    @cached_property
+    def transaction(self) -> TransactionDAO:
+        return TransactionDAO(self._session)
+
+    @cached_property
+    def transaction_daily_total(self) -> TransactionDailyTotalDAO:
+        return TransactionDailyTotalDAO(self._session)
+
+    @cached_property
+    def asset_balance_checkpoint(self) -> AssetBalanceCheckpointDAO:
+        return AssetBalanceCheckpointDAO(self._session)
+
+    @cached_property
+    def crypto_portfolio(self) -> CryptoPortfolioDAO:
+        return CryptoPortfolioDAO(self._session)
+
+    @cached_property
+    def crypto_currency(self) -> CryptoCurrencyDAO:
+        return CryptoCurrencyDAO(self._session)
+
+    @cached_property
+    def crypto_asset(self) -> CryptoAssetDAO:
+        return CryptoAssetDAO(self._session)
+
+    @cached_property
+    def crypto_transaction(self) -> CryptoTransactionDAO:
+        return CryptoTransactionDAO(self._session)
 
     async def commit(self):
         await self.session.commit()
+
+    async def release(self):
+        await release_session(self._session)
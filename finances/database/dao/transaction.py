@@ -1,18 +1,23 @@
 from _decimal import Decimal
 from datetime import date
+from typing import AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, delete, func, case, \
+    literal_column, and_, Select, tuple_, insert, update, cast, Date, \
+    literal
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, aliased
 
 from finances.database.dao import BaseDAO
 from finances.database.models import Transaction, Asset, TransactionCategory, \
-    Currency
+    Currency, CurrencyRate, TransactionDailyTotal
 from finances.exceptions.base import MergeModelError, AddModelError
 from finances.exceptions.transaction import AddTransactionError, \
     TransactionNotFound, MergeTransactionError
 from finances.models import dto
+from finances.models.enums.transaction_type import TransactionType
 
 
 class TransactionDAO(BaseDAO[Transaction]):
@@ -33,87 +38,227 @@ class TransactionDAO(BaseDAO[Transaction]):
             user_dto: dto.User,
             start_date: date,
             end_date: date,
-            transaction_type: str | None = None
+            transaction_type: str | None = None,
+            transaction_filter: dto.TransactionFilter | None = None
     ) -> list[dto.Transactions]:
-        stmt = select(Transaction.created).where(
-            Transaction.user_id == user_dto.id).filter(
-            Transaction.created >= start_date,
-            Transaction.created <= end_date).order_by(
-            Transaction.created.desc()).distinct()
+        stmt = self._get_all_stmt(user_dto, start_date, end_date,
+                                  transaction_type, transaction_filter)
+        result = await self.session.stream(stmt)
+        transactions = []
+        async for transaction in result.scalars():
+            self._append_by_created(transactions, transaction.to_dto())
+        return transactions
+
+    async def get_page(
+            self,
+            user_dto: dto.User,
+            start_date: date,
+            end_date: date,
+            limit: int,
+            cursor: dto.TransactionCursor | None = None,
+            transaction_type: str | None = None,
+            transaction_filter: dto.TransactionFilter | None = None
+    ) -> dto.TransactionsPage:
+        stmt = self._get_all_stmt(user_dto, start_date, end_date,
+                                  transaction_type, transaction_filter) \
+            .limit(limit + 1)
+        if cursor is not None:
+            stmt = stmt.where(tuple_(Transaction.created, Transaction.id) <
+                              tuple_(cursor.created, cursor.id))
+        result = await self.session.execute(stmt)
+        transactions = result.scalars().all()
+
+        page = dto.TransactionsPage(transactions=[])
+        for transaction in transactions[:limit]:
+            self._append_by_created(page.transactions, transaction.to_dto())
+        if len(transactions) > limit:
+            page.next_cursor = dto.TransactionCursor(
+                created=transactions[limit - 1].created,
+                id=transactions[limit - 1].id)
+        return page
+
+    async def stream_all(
+            self,
+            user_dto: dto.User,
+            start_date: date | None = None,
+            end_date: date | None = None,
+            transaction_type: str | None = None,
+            batch_size: int = 500,
+            transaction_filter: dto.TransactionFilter | None = None
+    ) -> AsyncIterator[list[dto.Transaction]]:
+        stmt = self._get_all_stmt(user_dto, start_date, end_date,
+                                  transaction_type, transaction_filter) \
+            .order_by(None) \
+            .order_by(Transaction.created, Transaction.id) \
+            .execution_options(yield_per=batch_size)
+        result = await self.session.stream(stmt)
+        async for transactions in result.scalars().partitions(batch_size):
+            yield [transaction.to_dto() for transaction in transactions]
+
+    @staticmethod
+    def _get_all_stmt(
+            user_dto: dto.User,
+            start_date: date | None,
+            end_date: date | None,
+            transaction_type: str | None = None,
+            transaction_filter: dto.TransactionFilter | None = None
+    ) -> Select:
+        stmt = select(Transaction).where(
+            Transaction.user_id == user_dto.id
+        ).order_by(Transaction.created.desc(), Transaction.id.desc()).options(
+            joinedload(Transaction.asset).joinedload(Asset.currency),
+            joinedload(Transaction.category))
+        if start_date is not None:
+            stmt = stmt.where(Transaction.created >= start_date)
+        if end_date is not None:
+            stmt = stmt.where(Transaction.created <= end_date)
         if transaction_type:
             stmt = stmt.where(Transaction.category.has(
                 TransactionCategory.type == transaction_type))
-        result = await self.session.execute(stmt)
-        transactions = []
-        for created in result.fetchall():
-            stmt = select(Transaction) \
-                .where(
-                Transaction.user_id == user_dto.id,
-                Transaction.created == created[0]
-            ) \
-                .order_by(Transaction.created.desc(), Transaction.id.desc()) \
-                .options(
-                joinedload(Transaction.asset).joinedload(Asset.currency),
-                joinedload(Transaction.category))
-            if transaction_type:
-                stmt = stmt.where(Transaction.category.has(
-                    TransactionCategory.type == transaction_type))
-
-            result = await self.session.execute(stmt)
-            transactions.append(
-                dto.Transactions(
-                    created=created[0].date(),
-                    transactions=[transaction.to_dto() for transaction in
-                                  result.scalars().all()]
-                )
-            )
+        if transaction_filter is not None:
+            stmt = TransactionDAO._filter_stmt(stmt, user_dto,
+                                               transaction_filter)
+        return stmt
 
-        return transactions
+    @staticmethod
+    def _filter_stmt(
+            stmt: Select,
+            user_dto: dto.User,
+            transaction_filter: dto.TransactionFilter
+    ) -> Select:
+        if transaction_filter.asset_ids:
+            stmt = stmt.where(
+                Transaction.asset_id.in_(transaction_filter.asset_ids))
+        if transaction_filter.category_ids:
+            stmt = stmt.where(
+                Transaction.category_id.in_(transaction_filter.category_ids))
+        if transaction_filter.currency_codes:
+            stmt = stmt.where(Transaction.asset_id.in_(
+                select(Asset.id)
+                .join(Currency, Currency.id == Asset.currency_id)
+                .where(Asset.user_id == user_dto.id,
+                       Currency.code.in_(transaction_filter.currency_codes))
+            ))
+        if transaction_filter.min_amount is not None:
+            stmt = stmt.where(
+                Transaction.amount >= transaction_filter.min_amount)
+        if transaction_filter.max_amount is not None:
+            stmt = stmt.where(
+                Transaction.amount <= transaction_filter.max_amount)
+        return stmt
+
+    @staticmethod
+    def _append_by_created(transactions: list[dto.Transactions],
+                           transaction_dto: dto.Transaction):
+        if not transactions or transactions[-1].transactions[-1].created \
+                != transaction_dto.created:
+            transactions.append(dto.Transactions(
+                created=transaction_dto.created.date(), transactions=[]))
+        transactions[-1].transactions.append(transaction_dto)
+
+    @staticmethod
+    def _converted_amount(base_currency_code: str):
+        quote_rate = aliased(CurrencyRate)
+        base_rate = aliased(CurrencyRate)
+        amount = TransactionDailyTotal.total
+        day = TransactionDailyTotal.day
+
+        quote_rate_value = case(
+            (Currency.code == CurrencyRate.pivot_code, literal_column('1')),
+            else_=quote_rate.rate
+        )
+        base_is_pivot = base_currency_code == CurrencyRate.pivot_code
+        base_rate_value = literal_column('1') if base_is_pivot \
+            else base_rate.rate
+        converted = case(
+            (Currency.rate_to_base_currency.is_not(None),
+             amount / Currency.rate_to_base_currency),
+            (Currency.code == base_currency_code, amount),
+            else_=amount * base_rate_value / quote_rate_value
+        )
+        unconverted = case((converted.is_(None), amount),
+                           else_=literal_column('0'))
+
+        def join_rates(stmt: Select) -> Select:
+            stmt = stmt.outerjoin(
+                quote_rate,
+                and_(quote_rate.code == Currency.code, quote_rate.day == day))
+            if not base_is_pivot:
+                stmt = stmt.outerjoin(
+                    base_rate,
+                    and_(base_rate.code == base_currency_code,
+                         base_rate.day == day))
+            return stmt
+
+        return converted, unconverted, join_rates
+
+    @staticmethod
+    def _daily_totals_stmt(
+            stmt: Select,
+            user_dto: dto.User,
+            start_date: date,
+            end_date: date,
+            transaction_type: str | None
+    ) -> Select:
+        stmt = stmt.select_from(TransactionDailyTotal) \
+            .join(Asset, Asset.id == TransactionDailyTotal.asset_id) \
+            .join(Currency, Currency.id == Asset.currency_id) \
+            .join(TransactionCategory, TransactionCategory.id ==
+                  TransactionDailyTotal.category_id) \
+            .where(TransactionDailyTotal.user_id == user_dto.id,
+                   TransactionDailyTotal.day >= start_date,
+                   TransactionDailyTotal.day <= end_date)
+        if transaction_type:
+            stmt = stmt.where(TransactionCategory.type == transaction_type)
+        return stmt
 
     async def get_total_by_period(
             self,
             user_dto: dto.User,
             start_date: date,
             end_date: date,
-            transaction_type: str
-    ) -> dict[str, Decimal]:
-        stmt = select(Currency.code, Currency.rate_to_base_currency,
-                      func.sum(Transaction.amount).label('total')) \
-            .join(Transaction.asset).join(Transaction.category) \
-            .join(Asset.currency) \
-            .group_by(Currency.id, Currency.code) \
-            .filter(Transaction.created >= start_date,
-                    Transaction.created <= end_date) \
-            .where(Transaction.category.has(TransactionCategory.type ==
-                                            transaction_type),
-                   Transaction.user_id == user_dto.id)
+            transaction_type: str,
+            base_currency_code: str
+    ) -> list[dto.TotalByCurrency]:
+        converted, unconverted, join_rates = self._converted_amount(
+            base_currency_code)
+        stmt = self._daily_totals_stmt(
+            select(Currency.code, Currency.rate_to_base_currency,
+                   func.sum(unconverted).label('total'),
+                   func.sum(converted).label('converted_total')),
+            user_dto, start_date, end_date, transaction_type)
+        stmt = join_rates(stmt).group_by(Currency.id, Currency.code)
         result = await self.session.execute(stmt)
-        result = result.fetchall()
-        return {currency[0]: (currency[1], currency[2]) for currency in result}
+        return [dto.TotalByCurrency(
+            currency_code=currency[0],
+            rate_to_base_currency=currency[1],
+            total=currency[2],
+            converted_total=currency[3] or Decimal(0)
+        ) for currency in result.fetchall()]
 
     async def get_total_categories_by_period(
             self,
             user_dto: dto.User,
             start_date: date,
             end_date: date,
-            transaction_type: str
+            transaction_type: str | None,
+            base_currency_code: str
     ) -> list[dto.TotalByCategoryAndCurrency]:
-        stmt = select(TransactionCategory.title,
-                      TransactionCategory.type,
-                      Currency.code,
-                      Currency.rate_to_base_currency,
-                      func.sum(Transaction.amount).label('total')) \
-            .join(Transaction.asset).join(Transaction.category) \
-            .join(Asset.currency) \
+        converted, unconverted, join_rates = self._converted_amount(
+            base_currency_code)
+        stmt = self._daily_totals_stmt(
+            select(TransactionCategory.title,
+                   TransactionCategory.type,
+                   Currency.code,
+                   Currency.rate_to_base_currency,
+                   func.sum(unconverted).label('total'),
+                   func.sum(converted).label('converted_total')),
+            user_dto, start_date, end_date, transaction_type)
+        stmt = join_rates(stmt) \
             .group_by(Currency.id,
                       TransactionCategory.title,
                       TransactionCategory.type,
-                      Currency.code) \
-            .filter(Transaction.created >= start_date,
-                    Transaction.created <= end_date) \
-            .where(Transaction.category.has(TransactionCategory.type ==
-                                            transaction_type),
-                   Transaction.user_id == user_dto.id)
+                      Currency.code)
         result = await self.session.execute(stmt)
         result = result.fetchall()
         return [dto.TotalByCategoryAndCurrency(
@@ -121,9 +266,43 @@ class TransactionDAO(BaseDAO[Transaction]):
             type=category[1],
             currency_code=category[2],
             rate_to_base_currency=category[3],
-            total=category[4]
+            total=category[4],
+            converted_total=category[5] or Decimal(0)
         ) for category in result]
 
+    async def get_total_series(
+            self,
+            user_dto: dto.User,
+            start_date: date,
+            end_date: date,
+            bucket: str,
+            base_currency_code: str
+    ) -> list[dto.TotalByPeriodAndCurrency]:
+        converted, unconverted, join_rates = self._converted_amount(
+            base_currency_code)
+        period = cast(func.date_trunc(literal(bucket, literal_execute=True),
+                                      TransactionDailyTotal.day),
+                      Date).label('period')
+        stmt = self._daily_totals_stmt(
+            select(period,
+                   TransactionCategory.type,
+                   Currency.code,
+                   func.sum(unconverted).label('total'),
+                   func.sum(converted).label('converted_total')),
+            user_dto, start_date, end_date, None)
+        stmt = join_rates(stmt) \
+            .group_by(period, TransactionCategory.type, Currency.id,
+                      Currency.code) \
+            .order_by(period)
+        result = await self.session.execute(stmt)
+        return [dto.TotalByPeriodAndCurrency(
+            period=total[0],
+            type=total[1],
+            currency_code=total[2],
+            total=total[3],
+            converted_total=total[4] or Decimal(0)
+        ) for total in result.fetchall()]
+
     async def create(self, transaction_dto: dto.Transaction) \
             -> dto.Transaction:
         try:
@@ -133,6 +312,22 @@ class TransactionDAO(BaseDAO[Transaction]):
         else:
             return transaction.to_dto(with_asset=False, with_category=False)
 
+    async def create_many(self, transactions: list[dto.Transaction]) \
+            -> list[int]:
+        stmt = insert(Transaction).returning(Transaction.id)
+        try:
+            result = await self.session.execute(stmt, [
+                {'user_id': transaction.user_id,
+                 'asset_id': transaction.asset_id,
+                 'category_id': transaction.category_id,
+                 'amount': transaction.amount,
+                 'created': transaction.created}
+                for transaction in transactions
+            ])
+        except IntegrityError as e:
+            raise AddTransactionError from e
+        return list(result.scalars().all())
+
     async def merge(self, transaction_dto: dto.Transaction) -> dto.Transaction:
         try:
             transaction = await self._merge(transaction_dto)
@@ -141,6 +336,62 @@ class TransactionDAO(BaseDAO[Transaction]):
         else:
             return transaction.to_dto(with_asset=False, with_category=False)
 
+    async def get_many(
+            self,
+            transactions_ids: list[int],
+            user_id: UUID
+    ) -> list[dto.Transaction]:
+        stmt = select(Transaction) \
+            .where(Transaction.id.in_(transactions_ids),
+                   Transaction.user_id == user_id) \
+            .options(joinedload(Transaction.category))
+        result = await self.session.execute(stmt)
+        return [transaction.to_dto(with_asset=False) for transaction in
+                result.scalars().all()]
+
+    async def update_many(self, transactions: list[dto.Transaction]):
+        if not transactions:
+            return
+        try:
+            await self.session.execute(update(Transaction), [
+                {'id': transaction.id,
+                 'asset_id': transaction.asset_id,
+                 'category_id': transaction.category_id,
+                 'amount': transaction.amount,
+                 'created': transaction.created}
+                for transaction in transactions
+            ])
+        except IntegrityError as e:
+            raise MergeTransactionError from e
+
+    async def delete_many(
+            self,
+            transactions_ids: list[int],
+            user_id: UUID
+    ) -> list[dto.Transaction]:
+        stmt = delete(Transaction.__table__) \
+            .where(Transaction.id.in_(transactions_ids),
+                   Transaction.user_id == user_id,
+                   TransactionCategory.id == Transaction.category_id) \
+            .returning(Transaction.id, Transaction.asset_id,
+                       Transaction.category_id, Transaction.amount,
+                       Transaction.created, TransactionCategory.type)
+        result = await self.session.execute(stmt)
+        return [dto.Transaction(
+            id=transaction[0],
+            user_id=user_id,
+            asset_id=transaction[1],
+            category_id=transaction[2],
+            amount=transaction[3],
+            created=transaction[4],
+            category=dto.TransactionCategory(
+                id=transaction[2],
+                title=None,
+                type=TransactionType(transaction[5]),
+                user_id=user_id
+            )
+        ) for transaction in result.fetchall()]
+
     async def delete_by_id(
             self,
             transaction_id: int,
@@ -0,0 +1,103 @@
+from _decimal import Decimal
+from datetime import date
+from uuid import UUID
+
+from sqlalchemy import select, func, case, cast, Date, literal, Select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from finances.database.dao import BaseDAO
+from finances.database.models import TransactionDailyTotal, \
+    TransactionCategory
+from finances.models import dto
+from finances.models.enums.transaction_type import TransactionType
+
+
+class TransactionDailyTotalDAO(BaseDAO[TransactionDailyTotal]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(TransactionDailyTotal, session)
+
+    async def add(self, transaction_dto: dto.Transaction):
+        await self.add_many([transaction_dto])
+
+    async def subtract(self, transaction_dto: dto.Transaction):
+        await self.add_many([transaction_dto], sign=-1)
+
+    async def add_many(self, transactions: list[dto.Transaction],
+                       sign: int = 1):
+        daily_totals = {}
+        for transaction in transactions:
+            key = (transaction.user_id, transaction.created.date(),
+                   transaction.category_id, transaction.asset_id)
+            daily_totals[key] = daily_totals.get(key, 0) + \
+                sign * transaction.amount
+        if not daily_totals:
+            return
+
+        # executemany keeps each statement at five parameters, a single
+        # multi-row VALUES would hit the 32767 parameter limit of asyncpg
+        stmt = insert(TransactionDailyTotal)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TransactionDailyTotal.user_id,
+                            TransactionDailyTotal.day,
+                            TransactionDailyTotal.category_id,
+                            TransactionDailyTotal.asset_id],
+            set_={'total': TransactionDailyTotal.total + stmt.excluded.total}
+        )
+        await self.session.execute(stmt, [
+            {'user_id': user_id,
+             'day': day,
+             'category_id': category_id,
+             'asset_id': asset_id,
+             'total': total}
+            for (user_id, day, category_id, asset_id), total in
+            daily_totals.items()
+        ])
+
+    @staticmethod
+    def _asset_delta_stmt(stmt: Select, asset_id: UUID) -> Select:
+        return stmt.select_from(TransactionDailyTotal) \
+            .join(TransactionCategory, TransactionCategory.id ==
+                  TransactionDailyTotal.category_id) \
+            .where(TransactionDailyTotal.asset_id == asset_id)
+
+    @staticmethod
+    def _signed_total():
+        return case(
+            (TransactionCategory.type == TransactionType.EXPENSE.value,
+             -TransactionDailyTotal.total),
+            else_=TransactionDailyTotal.total
+        )
+
+    async def get_asset_delta(
+            self,
+            asset_id: UUID,
+            after: date | None,
+            until: date | None
+    ) -> Decimal:
+        stmt = self._asset_delta_stmt(
+            select(func.sum(self._signed_total())), asset_id)
+        if after is not None:
+            stmt = stmt.where(TransactionDailyTotal.day > after)
+        if until is not None:
+            stmt = stmt.where(TransactionDailyTotal.day <= until)
+        return await self.session.scalar(stmt) or Decimal(0)
+
+    async def get_asset_running_totals(
+            self,
+            asset_id: UUID,
+            after: date | None
+    ) -> list[tuple[date, Decimal]]:
+        month = cast(func.date_trunc(literal('month', literal_execute=True),
+                                     TransactionDailyTotal.day),
+                     Date).label('month')
+        stmt = self._asset_delta_stmt(
+            select(month,
+                   func.sum(func.sum(self._signed_total()))
+                   .over(order_by=month)),
+            asset_id)
+        if after is not None:
+            stmt = stmt.where(TransactionDailyTotal.day > after)
+        stmt = stmt.group_by(month).order_by(month)
+        result = await self.session.execute(stmt)
+        return [(total[0], total[1]) for total in result.fetchall()]
@@ -1,12 +1,14 @@
+from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from finances.database.dao.base import BaseDAO
-from finances.database.models import User, UserConfiguration
+from finances.database.models import User, UserConfiguration, DeletedUser
 from finances.exceptions.user import UserExists, UserNotFound
 from finances.models import dto
 
@@ -23,7 +25,8 @@ class UserDAO(BaseDAO[User]):
                                             username: str) \
             -> dto.UserWithCreds:
         user = await self._get_by_username(username)
-        return user.to_dto().add_password(user.password)
+        return user.to_dto().add_password(user.password,
+                                          user.credential_version)
 
     async def _get_by_username(self, username: str) -> User:
         result = await self.session.execute(
@@ -47,13 +50,42 @@ class UserDAO(BaseDAO[User]):
         else:
             return user.to_dto()
 
-    async def set_username(self, user: dto.User, username: str):
+    async def set_username(self, user: dto.User, username: str) -> int:
         db_user = await self._get_by_id(user.id)
         db_user.username = username
+        db_user.credential_version += 1
+        db_user.credential_changed = func.now()
+        return db_user.credential_version
 
-    async def set_password(self, user: dto.User, hashed_password: str):
+    async def set_password(self, user: dto.User, hashed_password: str) \
+            -> int:
         db_user = await self._get_by_id(user.id)
         db_user.password = hashed_password
+        db_user.credential_version += 1
+        db_user.credential_changed = func.now()
+        return db_user.credential_version
+
+    async def get_server_time(self) -> datetime:
+        return await self.session.scalar(select(func.now()))
+
+    async def get_credential_changes(self, since: datetime) \
+            -> tuple[dict[UUID, int], set[UUID]]:
+        result = await self.session.execute(
+            select(User.id, User.credential_version)
+            .where(User.credential_changed >= since))
+        versions = {user_id: version for user_id, version in
+                    result.fetchall()}
+        result = await self.session.execute(
+            select(DeletedUser.id).where(DeletedUser.deleted >= since))
+        return versions, set(result.scalars().all())
+
+    async def get_credential_version(self, user_id: UUID) -> int:
+        result = await self.session.execute(
+            select(User.credential_version).where(User.id == user_id))
+        credential_version = result.scalar_one_or_none()
+        if credential_version is None:
+            raise UserNotFound
+        return credential_version
 
     async def get_base_currency(self, user: dto.User) -> dto.Currency | None:
         config = await self.session.get(UserConfiguration, user.id,
@@ -84,3 +116,5 @@ class UserDAO(BaseDAO[User]):
 
     async def delete_by_id(self, id_: UUID):
         await self.session.execute(delete(User).where(User.id == id_))
+        await self.session.execute(
+            insert(DeletedUser).values(id=id_).on_conflict_do_nothing())
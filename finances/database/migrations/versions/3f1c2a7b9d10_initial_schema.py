@@ -0,0 +1,133 @@
+"""initial schema
+
+Revision ID: 3f1c2a7b9d10
+Revises:
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7b9d10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('crypto_currency',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('code', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('user',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('password', sa.String(), nullable=False),
+    sa.Column('user_type', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('username')
+    )
+    op.create_table('crypto_portfolio',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'title', name='u_crypto_portfolio1')
+    )
+    op.create_table('currency',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('code', sa.String(), nullable=False),
+    sa.Column('is_custom', sa.Boolean(), nullable=False),
+    sa.Column('rate_to_base_currency', sa.Numeric(), nullable=True),
+    sa.Column('user_id', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('transaction_category',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('title', 'type', 'user_id', name='tran_category_unique')
+    )
+    op.create_table('asset',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('currency_id', sa.Integer(), nullable=True),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.Column('deleted', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['currency_id'], ['currency.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'title', name='unique_asset')
+    )
+    op.create_table('crypto_asset',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('portfolio_id', sa.UUID(), nullable=False),
+    sa.Column('crypto_currency_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.ForeignKeyConstraint(['crypto_currency_id'], ['crypto_currency.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['portfolio_id'], ['crypto_portfolio.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'portfolio_id', 'crypto_currency_id', name='u_crypto_asset1')
+    )
+    op.create_table('user_config',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('base_currency_id', sa.Integer(), nullable=True),
+    sa.Column('base_crypto_portfolio_id', sa.UUID(), nullable=True),
+    sa.ForeignKeyConstraint(['base_crypto_portfolio_id'], ['crypto_portfolio.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['base_currency_id'], ['currency.id'], ondelete='SET NULL'),
+    sa.ForeignKeyConstraint(['id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('crypto_portfolio_transaction',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('portfolio_id', sa.UUID(), nullable=False),
+    sa.Column('crypto_asset_id', sa.BigInteger(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.Column('price', sa.Numeric(), nullable=False),
+    sa.Column('created', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['crypto_asset_id'], ['crypto_asset.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['portfolio_id'], ['crypto_portfolio.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('transaction',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('user_id', sa.UUID(), nullable=False),
+    sa.Column('asset_id', sa.UUID(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(), nullable=False),
+    sa.Column('created', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['asset_id'], ['asset.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['category_id'], ['transaction_category.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transaction')
+    op.drop_table('crypto_portfolio_transaction')
+    op.drop_table('user_config')
+    op.drop_table('crypto_asset')
+    op.drop_table('asset')
+    op.drop_table('transaction_category')
+    op.drop_table('currency')
+    op.drop_table('crypto_portfolio')
+    op.drop_table('user')
+    op.drop_table('crypto_currency')
@@ -0,0 +1,30 @@
+"""add currency_rate
+
+Revision ID: 5d2b9e7a1c43
+Revises: 3f1c2a7b9d10
+Create Date: 2026-10-18 12:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2b9e7a1c43'
+down_revision = '3f1c2a7b9d10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'currency_rate',
+        sa.Column('code', sa.String(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('rate', sa.Numeric(), nullable=False),
+        sa.PrimaryKeyConstraint('code', 'day')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('currency_rate')
@@ -0,0 +1,38 @@
+"""add indexes for transaction query shapes
+
+Revision ID: 8a4e6d0c5b21
+Revises: 5d2b9e7a1c43
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6d0c5b21'
+down_revision = '5d2b9e7a1c43'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transaction_user_id_created_id', 'transaction',
+                    ['user_id', 'created', 'id'])
+    op.create_index('ix_transaction_user_id_category_id', 'transaction',
+                    ['user_id', 'category_id'])
+    op.create_index('ix_transaction_category_user_id_type',
+                    'transaction_category', ['user_id', 'type'])
+    op.create_index('ix_crypto_portfolio_transaction_user_id_crypto_asset_id',
+                    'crypto_portfolio_transaction',
+                    ['user_id', 'crypto_asset_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_crypto_portfolio_transaction_user_id_crypto_asset_id',
+                  table_name='crypto_portfolio_transaction')
+    op.drop_index('ix_transaction_category_user_id_type',
+                  table_name='transaction_category')
+    op.drop_index('ix_transaction_user_id_category_id',
+                  table_name='transaction')
+    op.drop_index('ix_transaction_user_id_created_id',
+                  table_name='transaction')
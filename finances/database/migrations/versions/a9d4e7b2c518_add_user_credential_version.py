@@ -0,0 +1,25 @@
+"""add user credential_version
+
+Revision ID: a9d4e7b2c518
+Revises: f3a1c8d6b702
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a9d4e7b2c518'
+down_revision = 'f3a1c8d6b702'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('credential_version', sa.Integer(),
+                                    server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('user', 'credential_version')
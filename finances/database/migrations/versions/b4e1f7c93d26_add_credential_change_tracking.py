@@ -0,0 +1,40 @@
+"""add credential change tracking
+
+Revision ID: b4e1f7c93d26
+Revises: a9d4e7b2c518
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4e1f7c93d26'
+down_revision = 'a9d4e7b2c518'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('user', sa.Column('credential_changed',
+                                    sa.DateTime(timezone=True),
+                                    server_default=sa.func.now(),
+                                    nullable=False))
+    op.create_index('ix_user_credential_changed', 'user',
+                    ['credential_changed'])
+    op.create_table(
+        'deleted_user',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('deleted', sa.DateTime(timezone=True),
+                  server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_deleted_user_deleted', 'deleted_user', ['deleted'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_deleted_user_deleted', table_name='deleted_user')
+    op.drop_table('deleted_user')
+    op.drop_index('ix_user_credential_changed', table_name='user')
+    op.drop_column('user', 'credential_changed')
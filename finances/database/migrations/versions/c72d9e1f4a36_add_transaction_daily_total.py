@@ -0,0 +1,44 @@
+"""add transaction_daily_total
+
+Revision ID: c72d9e1f4a36
+Revises: 8a4e6d0c5b21
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c72d9e1f4a36'
+down_revision = '8a4e6d0c5b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'transaction_daily_total',
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False),
+        sa.Column('asset_id', sa.UUID(), nullable=False),
+        sa.Column('total', sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(['asset_id'], ['asset.id'],
+                                ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['category_id'], ['transaction_category.id'],
+                                ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'day', 'category_id', 'asset_id')
+    )
+    op.execute(
+        'INSERT INTO transaction_daily_total '
+        '(user_id, day, category_id, asset_id, total) '
+        'SELECT user_id, CAST(created AS DATE), category_id, asset_id, '
+        'sum(amount) FROM transaction '
+        'GROUP BY user_id, CAST(created AS DATE), category_id, asset_id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('transaction_daily_total')
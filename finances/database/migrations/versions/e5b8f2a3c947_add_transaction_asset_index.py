@@ -0,0 +1,25 @@
+"""add transaction asset index for filtered search
+
+Revision ID: e5b8f2a3c947
+Revises: c72d9e1f4a36
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b8f2a3c947'
+down_revision = 'c72d9e1f4a36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_transaction_user_id_asset_id_created', 'transaction',
+                    ['user_id', 'asset_id', 'created'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_user_id_asset_id_created',
+                  table_name='transaction')
@@ -0,0 +1,36 @@
+"""add asset_balance_checkpoint
+
+Revision ID: f3a1c8d6b702
+Revises: e5b8f2a3c947
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a1c8d6b702'
+down_revision = 'e5b8f2a3c947'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'asset_balance_checkpoint',
+        sa.Column('asset_id', sa.UUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('balance', sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(['asset_id'], ['asset.id'],
+                                ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('asset_id', 'day')
+    )
+    op.create_index('ix_transaction_daily_total_asset_id_day',
+                    'transaction_daily_total', ['asset_id', 'day'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transaction_daily_total_asset_id_day',
+                  table_name='transaction_daily_total')
+    op.drop_table('asset_balance_checkpoint')
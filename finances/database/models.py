@@ -2,11 +2,11 @@ from __future__ import annotations
 
 import uuid
 from _decimal import Decimal
-from datetime import datetime
+from datetime import datetime, date
 from typing import Optional
 
 from sqlalchemy import String, Integer, ForeignKey, Numeric, Boolean, \
-    BigInteger, DateTime, UniqueConstraint
+    BigInteger, DateTime, UniqueConstraint, Date, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, mapped_column, Mapped, relationship
 
@@ -37,9 +37,18 @@ class User(Base):
                                           nullable=False)
     password: Mapped[str] = mapped_column(String, nullable=False)
     user_type: Mapped[str] = mapped_column(String, nullable=False)
+    credential_version: Mapped[int] = mapped_column(Integer, nullable=False,
+                                                    default=0,
+                                                    server_default='0')
+    credential_changed: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now())
 
     config: Mapped['UserConfiguration'] = relationship()
 
+    __table_args__ = (
+        Index('ix_user_credential_changed', 'credential_changed'),
+    )
+
     def to_dto(self) -> dto.User:
         return dto.User(
             id=self.id,
@@ -57,6 +66,20 @@ class User(Base):
         )
 
 
+class DeletedUser(Base):
+    __tablename__ = 'deleted_user'
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                          primary_key=True)
+    deleted: Mapped[datetime] = mapped_column(DateTime(timezone=True),
+                                              nullable=False,
+                                              server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_deleted_user_deleted', 'deleted'),
+    )
+
+
 class UserConfiguration(Base):
     __tablename__ = 'user_config'
 
@@ -170,6 +193,31 @@ class Currency(Base):
         )
 
 
+class CurrencyRate(Base):
+    __tablename__ = 'currency_rate'
+
+    pivot_code = 'USD'
+
+    code: Mapped[str] = mapped_column(String, primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    rate: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+
+    def to_dto(self) -> dto.CurrencyRate:
+        return dto.CurrencyRate(
+            code=self.code,
+            day=self.day,
+            rate=self.rate
+        )
+
+    @classmethod
+    def from_dto(cls, currency_rate_dto: dto.CurrencyRate) -> CurrencyRate:
+        return CurrencyRate(
+            code=currency_rate_dto.code,
+            day=currency_rate_dto.day,
+            rate=currency_rate_dto.rate
+        )
+
+
 class Transaction(Base):
     __tablename__ = 'transaction'
 
@@ -193,6 +241,13 @@ class Transaction(Base):
     asset: Mapped['Asset'] = relationship()
     category: Mapped['TransactionCategory'] = relationship()
 
+    __table_args__ = (
+        Index('ix_transaction_user_id_created_id', 'user_id', 'created', 'id'),
+        Index('ix_transaction_user_id_category_id', 'user_id', 'category_id'),
+        Index('ix_transaction_user_id_asset_id_created', 'user_id',
+              'asset_id', 'created'),
+    )
+
     def to_dto(self, with_asset: bool = True,
                with_category: bool = True) -> dto.Transaction:
         return dto.Transaction(
@@ -218,6 +273,77 @@ class Transaction(Base):
         )
 
 
+class TransactionDailyTotal(Base):
+    __tablename__ = 'transaction_daily_total'
+
+    user_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                               ForeignKey('user.id',
+                                                          ondelete='CASCADE'),
+                                               primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    category_id: Mapped[int] = mapped_column(Integer,
+                                             ForeignKey(
+                                                 'transaction_category.id',
+                                                 ondelete='CASCADE'),
+                                             primary_key=True)
+    asset_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                                ForeignKey('asset.id',
+                                                           ondelete='CASCADE'),
+                                                primary_key=True)
+    total: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+
+    __table_args__ = (
+        Index('ix_transaction_daily_total_asset_id_day', 'asset_id', 'day'),
+    )
+
+    def to_dto(self) -> dto.TransactionDailyTotal:
+        return dto.TransactionDailyTotal(
+            user_id=self.user_id,
+            day=self.day,
+            category_id=self.category_id,
+            asset_id=self.asset_id,
+            total=self.total
+        )
+
+    @classmethod
+    def from_dto(cls, daily_total_dto: dto.TransactionDailyTotal) \
+            -> TransactionDailyTotal:
+        return TransactionDailyTotal(
+            user_id=daily_total_dto.user_id,
+            day=daily_total_dto.day,
+            category_id=daily_total_dto.category_id,
+            asset_id=daily_total_dto.asset_id,
+            total=daily_total_dto.total
+        )
+
+
+class AssetBalanceCheckpoint(Base):
+    __tablename__ = 'asset_balance_checkpoint'
+
+    asset_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True),
+                                                ForeignKey('asset.id',
+                                                           ondelete='CASCADE'),
+                                                primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    balance: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
+
+    def to_dto(self) -> dto.AssetBalanceCheckpoint:
+        return dto.AssetBalanceCheckpoint(
+            asset_id=self.asset_id,
+            day=self.day,
+            balance=self.balance
+        )
+
+    @classmethod
+    def from_dto(cls, checkpoint_dto: dto.AssetBalanceCheckpoint) \
+            -> AssetBalanceCheckpoint:
+        return AssetBalanceCheckpoint(
+            asset_id=checkpoint_dto.asset_id,
+            day=checkpoint_dto.day,
+            balance=checkpoint_dto.balance
+        )
+
+
 class TransactionCategory(Base):
     __tablename__ = 'transaction_category'
 
@@ -233,6 +359,7 @@ class TransactionCategory(Base):
     __table_args__ = (
         UniqueConstraint('title', 'type', 'user_id',
                          name='tran_category_unique'),
+        Index('ix_transaction_category_user_id_type', 'user_id', 'type'),
     )
 
     def to_dto(self) -> dto.TransactionCategory:
@@ -385,6 +512,11 @@ class CryptoTransaction(Base):
     price: Mapped[Decimal] = mapped_column(Numeric, nullable=False)
     created: Mapped[datetime] = mapped_column(DateTime, nullable=False)
 
+    __table_args__ = (
+        Index('ix_crypto_portfolio_transaction_user_id_crypto_asset_id',
+              'user_id', 'crypto_asset_id'),
+    )
+
     def to_dto(self) -> dto.CryptoTransaction:
         return dto.CryptoTransaction(
             id=self.id,
@@ -12,3 +12,8 @@ class MergeModelError(FinancesBaseException):
 class AddModelError(FinancesBaseException):
     def __init__(self):
         super().__init__('Can\'t create model')
+
+
+class SessionReleased(FinancesBaseException):
+    def __init__(self):
+        super().__init__('Database session was already released')
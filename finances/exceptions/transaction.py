@@ -21,6 +21,11 @@ class TransactionNotFound(TransactionException):
         super().__init__('Transaction not found')
 
 
+class InvalidTransactionCursor(TransactionException):
+    def __init__(self):
+        super().__init__('Invalid cursor')
+
+
 class TransactionCategoryNotFound(TransactionException):
     def __init__(self):
         super().__init__('Transaction category not found')
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from typing import AsyncIterator
+
+from finances.models import dto
+from finances.models.enums.export_format import ExportFormat
+
+FIELDS = ['id', 'created', 'type', 'amount', 'category_id', 'category',
+          'asset_id', 'asset', 'currency_id', 'currency_code',
+          'currency_name']
+
+
+def transaction_to_row(transaction: dto.Transaction) -> dict:
+    asset = transaction.asset
+    currency = asset.currency if asset else None
+    category = transaction.category
+    return {
+        'id': transaction.id,
+        'created': transaction.created.isoformat(),
+        'type': category.type.value if category else None,
+        'amount': str(transaction.amount),
+        'category_id': transaction.category_id,
+        'category': category.title if category else None,
+        'asset_id': str(transaction.asset_id),
+        'asset': asset.title if asset else None,
+        'currency_id': currency.id if currency else None,
+        'currency_code': currency.code if currency else None,
+        'currency_name': currency.name if currency else None,
+    }
+
+
+async def export_ndjson(batches: AsyncIterator[list[dto.Transaction]]) \
+        -> AsyncIterator[str]:
+    async for batch in batches:
+        yield ''.join(json.dumps(transaction_to_row(transaction)) + '\n'
+                      for transaction in batch)
+
+
+async def export_csv(batches: AsyncIterator[list[dto.Transaction]]) \
+        -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=FIELDS)
+    writer.writeheader()
+    async for batch in batches:
+        writer.writerows(transaction_to_row(transaction) for transaction in
+                         batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def export_transactions(batches: AsyncIterator[list[dto.Transaction]],
+                        export_format: ExportFormat) -> AsyncIterator[str]:
+    if export_format == ExportFormat.CSV:
+        return export_csv(batches)
+    return export_ndjson(batches)
@@ -0,0 +1,95 @@
+import argparse
+import asyncio
+import csv
+import logging
+from _decimal import Decimal
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from api.config import load_config
+from finances.database.dao import DAO
+from finances.models import dto
+
+
+def read_currency_rates_csv(path: Path) -> list[dto.CurrencyRate]:
+    rates_by_code: dict[str, dict[date, Decimal]] = {}
+    with open(path, newline='') as csv_file:
+        for row in csv.DictReader(csv_file):
+            rates_by_code.setdefault(row['code'], {})[
+                date.fromisoformat(row['day'])] = Decimal(row['rate'])
+
+    currency_rates = []
+    for code, rates in rates_by_code.items():
+        days = sorted(rates)
+        day, rate = days[0], rates[days[0]]
+        while day <= days[-1]:
+            rate = rates.get(day, rate)
+            currency_rates.append(dto.CurrencyRate(code=code, day=day,
+                                                   rate=rate))
+            day += timedelta(days=1)
+    return currency_rates
+
+
+def stub_currency_rates(
+        rates: dict[str, Decimal],
+        start_date: date,
+        end_date: date
+) -> list[dto.CurrencyRate]:
+    currency_rates = []
+    day = start_date
+    while day <= end_date:
+        currency_rates.extend(
+            dto.CurrencyRate(code=code, day=day, rate=rate) for code, rate in
+            rates.items())
+        day += timedelta(days=1)
+    return currency_rates
+
+
+async def import_currency_rates(
+        currency_rates: list[dto.CurrencyRate],
+        dao: DAO,
+        batch_size: int = 1000
+):
+    for i in range(0, len(currency_rates), batch_size):
+        await dao.currency_rate.upsert_many(currency_rates[i:i + batch_size])
+    await dao.commit()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description='Import daily currency rates against USD')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--csv', type=Path,
+                        help='CSV file with day,code,rate columns')
+    source.add_argument('--stub', nargs='+', metavar='CODE=RATE',
+                        help='constant rates for every day of the period')
+    parser.add_argument('--start', type=date.fromisoformat,
+                        default=date.today() - timedelta(days=365))
+    parser.add_argument('--end', type=date.fromisoformat,
+                        default=date.today())
+    return parser.parse_args()
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    if args.csv:
+        currency_rates = read_currency_rates_csv(args.csv)
+    else:
+        rates = dict(code_rate.split('=') for code_rate in args.stub)
+        currency_rates = stub_currency_rates(
+            {code: Decimal(rate) for code, rate in rates.items()},
+            args.start, args.end)
+
+    config = load_config()
+    engine = create_async_engine(url=config.db.make_url)
+    async with async_sessionmaker(engine)() as session:
+        await import_currency_rates(currency_rates, DAO(session=session))
+    await engine.dispose()
+    logging.info(f'Imported {len(currency_rates)} currency rates')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
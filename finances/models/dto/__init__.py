@@ -1,12 +1,16 @@
 from .user import User, UserWithCreds
-from .config import Config, AuthConfig, DatabaseConfig
-from .currency import Currency
-from .asset import Asset
+from .config import Config, AuthConfig, DatabaseConfig, PriceProviderConfig
+from .currency import Currency, Prices, CurrencyRate
+from .asset import Asset, AssetBalanceCheckpoint, AssetBalance
 from .transaction_category import TransactionCategory
-from .transaction import Transaction
+from .transaction import Transaction, TransactionCursor, \
+    TransactionFilter
 from .crypto_portfolio import CryptoPortfolio
-from .crypto_currency import CryptoCurrency, CryptoCurrencyPrice
+from .crypto_currency import CryptoCurrency, CryptoCurrencyPrice, \
+    PriceTick
 from .crypto_asset import CryptoAsset
 from .crypto_transaction import CryptoTransaction
 from .total_results import TotalByCategoryAndCurrency, TotalByCategory, \
-    Transactions
+    Transactions, Total, TotalByCurrency, TransactionsPage, \
+    TransactionDailyTotal, Dashboard, TotalByPeriodAndCurrency, \
+    TotalByPeriod, TotalSeries
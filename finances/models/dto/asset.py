@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from _decimal import Decimal
 from dataclasses import dataclass
+from datetime import date
 from uuid import UUID
 from .currency import Currency
 
@@ -25,3 +26,17 @@ class Asset:
             currency_id=dct.get('currency_id'),
             amount=dct.get('amount')
         )
+
+
+@dataclass
+class AssetBalanceCheckpoint:
+    asset_id: UUID
+    day: date
+    balance: Decimal
+
+
+@dataclass
+class AssetBalance:
+    asset_id: UUID
+    day: date
+    amount: Decimal
@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import timedelta
 
 
@@ -21,6 +21,18 @@ class DatabaseConfig:
 class AuthConfig:
     secret_key: str
     token_expire: timedelta
+    password_hash_workers: int = 4
+    credential_versions_refresh_interval: timedelta = timedelta(seconds=30)
+
+
+@dataclass
+class PriceProviderConfig:
+    name: str = 'live'
+    stub_prices_path: str | None = None
+    stub_latency: timedelta = timedelta()
+    stub_error_rate: float = 0
+    fcsapi_chunk_size: int = 20
+    fcsapi_max_concurrency: int = 4
 
 
 @dataclass
@@ -28,3 +40,16 @@ class Config:
     db: DatabaseConfig
     auth: AuthConfig
     fcsapi_access_key: str
+    price_cache_ttl: timedelta = timedelta(minutes=5)
+    price_refresh_interval: timedelta = timedelta(minutes=1)
+    price_api_timeout: timedelta = timedelta(seconds=2)
+    price_max_stale_age: timedelta = timedelta(hours=1)
+    price_rejected_code_cooldown: timedelta = timedelta(hours=1)
+    price_provider: PriceProviderConfig = field(
+        default_factory=PriceProviderConfig)
+    price_replay_path: str | None = None
+    price_replay_speed: float = 1
+    price_hub_size: int = 10000
+    price_hub_holdings_ttl: timedelta = timedelta(minutes=1)
+    replica_db: DatabaseConfig | None = None
+    replica_lag: timedelta = timedelta(seconds=5)
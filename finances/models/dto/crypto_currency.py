@@ -1,6 +1,7 @@
 import dataclasses
 from _decimal import Decimal
 from dataclasses import dataclass
+from datetime import datetime
 
 
 @dataclass
@@ -17,3 +18,10 @@ class CryptoCurrency:
 class CryptoCurrencyPrice:
     code: str
     price: Decimal
+
+
+@dataclass
+class PriceTick:
+    code: str
+    price: Decimal
+    time: datetime
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
 from _decimal import Decimal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime, date
 from uuid import UUID
 
 
@@ -24,3 +25,18 @@ class Currency:
             rate_to_base_currency=dct.get('rate_to_base_currency'),
             user_id=dct.get('user'),
         )
+
+
+@dataclass
+class Prices:
+    prices: dict[str, Decimal]
+    updated: datetime | None = None
+    stale: bool = False
+    missing: set[str] = field(default_factory=set)
+
+
+@dataclass
+class CurrencyRate:
+    code: str
+    day: date
+    rate: Decimal
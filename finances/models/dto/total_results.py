@@ -1,8 +1,17 @@
 from _decimal import Decimal
-from dataclasses import dataclass
-from datetime import date
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from uuid import UUID
 
-from .transaction import Transaction
+from .transaction import Transaction, TransactionCursor
+
+
+@dataclass
+class TotalByCurrency:
+    currency_code: str
+    rate_to_base_currency: Decimal | None
+    total: Decimal
+    converted_total: Decimal = Decimal(0)
 
 
 @dataclass
@@ -12,6 +21,25 @@ class TotalByCategoryAndCurrency:
     currency_code: str
     rate_to_base_currency: Decimal | None
     total: Decimal
+    converted_total: Decimal = Decimal(0)
+
+
+@dataclass
+class TotalByPeriodAndCurrency:
+    period: date
+    type: str
+    currency_code: str
+    total: Decimal
+    converted_total: Decimal = Decimal(0)
+
+
+@dataclass
+class TransactionDailyTotal:
+    user_id: UUID
+    day: date
+    category_id: int
+    asset_id: UUID
+    total: Decimal
 
 
 @dataclass
@@ -25,3 +53,41 @@ class TotalByCategory:
 class Transactions:
     created: date
     transactions: list[Transaction]
+
+
+@dataclass
+class TransactionsPage:
+    transactions: list[Transactions]
+    next_cursor: TransactionCursor | None = None
+
+
+@dataclass
+class Total:
+    total: Decimal | float | None
+    prices_updated: datetime | None = None
+    stale: bool = False
+    missing_prices: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Dashboard:
+    assets: Total
+    income: Total
+    expense: Total
+    categories: list[TotalByCategory]
+    crypto_portfolio: Total | None = None
+
+
+@dataclass
+class TotalByPeriod:
+    period: date
+    income: Decimal
+    expense: Decimal
+
+
+@dataclass
+class TotalSeries:
+    series: list[TotalByPeriod]
+    prices_updated: datetime | None = None
+    stale: bool = False
+    missing_prices: list[str] = field(default_factory=list)
@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from decimal import Decimal
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from uuid import UUID
+
+from finances.exceptions.transaction import InvalidTransactionCursor
 from .asset import Asset
 from .transaction_category import TransactionCategory
 
@@ -29,3 +33,34 @@ class Transaction:
             amount=dct.get('amount'),
             created=dct.get('created')
         )
+
+
+@dataclass
+class TransactionCursor:
+    created: datetime
+    id: int
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(
+            f'{self.created.isoformat()},{self.id}'.encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> TransactionCursor:
+        try:
+            created, transaction_id = base64.urlsafe_b64decode(
+                cursor.encode()).decode().split(',')
+            return TransactionCursor(
+                created=datetime.fromisoformat(created),
+                id=int(transaction_id)
+            )
+        except (binascii.Error, UnicodeError, ValueError):
+            raise InvalidTransactionCursor
+
+
+@dataclass
+class TransactionFilter:
+    asset_ids: list[UUID] = field(default_factory=list)
+    category_ids: list[int] = field(default_factory=list)
+    currency_codes: list[str] = field(default_factory=list)
+    min_amount: Decimal | None = None
+    max_amount: Decimal | None = None
@@ -20,18 +20,21 @@ class User:
             user_type=UserType(dct.get('user_type'))
         )
 
-    def add_password(self, hashed_password: str):
+    def add_password(self, hashed_password: str,
+                     credential_version: int = 0):
         return UserWithCreds(
             id=self.id,
             username=self.username,
             user_type=self.user_type,
-            hashed_password=hashed_password
+            hashed_password=hashed_password,
+            credential_version=credential_version
         )
 
 
 @dataclass
 class UserWithCreds(User):
     hashed_password: str | None = None
+    credential_version: int = 0
 
     def without_password(self) -> User:
         return User(
@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class SeriesBucket(Enum):
+    DAY = 'day'
+    WEEK = 'week'
+    MONTH = 'month'
@@ -1,3 +1,5 @@
+from _decimal import Decimal
+from datetime import date, timedelta
 from uuid import UUID
 
 from api.v1.dependencies import CurrencyAPI
@@ -42,20 +44,21 @@ async def add_new_asset(
 async def change_asset(
         asset: dict,
         user: dto.User,
-        asset_dao: AssetDAO,
-        currency_dao: CurrencyDAO) -> dto.Asset:
+        dao: DAO) -> dto.Asset:
     changed_asset_dto = dto.Asset.from_dict(asset)
-    currency_dto = await currency_dao.get_by_id(changed_asset_dto.currency_id)
+    currency_dto = await dao.currency.get_by_id(changed_asset_dto.currency_id)
     if currency_dto.is_custom and currency_dto.user_id != user.id:
         raise CurrencyNotFound
 
-    asset_dto = await asset_dao.get_by_id(changed_asset_dto.id)
+    asset_dto = await dao.asset.get_by_id(changed_asset_dto.id)
     if asset_dto.user_id != user.id:
         raise AssetNotFound
 
     changed_asset_dto.user_id = user.id
-    changed_asset = await asset_dao.merge(changed_asset_dto)
-    await asset_dao.commit()
+    changed_asset = await dao.asset.merge(changed_asset_dto)
+    if changed_asset.amount != asset_dto.amount:
+        await dao.asset_balance_checkpoint.invalidate_asset(asset_dto.id)
+    await dao.commit()
     changed_asset.currency = currency_dto
     return changed_asset
 
@@ -74,28 +77,122 @@ async def delete_asset(
     await asset_dao.commit()
 
 
+def get_assets_currencies_codes(assets: list[dto.Asset]) -> set[str]:
+    return set(asset.currency.code for asset in assets if
+               asset.currency and not asset.currency.is_custom)
+
+
+def sum_assets(assets: list[dto.Asset], prices: dto.Prices) -> Decimal:
+    amounts = []
+    for asset in assets:
+        if asset.currency:
+            if asset.currency.is_custom:
+                amounts.append(
+                    asset.amount / asset.currency.rate_to_base_currency)
+            elif asset.currency.code not in prices.missing:
+                amounts.append(
+                    asset.amount / prices.prices[asset.currency.code])
+    return sum(amounts)
+
+
 async def get_total_assets(
         currency_api: CurrencyAPI,
         user: dto.User,
         dao: DAO
-) -> float:
+) -> dto.Total:
     assets = await dao.asset.get_all(user)
     if not assets:
-        return 0
+        return dto.Total(total=0)
 
-    currencies_codes = set(
-        asset.currency.code for asset in assets if
-        asset.currency and not asset.currency.is_custom)
+    currencies_codes = get_assets_currencies_codes(assets)
     base_currency = await dao.user.get_base_currency(user)
+    await dao.release()
     prices = await get_prices(base_currency, currencies_codes, currency_api)
-    amounts = []
-    for asset in assets:
-        if asset.currency:
-            if asset.currency.is_custom:
-                amounts.append(
-                    asset.amount / asset.currency.rate_to_base_currency)
-            else:
-                amounts.append(
-                    asset.amount / prices.get(asset.currency.code, 1))
+    return dto.Total(total=round(sum_assets(assets, prices), 2),
+                     prices_updated=prices.updated, stale=prices.stale,
+                     missing_prices=sorted(prices.missing))
 
-    return round(sum(amounts), 2)
+
+def get_month_end(day: date) -> date:
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1) - \
+        timedelta(days=1)
+
+
+async def build_balance_checkpoints(
+        asset_dto: dto.Asset,
+        checkpoint: dto.AssetBalanceCheckpoint | None,
+        dao: DAO
+) -> list[dto.AssetBalanceCheckpoint]:
+    running_totals = await dao.transaction_daily_total \
+        .get_asset_running_totals(asset_dto.id,
+                                  checkpoint.day if checkpoint else None)
+    if checkpoint is not None:
+        balance = checkpoint.balance
+        month = checkpoint.day + timedelta(days=1)
+    elif running_totals:
+        balance = asset_dto.amount - running_totals[-1][1]
+        month = running_totals[0][0] - timedelta(days=1)
+    else:
+        return []
+
+    last_month_end = date.today().replace(day=1) - timedelta(days=1)
+    running_totals = dict(running_totals)
+    running_total = Decimal(0)
+    checkpoints = []
+    while get_month_end(month) <= last_month_end:
+        running_total = running_totals.get(month.replace(day=1),
+                                           running_total)
+        checkpoints.append(dto.AssetBalanceCheckpoint(
+            asset_id=asset_dto.id,
+            day=get_month_end(month),
+            balance=balance + running_total
+        ))
+        month = get_month_end(month) + timedelta(days=1)
+
+    await dao.asset_balance_checkpoint.put_many(checkpoints)
+    return checkpoints
+
+
+async def get_asset_balance(
+        asset_id: UUID,
+        balance_date: date,
+        user: dto.User,
+        dao: DAO
+) -> dto.AssetBalance:
+    asset_dto = await get_asset_by_id(asset_id, user, dao.asset)
+    checkpoint_day = min(balance_date.replace(day=1),
+                         date.today().replace(day=1)) - timedelta(days=1)
+    checkpoint = await dao.asset_balance_checkpoint.get_latest(asset_id,
+                                                               balance_date)
+    first_checkpoint = None
+    if checkpoint is None or checkpoint.day < checkpoint_day:
+        first_checkpoint = await dao.asset_balance_checkpoint.get_first(
+            asset_id)
+        if checkpoint is not None or first_checkpoint is None:
+            asset_dto.amount = await dao.asset.lock_amount(asset_id)
+            checkpoint = await dao.asset_balance_checkpoint.get_latest(
+                asset_id, balance_date)
+            checkpoints = await build_balance_checkpoints(asset_dto,
+                                                          checkpoint, dao)
+            await dao.commit()
+            first_checkpoint = first_checkpoint or next(iter(checkpoints),
+                                                        None)
+            checkpoint = next((new_checkpoint for new_checkpoint in
+                               reversed(checkpoints) if
+                               new_checkpoint.day <= balance_date),
+                              checkpoint)
+
+    if checkpoint is not None:
+        amount = checkpoint.balance + \
+            await dao.transaction_daily_total.get_asset_delta(
+                asset_id, checkpoint.day, balance_date)
+    elif first_checkpoint is not None:
+        amount = first_checkpoint.balance - \
+            await dao.transaction_daily_total.get_asset_delta(
+                asset_id, balance_date, first_checkpoint.day)
+    else:
+        amount = asset_dto.amount - \
+            await dao.transaction_daily_total.get_asset_delta(
+                asset_id, balance_date, None)
+    return dto.AssetBalance(asset_id=asset_id, day=balance_date,
+                            amount=amount)
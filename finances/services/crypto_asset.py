@@ -1,3 +1,4 @@
+from api.v1.dependencies import PriceHub
 from finances.database.dao.crypto_asset import CryptoAssetDAO
 from finances.exceptions.crypto_asset import CryptoAssetNotFound
 from finances.models import dto
@@ -17,10 +18,12 @@ async def get_crypto_asset_by_id(
 async def delete_crypto_asset(
         crypto_asset_id: int,
         user: dto.User,
-        crypto_asset_dao: CryptoAssetDAO
+        crypto_asset_dao: CryptoAssetDAO,
+        price_hub: PriceHub
 ):
     deleted_crypto_asset_id = await crypto_asset_dao.delete_by_id(
         crypto_asset_id, user.id)
     if deleted_crypto_asset_id is None:
         raise CryptoAssetNotFound
     await crypto_asset_dao.commit()
+    price_hub.invalidate(user.id)
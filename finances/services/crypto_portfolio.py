@@ -1,6 +1,8 @@
+from _decimal import Decimal
 from uuid import UUID
 
-from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies import CurrencyAPI, PriceHub
+from api.v1.dependencies.currency_api import CantGetPrice
 from finances.database.dao import DAO, UserDAO
 from finances.database.dao.crypto_portfolio import CryptoPortfolioDAO
 from finances.exceptions.crypto_portfolio import CryptoPortfolioNotFound
@@ -58,13 +60,15 @@ async def change_crypto_portfolio(
 async def delete_crypto_portfolio(
         crypto_portfolio_id: UUID,
         user: dto.User,
-        crypto_portfolio_dao: CryptoPortfolioDAO
+        crypto_portfolio_dao: CryptoPortfolioDAO,
+        price_hub: PriceHub
 ):
     deleted_crypto_portfolio_id = await crypto_portfolio_dao.delete_by_id(
         crypto_portfolio_id, user.id)
     if deleted_crypto_portfolio_id is None:
         raise CryptoPortfolioNotFound
     await crypto_portfolio_dao.commit()
+    price_hub.invalidate(user.id, crypto_portfolio_id)
 
 
 async def get_base_crypto_portfolio(
@@ -96,15 +100,48 @@ async def get_total_by_portfolio(
         crypto_portfolio_id: UUID,
         user: dto.User,
         dao: DAO,
-        currency_api: CurrencyAPI
-) -> float:
+        currency_api: CurrencyAPI,
+        price_hub: PriceHub
+) -> dto.Total:
+    holdings = None
+    if price_hub.get_valuation(user.id, crypto_portfolio_id) is None:
+        holdings = await get_crypto_portfolio_holdings(crypto_portfolio_id,
+                                                       user, dao)
+    await dao.release()
+    return await get_total_by_holdings(crypto_portfolio_id, holdings, user,
+                                       currency_api, price_hub)
+
+
+async def get_crypto_portfolio_holdings(
+        crypto_portfolio_id: UUID,
+        user: dto.User,
+        dao: DAO
+) -> dict[str, Decimal]:
     crypto_assets = await dao.crypto_asset.get_all(crypto_portfolio_id,
                                                    user.id)
-    crypto_codes = [crypto_asset.crypto_currency.code for crypto_asset in
-                    crypto_assets]
-    prices = await currency_api.get_crypto_currency_prices(crypto_codes)
-    total = 0
+    holdings = {}
     for crypto_asset in crypto_assets:
-        total += crypto_asset.amount * prices[
-            crypto_asset.crypto_currency.code + 'BUSD']
-    return total
+        code = crypto_asset.crypto_currency.code
+        holdings[code] = holdings.get(code, Decimal(0)) + crypto_asset.amount
+    return holdings
+
+
+async def get_total_by_holdings(
+        crypto_portfolio_id: UUID,
+        holdings: dict[str, Decimal] | None,
+        user: dto.User,
+        currency_api: CurrencyAPI,
+        price_hub: PriceHub
+) -> dto.Total:
+    if holdings is not None:
+        missing_codes = price_hub.get_missing_codes(set(holdings))
+        if missing_codes:
+            await currency_api.get_crypto_currency_prices(list(missing_codes))
+        price_hub.track(user.id, crypto_portfolio_id, holdings)
+    valuation = price_hub.get_valuation(user.id, crypto_portfolio_id)
+    if valuation is None:
+        raise CantGetPrice
+
+    total, prices_updated = valuation
+    return dto.Total(total=total, prices_updated=prices_updated,
+                     stale=currency_api.is_stale(prices_updated))
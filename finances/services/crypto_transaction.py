@@ -1,3 +1,4 @@
+from api.v1.dependencies import PriceHub
 from finances.database.dao import DAO
 from finances.database.dao.crypto_transaction import CryptoTransactionDAO
 from finances.exceptions.crypto_asset import CryptoAssetNotFound
@@ -22,7 +23,8 @@ async def get_crypto_transaction_by_id(
 async def add_crypto_transaction(
         crypto_transaction: dict,
         user: dto.User,
-        dao: DAO
+        dao: DAO,
+        price_hub: PriceHub
 ) -> dto.CryptoTransaction:
     portfolio_dto = await dao.crypto_portfolio.get_by_id(
         crypto_transaction['portfolio_id'])
@@ -60,13 +62,15 @@ async def add_crypto_transaction(
     crypto_transaction_dto = await dao.crypto_transaction.create(
         crypto_transaction_dto)
     await dao.commit()
+    price_hub.invalidate(user.id, crypto_asset_dto.portfolio_id)
     return crypto_transaction_dto
 
 
 async def change_crypto_transaction(
         crypto_transaction: dict,
         user: dto.User,
-        dao: DAO
+        dao: DAO,
+        price_hub: PriceHub
 ):
     crypto_transaction_dto = await dao.crypto_transaction.get_by_id(
         crypto_transaction['id'])
@@ -98,13 +102,15 @@ async def change_crypto_transaction(
     crypto_transaction_dto = await dao.crypto_transaction.merge(
         crypto_transaction_dto)
     await dao.commit()
+    price_hub.invalidate(user.id, crypto_asset_dto.portfolio_id)
     return crypto_transaction_dto
 
 
 async def delete_crypto_transaction(
         crypto_transaction_id: int,
         user: dto.User,
-        dao: DAO
+        dao: DAO,
+        price_hub: PriceHub
 ):
     crypto_transaction_dto = await dao.crypto_transaction.delete_by_id(
         crypto_transaction_id, user.id)
@@ -120,3 +126,4 @@ async def delete_crypto_transaction(
 
     await dao.crypto_asset.merge(crypto_asset_dto)
     await dao.commit()
+    price_hub.invalidate(user.id, crypto_asset_dto.portfolio_id)
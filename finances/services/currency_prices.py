@@ -1,19 +1,25 @@
+import logging
 from _decimal import Decimal
 
 from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.currency_api import CantGetPrice
+from finances.database.dao import DAO
 from finances.database.dao.crypto_currency import CryptoCurrencyDAO
 from finances.models import dto
 
 
+def get_base_currency_code(base_currency: dto.Currency | None) -> str:
+    if base_currency is None:
+        return 'USD'
+    return base_currency.code
+
+
 async def get_prices(
         base_currency: dto.Currency | None,
         currencies_codes: set[str],
         currency_api: CurrencyAPI
-) -> dict[str, Decimal]:
-    if base_currency is None:
-        base_currency_code = 'USD'
-    else:
-        base_currency_code = base_currency.code
+) -> dto.Prices:
+    base_currency_code = get_base_currency_code(base_currency)
 
     try:
         currencies_codes.remove(base_currency_code)
@@ -21,11 +27,16 @@ async def get_prices(
         pass
     if len(currencies_codes) == 0:
         prices = {}
+        updated = None
     else:
         prices = await currency_api.get_currency_prices(currencies_codes,
                                                         base_currency_code)
+        updated = currency_api.get_currency_prices_updated(
+            currencies_codes, base_currency_code)
+    missing = currencies_codes - prices.keys()
     prices[base_currency_code] = Decimal('1')
-    return prices
+    return dto.Prices(prices=prices, updated=updated,
+                      stale=currency_api.is_stale(updated), missing=missing)
 
 
 async def get_crypto_currency_price(
@@ -35,6 +46,44 @@ async def get_crypto_currency_price(
 ) -> dto.CryptoCurrencyPrice:
     crypto_currency_dto = await crypto_currency_dao.get_by_id(
         crypto_currency_id)
+    await crypto_currency_dao.release()
     price = await currency_api.get_crypto_currency_price(
         crypto_currency_dto.code)
     return dto.CryptoCurrencyPrice(code=crypto_currency_dto.code, price=price)
+
+
+async def refresh_held_prices(dao: DAO, currency_api: CurrencyAPI):
+    currencies_codes = await dao.currency.get_held_codes() | \
+        await dao.currency.get_base_codes()
+    crypto_codes = await dao.crypto_currency.get_held_codes()
+    await dao.release()
+
+    currencies_codes.discard(currency_api.pivot_currency)
+    if currencies_codes:
+        try:
+            await currency_api.refresh_currency_prices(currencies_codes)
+        except CantGetPrice:
+            logging.error('[refresh_held_prices] unable to refresh currency '
+                          'prices')
+
+    if crypto_codes:
+        failed_codes = await refresh_crypto_prices(sorted(crypto_codes),
+                                                   currency_api)
+        if failed_codes:
+            logging.error('[refresh_held_prices] unable to refresh crypto '
+                          f'currency prices: {sorted(failed_codes)}')
+
+
+async def refresh_crypto_prices(crypto_codes: list[str],
+                                currency_api: CurrencyAPI) -> set[str]:
+    try:
+        prices = await currency_api.refresh_crypto_currency_prices(
+            set(crypto_codes))
+    except CantGetPrice:
+        if len(crypto_codes) == 1 or currency_api.crypto_breaker.is_open:
+            return set(crypto_codes)
+        middle = len(crypto_codes) // 2
+        return await refresh_crypto_prices(crypto_codes[:middle],
+                                           currency_api) | \
+            await refresh_crypto_prices(crypto_codes[middle:], currency_api)
+    return {code for code in crypto_codes if f'{code}BUSD' not in prices}
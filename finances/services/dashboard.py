@@ -0,0 +1,94 @@
+import asyncio
+from _decimal import Decimal
+from datetime import date
+from uuid import UUID
+
+from api.v1.dependencies import CurrencyAPI, PriceHub
+from api.v1.dependencies.currency_api import CantGetPrice
+from finances.database.dao import DAO
+from finances.models import dto
+from finances.models.enums.transaction_type import TransactionType
+
+from .asset import get_assets_currencies_codes, sum_assets
+from .crypto_portfolio import get_crypto_portfolio_holdings, \
+    get_total_by_holdings
+from .currency_prices import get_prices, get_base_currency_code
+from .transaction import get_unconverted_currencies_codes, \
+    sum_totals_by_category, sort_totals_by_category
+
+
+def _make_total(total, prices: dto.Prices, codes: set[str]) -> dto.Total:
+    return dto.Total(total=round(total, 2), prices_updated=prices.updated,
+                     stale=prices.stale,
+                     missing_prices=sorted(prices.missing & codes))
+
+
+async def _get_crypto_total(
+        crypto_portfolio_id: UUID,
+        holdings: dict[str, Decimal] | None,
+        user: dto.User,
+        currency_api: CurrencyAPI,
+        price_hub: PriceHub
+) -> dto.Total:
+    try:
+        return await get_total_by_holdings(crypto_portfolio_id, holdings,
+                                           user, currency_api, price_hub)
+    except CantGetPrice:
+        missing_codes = price_hub.get_missing_codes(set(holdings or ()))
+        return dto.Total(total=None, stale=True,
+                         missing_prices=sorted(missing_codes))
+
+
+async def get_dashboard(
+        start_date: date,
+        end_date: date,
+        user: dto.User,
+        currency_api: CurrencyAPI,
+        price_hub: PriceHub,
+        dao: DAO
+) -> dto.Dashboard:
+    base_currency = await dao.user.get_base_currency(user)
+    assets = await dao.asset.get_all(user)
+    totals_cat_and_cur = await dao.transaction.get_total_categories_by_period(
+        user, start_date, end_date, None,
+        get_base_currency_code(base_currency)
+    )
+    crypto_portfolio = await dao.user.get_base_crypto_portfolio(user)
+    holdings = None
+    if crypto_portfolio is not None and \
+            price_hub.get_valuation(user.id, crypto_portfolio.id) is None:
+        holdings = await get_crypto_portfolio_holdings(crypto_portfolio.id,
+                                                       user, dao)
+    await dao.release()
+
+    assets_codes = get_assets_currencies_codes(assets)
+    transactions_codes = get_unconverted_currencies_codes(totals_cat_and_cur)
+    prices_request = get_prices(base_currency,
+                                assets_codes | transactions_codes,
+                                currency_api)
+    if crypto_portfolio is None:
+        prices = await prices_request
+        crypto_total = None
+    else:
+        prices, crypto_total = await asyncio.gather(
+            prices_request,
+            _get_crypto_total(crypto_portfolio.id, holdings, user,
+                              currency_api, price_hub)
+        )
+
+    totals_by_category = sum_totals_by_category(totals_cat_and_cur, prices)
+    totals_by_type = {transaction_type.value: 0 for transaction_type in
+                      TransactionType}
+    for (_, transaction_type), total in totals_by_category.items():
+        totals_by_type[transaction_type] += total
+
+    return dto.Dashboard(
+        assets=_make_total(sum_assets(assets, prices), prices,
+                           assets_codes),
+        income=_make_total(totals_by_type[TransactionType.INCOME.value],
+                           prices, transactions_codes),
+        expense=_make_total(totals_by_type[TransactionType.EXPENSE.value],
+                            prices, transactions_codes),
+        categories=sort_totals_by_category(totals_by_category),
+        crypto_portfolio=crypto_total
+    )
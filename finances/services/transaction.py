@@ -1,15 +1,18 @@
-from datetime import date
+from _decimal import Decimal
+from datetime import date, timedelta
 
 from api.v1.dependencies import CurrencyAPI
 from finances.database.dao import DAO
 from finances.database.dao.transaction_category import TransactionCategoryDAO
+from finances.exceptions.asset import AssetNotFound
 from finances.exceptions.transaction import TransactionCategoryNotFound, \
     TransactionNotFound, TransactionCantBeChanged
 from finances.models import dto
+from finances.models.enums.series_bucket import SeriesBucket
 from finances.models.enums.transaction_type import TransactionType
 
 from .asset import get_asset_by_id
-from .currency_prices import get_prices
+from .currency_prices import get_prices, get_base_currency_code
 from ..database.dao.transaction import TransactionDAO
 from ..models.dto import TotalByCategory
 
@@ -106,6 +109,8 @@ async def add_transaction(
         created=transaction['created']
     )
     transaction_dto = await dao.transaction.create(transaction_dto)
+    await dao.transaction_daily_total.add(transaction_dto)
+    await dao.asset_balance_checkpoint.invalidate([transaction_dto])
 
     if category_dto.type == TransactionType.INCOME:
         asset_dto.amount += transaction_dto.amount
@@ -123,6 +128,53 @@ async def add_transaction(
     return transaction_dto
 
 
+def get_amount_change(
+        transaction_type: TransactionType,
+        amount: Decimal
+) -> Decimal:
+    if transaction_type == TransactionType.EXPENSE:
+        return -amount
+    return amount
+
+
+async def import_transactions(
+        transactions: list[dict],
+        user: dto.User,
+        dao: DAO
+) -> int:
+    assets = {asset.id: asset for asset in await dao.asset.get_all(user)}
+    categories = {category.id: category for category in
+                  await dao.transaction_category.get_all(user)}
+
+    transactions_dto = []
+    amounts = {}
+    for transaction in transactions:
+        asset_dto = assets.get(transaction['asset_id'])
+        if asset_dto is None:
+            raise AssetNotFound
+        category_dto = categories.get(transaction['category_id'])
+        if category_dto is None:
+            raise TransactionCategoryNotFound
+
+        amounts[asset_dto.id] = amounts.get(asset_dto.id, 0) + \
+            get_amount_change(category_dto.type, transaction['amount'])
+        transactions_dto.append(dto.Transaction(
+            id=None,
+            user_id=user.id,
+            asset_id=asset_dto.id,
+            category_id=category_dto.id,
+            amount=transaction['amount'],
+            created=transaction['created']
+        ))
+
+    transactions_ids = await dao.transaction.create_many(transactions_dto)
+    await dao.transaction_daily_total.add_many(transactions_dto)
+    await dao.asset_balance_checkpoint.invalidate(transactions_dto)
+    await dao.asset.update_amounts(amounts, user.id)
+    await dao.commit()
+    return len(transactions_ids)
+
+
 async def change_transaction(
         transaction: dict,
         user: dto.User,
@@ -179,12 +231,16 @@ async def change_transaction(
 
         await dao.asset.merge(asset_dto)
 
+    await dao.transaction_daily_total.subtract(transaction_dto)
+    await dao.asset_balance_checkpoint.invalidate([transaction_dto])
     transaction_dto.asset_id = asset_id
     transaction_dto.category = category_id
     transaction_dto.amount = amount
     transaction_dto.created = created
 
     await dao.transaction.merge(transaction_dto)
+    await dao.transaction_daily_total.add(transaction_dto)
+    await dao.asset_balance_checkpoint.invalidate([transaction_dto])
     await dao.commit()
 
     transaction_dto.asset = asset_dto
@@ -201,6 +257,8 @@ async def delete_transaction(
                                                          user.id)
     if transaction_dto is None:
         raise TransactionNotFound
+    await dao.transaction_daily_total.subtract(transaction_dto)
+    await dao.asset_balance_checkpoint.invalidate([transaction_dto])
 
     category = await dao.transaction_category.get_by_id(
         transaction_dto.category_id)
@@ -217,6 +275,90 @@ async def delete_transaction(
     await dao.commit()
 
 
+async def change_transactions(
+        transactions: list[dict],
+        user: dto.User,
+        dao: DAO
+) -> int:
+    changes = {transaction['id']: transaction for transaction in transactions}
+    transactions_dto = await dao.transaction.get_many(list(changes), user.id)
+    if len(transactions_dto) != len(changes):
+        raise TransactionNotFound
+    assets = {asset.id: asset for asset in await dao.asset.get_all(user)}
+    categories = {category.id: category for category in
+                  await dao.transaction_category.get_all(user)}
+
+    old_transactions = []
+    changed_transactions = []
+    amounts = {}
+    for transaction_dto in transactions_dto:
+        change = changes[transaction_dto.id]
+        if all([
+            transaction_dto.asset_id == change['asset_id'],
+            transaction_dto.category_id == change['category_id'],
+            transaction_dto.amount == change['amount'],
+            transaction_dto.created == change['created']
+        ]):
+            continue
+        if change['asset_id'] not in assets:
+            raise AssetNotFound
+        category_dto = categories.get(change['category_id'])
+        if category_dto is None:
+            raise TransactionCategoryNotFound
+        if category_dto.type != transaction_dto.category.type:
+            raise TransactionCantBeChanged(
+                'Transaction category cannot be changed')
+
+        amounts[transaction_dto.asset_id] = \
+            amounts.get(transaction_dto.asset_id, 0) - get_amount_change(
+                transaction_dto.category.type, transaction_dto.amount)
+        amounts[change['asset_id']] = \
+            amounts.get(change['asset_id'], 0) + get_amount_change(
+                category_dto.type, change['amount'])
+        old_transactions.append(transaction_dto)
+        changed_transactions.append(dto.Transaction(
+            id=transaction_dto.id,
+            user_id=user.id,
+            asset_id=change['asset_id'],
+            category_id=category_dto.id,
+            amount=change['amount'],
+            created=change['created']
+        ))
+
+    await dao.transaction_daily_total.add_many(old_transactions, sign=-1)
+    await dao.transaction.update_many(changed_transactions)
+    await dao.transaction_daily_total.add_many(changed_transactions)
+    await dao.asset_balance_checkpoint.invalidate(old_transactions +
+                                                  changed_transactions)
+    await dao.asset.update_amounts(amounts, user.id)
+    await dao.commit()
+    return len(changed_transactions)
+
+
+async def delete_transactions(
+        transactions_ids: list[int],
+        user: dto.User,
+        dao: DAO
+) -> int:
+    transactions_ids = set(transactions_ids)
+    transactions_dto = await dao.transaction.delete_many(
+        list(transactions_ids), user.id)
+    if len(transactions_dto) != len(transactions_ids):
+        raise TransactionNotFound
+
+    amounts = {}
+    for transaction_dto in transactions_dto:
+        amounts[transaction_dto.asset_id] = \
+            amounts.get(transaction_dto.asset_id, 0) - get_amount_change(
+                transaction_dto.category.type, transaction_dto.amount)
+
+    await dao.transaction_daily_total.add_many(transactions_dto, sign=-1)
+    await dao.asset_balance_checkpoint.invalidate(transactions_dto)
+    await dao.asset.update_amounts(amounts, user.id)
+    await dao.commit()
+    return len(transactions_dto)
+
+
 async def get_total_transactions_by_period(
         start_date: date,
         end_date: date,
@@ -224,26 +366,38 @@ async def get_total_transactions_by_period(
         user: dto.User,
         currency_api: CurrencyAPI,
         dao: DAO
-) -> float:
-    currencies_amount = await dao.transaction.get_total_by_period(
+) -> dto.Total:
+    base_currency = await dao.user.get_base_currency(user)
+    totals_by_currency = await dao.transaction.get_total_by_period(
         user,
         start_date,
         end_date,
-        transaction_type.value
+        transaction_type.value,
+        get_base_currency_code(base_currency)
     )
-    if not currencies_amount:
-        return 0
+    if not totals_by_currency:
+        return dto.Total(total=0)
 
+    total = sum(total_by_currency.converted_total for total_by_currency in
+                totals_by_currency)
     currencies_codes = set(
-        [currency for currency, value in currencies_amount.items() if
-         value[0] is None])
-    base_currency = await dao.user.get_base_currency(user)
-    prices = await get_prices(base_currency, currencies_codes, currency_api)
+        total_by_currency.currency_code for total_by_currency in
+        totals_by_currency if total_by_currency.total)
+    if not currencies_codes:
+        return dto.Total(total=round(total, 2))
 
-    return round(sum([
-        value[1] / prices[code] if value[0] is None else value[1] / value[0]
-        for code, value in currencies_amount.items()
-    ]), 2)
+    await dao.release()
+    prices = await get_prices(base_currency, currencies_codes, currency_api)
+    total += sum(
+        total_by_currency.total / prices.prices[
+            total_by_currency.currency_code]
+        for total_by_currency in totals_by_currency if
+        total_by_currency.total and
+        total_by_currency.currency_code not in prices.missing
+    )
+    return dto.Total(total=round(total, 2), prices_updated=prices.updated,
+                     stale=prices.stale,
+                     missing_prices=sorted(prices.missing))
 
 
 async def get_total_categories_by_period(
@@ -254,32 +408,122 @@ async def get_total_categories_by_period(
         currency_api: CurrencyAPI,
         dao: DAO
 ) -> list[TotalByCategory]:
+    base_currency = await dao.user.get_base_currency(user)
     totals_cat_and_cur = await dao.transaction.get_total_categories_by_period(
-        user, start_date, end_date, transaction_type.value
+        user, start_date, end_date, transaction_type.value,
+        get_base_currency_code(base_currency)
     )
     if not totals_cat_and_cur:
         return []
-    currencies_codes = set(
-        total_cat_and_cur.currency_code for total_cat_and_cur in
-        totals_cat_and_cur if total_cat_and_cur.rate_to_base_currency is None)
+    currencies_codes = get_unconverted_currencies_codes(totals_cat_and_cur)
 
-    base_currency = await dao.user.get_base_currency(user)
-    prices = await get_prices(base_currency, currencies_codes, currency_api)
+    await dao.release()
+    prices = await get_prices(base_currency, currencies_codes, currency_api) \
+        if currencies_codes else None
+    return sort_totals_by_category(
+        sum_totals_by_category(totals_cat_and_cur, prices))
+
+
+def get_unconverted_currencies_codes(
+        totals_cat_and_cur: list[dto.TotalByCategoryAndCurrency]
+) -> set[str]:
+    return set(total_cat_and_cur.currency_code for total_cat_and_cur in
+               totals_cat_and_cur if total_cat_and_cur.total)
+
+
+def sum_totals_by_category(
+        totals_cat_and_cur: list[dto.TotalByCategoryAndCurrency],
+        prices: dto.Prices | None
+) -> dict[tuple[str, str], Decimal]:
     totals_by_category = {}
     for total_cat_and_cur in totals_cat_and_cur:
-        category = totals_by_category.get(total_cat_and_cur.category)
-        rate = total_cat_and_cur.rate_to_base_currency \
-            if total_cat_and_cur.rate_to_base_currency \
-            else prices[total_cat_and_cur.currency_code]
-        total = total_cat_and_cur.total / rate
-        if category is None:
-            totals_by_category[
-                total_cat_and_cur.category] = total
+        key = (total_cat_and_cur.category, total_cat_and_cur.type)
+        total = total_cat_and_cur.converted_total
+        if total_cat_and_cur.total and \
+                total_cat_and_cur.currency_code not in prices.missing:
+            total += total_cat_and_cur.total / prices.prices[
+                total_cat_and_cur.currency_code]
+        totals_by_category[key] = totals_by_category.get(key, 0) + total
+    return totals_by_category
+
+
+def sort_totals_by_category(
+        totals_by_category: dict[tuple[str, str], Decimal]
+) -> list[TotalByCategory]:
+    return sorted([TotalByCategory(category=category, type=type_,
+                                   total=round(total, 2))
+                   for (category, type_), total in
+                   totals_by_category.items()],
+                  key=lambda x: x.total, reverse=True)
+
+
+def get_series_periods(
+        start_date: date,
+        end_date: date,
+        bucket: SeriesBucket
+) -> list[date]:
+    if bucket == SeriesBucket.MONTH:
+        period = start_date.replace(day=1)
+    elif bucket == SeriesBucket.WEEK:
+        period = start_date - timedelta(days=start_date.weekday())
+    else:
+        period = start_date
+
+    periods = []
+    while period <= end_date:
+        periods.append(period)
+        if bucket == SeriesBucket.MONTH:
+            period = (period.replace(day=28) + timedelta(days=4)) \
+                .replace(day=1)
+        elif bucket == SeriesBucket.WEEK:
+            period += timedelta(weeks=1)
         else:
-            totals_by_category[
-                total_cat_and_cur.category] += total
+            period += timedelta(days=1)
+    return periods
 
-    return sorted([TotalByCategory(category=k, type=transaction_type.value,
-                                   total=round(v, 2))
-                   for k, v in totals_by_category.items()],
-                  key=lambda x: x.total, reverse=True)
+
+async def get_total_series(
+        start_date: date,
+        end_date: date,
+        bucket: SeriesBucket,
+        user: dto.User,
+        currency_api: CurrencyAPI,
+        dao: DAO
+) -> dto.TotalSeries:
+    base_currency = await dao.user.get_base_currency(user)
+    totals_by_period = await dao.transaction.get_total_series(
+        user, start_date, end_date, bucket.value,
+        get_base_currency_code(base_currency)
+    )
+    currencies_codes = set(
+        total_by_period.currency_code for total_by_period in
+        totals_by_period if total_by_period.total)
+    await dao.release()
+    prices = await get_prices(base_currency, currencies_codes, currency_api) \
+        if currencies_codes else None
+
+    series = {period: {transaction_type: Decimal(0) for transaction_type in
+                       TransactionType}
+              for period in get_series_periods(start_date, end_date, bucket)}
+    for total_by_period in totals_by_period:
+        total = total_by_period.converted_total
+        if total_by_period.total and \
+                total_by_period.currency_code not in prices.missing:
+            total += total_by_period.total / prices.prices[
+                total_by_period.currency_code]
+        totals = series.setdefault(
+            total_by_period.period,
+            {transaction_type: Decimal(0) for transaction_type in
+             TransactionType})
+        totals[TransactionType(total_by_period.type)] += total
+
+    total_series = dto.TotalSeries(series=[dto.TotalByPeriod(
+        period=period,
+        income=round(totals[TransactionType.INCOME], 2),
+        expense=round(totals[TransactionType.EXPENSE], 2)
+    ) for period, totals in sorted(series.items())])
+    if prices is not None:
+        total_series.prices_updated = prices.updated
+        total_series.stale = prices.stale
+        total_series.missing_prices = sorted(prices.missing)
+    return total_series
@@ -10,10 +10,11 @@ async def signup(
         auth_provider: AuthProvider,
         dao: DAO
 ):
+    hashed_password = await auth_provider.get_password_hash_async(
+        user['password'])
     user_dto = await dao.user.create(
         dto.UserWithCreds(username=user['username'],
-                          hashed_password=auth_provider.get_password_hash(
-                              user['password']),
+                          hashed_password=hashed_password,
                           user_type=UserType.USER))
     base_currency = await dao.currency.get_by_code('USD')
     if base_currency:
@@ -23,18 +24,26 @@ async def signup(
 
 async def set_username(user: dto.User,
                        username: str,
-                       user_dao: UserDAO):
+                       user_dao: UserDAO) -> int:
     try:
         await user_dao.get_by_username(username)
     except UserNotFound:
-        await user_dao.set_username(user, username)
+        credential_version = await user_dao.set_username(user, username)
         await user_dao.commit()
+        return credential_version
     else:
         raise UserExists
 
 
 async def set_password(user: dto.User,
                        new_hashed_password: str,
-                       user_dao: UserDAO):
-    await user_dao.set_password(user, new_hashed_password)
+                       user_dao: UserDAO) -> int:
+    credential_version = await user_dao.set_password(user,
+                                                     new_hashed_password)
+    await user_dao.commit()
+    return credential_version
+
+
+async def delete_user(user: dto.User, user_dao: UserDAO):
+    await user_dao.delete_by_id(user.id)
     await user_dao.commit()
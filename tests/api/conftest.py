@@ -10,7 +10,9 @@ from sqlalchemy.ext.asyncio import async_sessionmaker
 
 from api import v1
 from api.main_factory import create_app
-from api.v1.dependencies import AuthProvider
+from api.v1.dependencies import AuthProvider, CurrencyAPI, PriceHub, \
+    get_auth_provider
+from api.v1.dependencies.price_providers import StubPriceProvider
 from finances.database.dao import DAO
 from finances.database.models import Currency, Asset, TransactionCategory
 from finances.exceptions.asset import AssetNotFound
@@ -38,8 +40,11 @@ from tests.fixtures.user_data import get_test_user
 def app(config: Config, sessionmaker: async_sessionmaker) -> FastAPI:
     app = create_app()
     api_router_v1 = APIRouter()
+    currency_api = CurrencyAPI(StubPriceProvider(), StubPriceProvider())
+    price_hub = PriceHub()
+    currency_api.subscribe_crypto_prices(price_hub.publish_prices)
     v1.dependencies.setup(app, api_router_v1, sessionmaker, config,
-                          None)  # noqa
+                          currency_api, price_hub)
     v1.routes.setup_routers(api_router_v1)
     main_api_router = APIRouter(prefix='/api')
     main_api_router.include_router(api_router_v1, prefix='/v1')
@@ -56,8 +61,8 @@ async def client(app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
 
 
 @pytest.fixture(scope='session')
-def auth(config: Config) -> AuthProvider:
-    return AuthProvider(config.auth)
+def auth(app: FastAPI) -> AuthProvider:
+    return app.dependency_overrides[get_auth_provider]()
 
 
 @pytest_asyncio.fixture
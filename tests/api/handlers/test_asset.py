@@ -1,3 +1,5 @@
+import uuid
+
 import pytest
 from httpx import AsyncClient
 
@@ -174,3 +176,68 @@ async def test_delete_asset_currency(
 
     await dao.asset.delete_by_id(asset.id, user.id)
     await dao.commit()
+
+
+@pytest.mark.asyncio
+async def test_get_asset_balance(
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider,
+        currency: dto.Currency,
+        transaction_category: dto.TransactionCategory
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    resp = await client.post('/api/v1/asset/add', headers=headers, json={
+        'title': f'test asset balance {uuid.uuid4()}',
+        'currency_id': currency.id,
+        'amount': 100
+    })
+    assert resp.is_success
+    asset_id = resp.json()['id']
+    sign = 1 if transaction_category.type.value == 'income' else -1
+
+    async def add_transaction(amount: int, created: str) -> int:
+        resp = await client.post('/api/v1/transaction/add', headers=headers,
+                                 json={
+                                     'asset_id': asset_id,
+                                     'category_id': transaction_category.id,
+                                     'amount': amount,
+                                     'created': created
+                                 })
+        assert resp.is_success
+        return resp.json()['id']
+
+    async def get_balance(balance_date: str) -> float:
+        resp = await client.get('/api/v1/asset/balance', headers=headers,
+                                params={'assetId': asset_id,
+                                        'date': balance_date})
+        assert resp.is_success
+        return resp.json()['amount']
+
+    transaction_id = await add_transaction(10, '2010-01-15T10:00:00')
+    await add_transaction(5, '2010-03-10T10:00:00')
+
+    assert await get_balance('2009-12-31') == 100
+    assert await get_balance('2010-01-15') == 100 + sign * 10
+    assert await get_balance('2010-02-28') == 100 + sign * 10
+    assert await get_balance('2010-03-31') == 100 + sign * 15
+    assert await get_balance('2030-01-01') == 100 + sign * 15
+
+    await add_transaction(20, '2010-02-01T10:00:00')
+    assert await get_balance('2010-01-31') == 100 + sign * 10
+    assert await get_balance('2010-03-31') == 100 + sign * 35
+
+    resp = await client.put('/api/v1/transaction/change', headers=headers,
+                            json={
+                                'id': transaction_id,
+                                'asset_id': asset_id,
+                                'category_id': transaction_category.id,
+                                'amount': 30,
+                                'created': '2010-01-15T10:00:00'
+                            })
+    assert resp.is_success
+    assert await get_balance('2009-12-31') == 100
+    assert await get_balance('2010-01-31') == 100 + sign * 30
+    assert await get_balance('2010-03-31') == 100 + sign * 55
+    assert await get_balance('2030-01-01') == 100 + sign * 55
@@ -0,0 +1,84 @@
+import pytest
+from fastapi import FastAPI
+from httpx import AsyncClient
+
+from api.v1.dependencies import AuthProvider, currency_api_provider, \
+    price_hub_provider
+from finances.models import dto
+
+
+@pytest.mark.asyncio
+async def test_dashboard_matches_totals(
+        transaction: dto.Transaction,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    params = {'startDate': '2000-01-01', 'endDate': '2100-01-01'}
+
+    resp = await client.get('/api/v1/dashboard', headers=headers,
+                            params=params)
+    assert resp.is_success
+    dashboard = resp.json()
+
+    resp = await client.get('/api/v1/asset/totalPrices', headers=headers)
+    assert resp.is_success
+    assert dashboard['assets']['total'] == resp.json()['total']
+
+    categories = []
+    for transaction_type in ('income', 'expense'):
+        type_params = params | {'type': transaction_type}
+        resp = await client.get('/api/v1/transaction/totalByPeriod',
+                                headers=headers, params=type_params)
+        assert resp.is_success
+        assert dashboard[transaction_type]['total'] == resp.json()['total']
+
+        resp = await client.get(
+            '/api/v1/transaction/totalCategoriesByPeriod',
+            headers=headers, params=type_params)
+        assert resp.is_success
+        categories.extend(resp.json())
+
+    def sort_key(category: dict) -> tuple:
+        return category['type'], category['category']
+
+    assert sorted(dashboard['categories'], key=sort_key) == \
+        sorted(categories, key=sort_key)
+
+
+@pytest.mark.asyncio
+async def test_dashboard_without_crypto_prices(
+        transaction: dto.Transaction,
+        crypto_asset: dto.CryptoAsset,
+        crypto_currency: dto.CryptoCurrency,
+        app: FastAPI,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider
+):
+    currency_api = app.dependency_overrides[currency_api_provider]()
+    price_hub = app.dependency_overrides[price_hub_provider]()
+    code = crypto_currency.code
+    price_hub.invalidate(user.id)
+    price_hub.prices.pop(code, None)
+    price_hub.updated.pop(code, None)
+    currency_api.price_cache._prices.pop((code, 'BUSD'), None)
+    currency_api.crypto_provider.error_rate = 1
+
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    try:
+        resp = await client.get('/api/v1/dashboard', headers=headers,
+                                params={'startDate': '2000-01-01',
+                                        'endDate': '2100-01-01'})
+    finally:
+        currency_api.crypto_provider.error_rate = 0
+        currency_api.crypto_breaker.record_success()
+    assert resp.is_success
+    dashboard = resp.json()
+    assert dashboard['assets']['total'] is not None
+    assert dashboard['crypto_portfolio']['total'] is None
+    assert dashboard['crypto_portfolio']['stale']
+    assert dashboard['crypto_portfolio']['missing_prices'] == [code]
@@ -1,4 +1,6 @@
+import json
 from _decimal import Decimal
+from datetime import datetime, timedelta, date
 
 import pytest
 from httpx import AsyncClient
@@ -8,6 +10,10 @@ from finances.database.dao import DAO
 from finances.exceptions.transaction import TransactionNotFound
 from finances.models import dto
 
+# more daily total rows than fit into one statement under the 32767 bind
+# parameter limit of asyncpg
+PARAMETER_LIMIT_ROWS = 7000
+
 
 @pytest.mark.asyncio
 async def test_get_transaction(
@@ -210,3 +216,440 @@ async def test_change_transaction(
         'amount': changed_transaction_dict['amount'],
         'created': '2023-02-19T22:04:00'
     }
+
+
+@pytest.mark.asyncio
+async def test_get_all_transactions_paginated(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider,
+        dao: DAO
+):
+    token = auth.create_user_token(user)
+    transaction_ids = []
+    for transaction_id, day in zip(range(1001, 1005), (1, 2, 2, 3)):
+        transaction_dto = await dao.transaction.create(dto.Transaction(
+            id=transaction_id,
+            user_id=user.id,
+            asset_id=asset.id,
+            category_id=transaction_category.id,
+            amount=Decimal('1'),
+            created=datetime(2001, 1, day, 12)
+        ))
+        transaction_ids.append(transaction_dto.id)
+    await dao.commit()
+
+    params = {'startDate': '2001-01-01', 'endDate': '2001-01-31',
+              'limit': 3}
+    resp = await client.get(
+        '/api/v1/transaction/all',
+        headers={
+            'Authorization': 'Bearer ' + token.access_token},
+        params=params
+    )
+    assert resp.is_success
+    first_page = resp.json()
+    assert [group['created'] for group in first_page] == \
+        ['2001-01-03', '2001-01-02']
+    assert 'Next-Cursor' in resp.headers
+
+    resp = await client.get(
+        '/api/v1/transaction/all',
+        headers={
+            'Authorization': 'Bearer ' + token.access_token},
+        params=params | {'cursor': resp.headers['Next-Cursor']}
+    )
+    assert resp.is_success
+    second_page = resp.json()
+    assert 'Next-Cursor' not in resp.headers
+
+    paginated_ids = [transaction['id'] for page in (first_page, second_page)
+                     for group in page for transaction in
+                     group['transactions']]
+    assert paginated_ids == sorted(transaction_ids, reverse=True)
+
+
+@pytest.mark.asyncio
+async def test_export_transactions(
+        transaction: dto.Transaction,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider
+):
+    token = auth.create_user_token(user)
+    resp = await client.get(
+        '/api/v1/transaction/export',
+        headers={
+            'Authorization': 'Bearer ' + token.access_token},
+    )
+    assert resp.is_success
+    assert resp.headers['content-type'] == 'application/x-ndjson'
+    rows = {row['id']: row for row in map(json.loads,
+                                          resp.text.splitlines())}
+    assert rows[transaction.id] == {
+        'id': transaction.id,
+        'created': transaction.created.isoformat(),
+        'type': transaction.category.type.value,
+        'amount': str(transaction.amount),
+        'category_id': transaction.category.id,
+        'category': transaction.category.title,
+        'asset_id': str(transaction.asset.id),
+        'asset': transaction.asset.title,
+        'currency_id': transaction.asset.currency.id,
+        'currency_code': transaction.asset.currency.code,
+        'currency_name': transaction.asset.currency.name
+    }
+
+
+@pytest.mark.asyncio
+async def test_total_by_period_follows_transaction_changes(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    params = {'startDate': '2003-03-01', 'endDate': '2003-03-31',
+              'type': transaction_category.type.value}
+
+    async def get_total() -> float:
+        resp = await client.get('/api/v1/transaction/totalByPeriod',
+                                headers=headers, params=params)
+        assert resp.is_success
+        return resp.json()['total']
+
+    transaction_dict = {
+        'asset_id': str(asset.id),
+        'category_id': transaction_category.id,
+        'amount': 3,
+        'created': '2003-03-03T10:00:00'
+    }
+    resp = await client.post('/api/v1/transaction/add', headers=headers,
+                             json=transaction_dict)
+    assert resp.is_success
+    transaction_id = resp.json()['id']
+    rate = asset.currency.rate_to_base_currency
+    assert await get_total() == float(3 / rate)
+
+    resp = await client.put(
+        '/api/v1/transaction/change',
+        headers=headers,
+        json=transaction_dict | {'id': transaction_id, 'amount': 4}
+    )
+    assert resp.is_success
+    assert await get_total() == float(4 / rate)
+
+    resp = await client.delete(f'/api/v1/transaction/{transaction_id}',
+                               headers=headers)
+    assert resp.is_success
+    assert await get_total() == 0
+
+
+@pytest.mark.asyncio
+async def test_import_transactions(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider,
+        dao: DAO
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    asset_amount = (await dao.asset.get_by_id(asset.id)).amount
+    transactions = [{
+        'asset_id': str(asset.id),
+        'category_id': transaction_category.id,
+        'amount': i,
+        'created': f'2004-04-{i:02}T10:00:00'
+    } for i in range(1, 11)]
+
+    resp = await client.post('/api/v1/transaction/import', headers=headers,
+                             json={'transactions': transactions})
+    assert resp.is_success
+    assert resp.json() == {'count': 10}
+
+    resp = await client.get(
+        '/api/v1/transaction/all',
+        headers=headers,
+        params={'startDate': '2004-04-01', 'endDate': '2004-04-30'}
+    )
+    assert resp.is_success
+    assert sum(len(day['transactions']) for day in resp.json()) >= 10
+
+    dao.session.expire_all()
+    delta = 55 if transaction_category.type.value == 'income' else -55
+    assert (await dao.asset.get_by_id(asset.id)).amount == \
+        asset_amount + delta
+
+    resp = await client.post(
+        '/api/v1/transaction/import', headers=headers,
+        json={'transactions': transactions[:1] + [
+            transactions[1] | {'category_id': 0}]}
+    )
+    assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_import_transactions_over_parameter_limit(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider,
+        dao: DAO
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    asset_amount = (await dao.asset.get_by_id(asset.id)).amount
+    started = datetime(1920, 1, 1, 10)
+    ended = started + timedelta(days=PARAMETER_LIMIT_ROWS - 1)
+
+    resp = await client.post(
+        '/api/v1/transaction/import', headers=headers,
+        json={'transactions': [{
+            'asset_id': str(asset.id),
+            'category_id': transaction_category.id,
+            'amount': 3,
+            'created': (started + timedelta(days=i)).isoformat()
+        } for i in range(PARAMETER_LIMIT_ROWS)]}
+    )
+    assert resp.is_success
+    assert resp.json() == {'count': PARAMETER_LIMIT_ROWS}
+
+    sign = 1 if transaction_category.type.value == 'income' else -1
+    dao.session.expire_all()
+    assert (await dao.asset.get_by_id(asset.id)).amount == \
+        asset_amount + sign * 3 * PARAMETER_LIMIT_ROWS
+    assert await dao.transaction_daily_total.get_asset_delta(
+        asset.id, started.date() - timedelta(days=1), ended.date()) == \
+        sign * 3 * PARAMETER_LIMIT_ROWS
+
+    resp = await client.get(
+        '/api/v1/transaction/all',
+        headers=headers,
+        params={'startDate': started.date().isoformat(),
+                'endDate': ended.date().isoformat()}
+    )
+    assert resp.is_success
+    resp = await client.post(
+        '/api/v1/transaction/batchDelete',
+        headers=headers,
+        json={'ids': [transaction['id'] for day in resp.json() for
+                      transaction in day['transactions']]}
+    )
+    assert resp.is_success
+    assert resp.json() == {'count': PARAMETER_LIMIT_ROWS}
+
+
+@pytest.mark.asyncio
+async def test_batch_change_and_delete_transactions(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider,
+        dao: DAO
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    asset_amount = (await dao.asset.get_by_id(asset.id)).amount
+    transactions = []
+    for i in range(1, 4):
+        transaction_dict = {
+            'asset_id': str(asset.id),
+            'category_id': transaction_category.id,
+            'amount': i,
+            'created': f'2005-05-{i:02}T10:00:00'
+        }
+        resp = await client.post('/api/v1/transaction/add', headers=headers,
+                                 json=transaction_dict)
+        assert resp.is_success
+        transactions.append(transaction_dict | {'id': resp.json()['id']})
+
+    resp = await client.put(
+        '/api/v1/transaction/batchChange',
+        headers=headers,
+        json={'transactions': [transaction | {'amount': 10} for
+                               transaction in transactions]}
+    )
+    assert resp.is_success
+    assert resp.json() == {'count': 3}
+
+    dao.session.expire_all()
+    sign = 1 if transaction_category.type.value == 'income' else -1
+    assert (await dao.asset.get_by_id(asset.id)).amount == \
+        asset_amount + sign * 30
+
+    resp = await client.post(
+        '/api/v1/transaction/batchDelete',
+        headers=headers,
+        json={'ids': [transaction['id'] for transaction in transactions]}
+    )
+    assert resp.is_success
+    assert resp.json() == {'count': 3}
+
+    dao.session.expire_all()
+    assert (await dao.asset.get_by_id(asset.id)).amount == asset_amount
+    for transaction in transactions:
+        with pytest.raises(TransactionNotFound):
+            await dao.transaction.get_by_id(transaction['id'])
+
+
+@pytest.mark.asyncio
+async def test_batch_change_and_delete_over_parameter_limit(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider,
+        dao: DAO
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    asset_amount = (await dao.asset.get_by_id(asset.id)).amount
+    started = datetime(1950, 1, 1, 10)
+    # one daily total row per transaction, five bind parameters each
+    resp = await client.post(
+        '/api/v1/transaction/import', headers=headers,
+        json={'transactions': [{
+            'asset_id': str(asset.id),
+            'category_id': transaction_category.id,
+            'amount': 1,
+            'created': (started + timedelta(days=i)).isoformat()
+        } for i in range(PARAMETER_LIMIT_ROWS)]}
+    )
+    assert resp.is_success
+
+    resp = await client.get(
+        '/api/v1/transaction/all',
+        headers=headers,
+        params={'startDate': started.date().isoformat(),
+                'endDate': (started + timedelta(
+                    days=PARAMETER_LIMIT_ROWS)).date().isoformat()}
+    )
+    assert resp.is_success
+    transactions = [transaction for day in resp.json() for transaction in
+                    day['transactions']]
+    assert len(transactions) == PARAMETER_LIMIT_ROWS
+
+    resp = await client.put(
+        '/api/v1/transaction/batchChange',
+        headers=headers,
+        json={'transactions': [{
+            'id': transaction['id'],
+            'asset_id': str(asset.id),
+            'category_id': transaction_category.id,
+            'amount': 2,
+            'created': transaction['created']
+        } for transaction in transactions]}
+    )
+    assert resp.is_success
+
+    sign = 1 if transaction_category.type.value == 'income' else -1
+    dao.session.expire_all()
+    assert (await dao.asset.get_by_id(asset.id)).amount == \
+        asset_amount + sign * 2 * PARAMETER_LIMIT_ROWS
+    assert await dao.transaction_daily_total.get_asset_delta(
+        asset.id, None, date(1969, 12, 31)) == \
+        sign * 2 * PARAMETER_LIMIT_ROWS
+
+    resp = await client.post(
+        '/api/v1/transaction/batchDelete',
+        headers=headers,
+        json={'ids': [transaction['id'] for transaction in transactions]}
+    )
+    assert resp.is_success
+
+    dao.session.expire_all()
+    assert (await dao.asset.get_by_id(asset.id)).amount == asset_amount
+    assert await dao.transaction_daily_total.get_asset_delta(
+        asset.id, None, date(1969, 12, 31)) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_all_transactions_filtered(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    for i in range(1, 6):
+        resp = await client.post('/api/v1/transaction/add', headers=headers,
+                                 json={
+                                     'asset_id': str(asset.id),
+                                     'category_id': transaction_category.id,
+                                     'amount': i * 100,
+                                     'created': f'2006-06-{i:02}T10:00:00'
+                                 })
+        assert resp.is_success
+
+    params = {'startDate': '2006-06-01', 'endDate': '2006-06-30',
+              'assetId': str(asset.id),
+              'categoryId': transaction_category.id,
+              'currency': asset.currency.code,
+              'minAmount': 200, 'maxAmount': 400}
+    resp = await client.get('/api/v1/transaction/all', headers=headers,
+                            params=params)
+    assert resp.is_success
+    amounts = set(transaction['amount'] for day in resp.json() for
+                  transaction in day['transactions'])
+    assert amounts == {200, 300, 400}
+
+    resp = await client.get('/api/v1/transaction/all', headers=headers,
+                            params=params | {'currency': 'XXX'})
+    assert resp.is_success
+    assert resp.json() == []
+
+
+@pytest.mark.asyncio
+async def test_total_series_matches_totals_by_period(
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        client: AsyncClient,
+        user: dto.User,
+        auth: AuthProvider
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    for created in ('2007-07-10T10:00:00', '2007-08-10T10:00:00',
+                    '2007-08-20T10:00:00'):
+        resp = await client.post('/api/v1/transaction/add', headers=headers,
+                                 json={
+                                     'asset_id': str(asset.id),
+                                     'category_id': transaction_category.id,
+                                     'amount': 7,
+                                     'created': created
+                                 })
+        assert resp.is_success
+
+    resp = await client.get(
+        '/api/v1/transaction/totalSeries',
+        headers=headers,
+        params={'startDate': '2007-06-01', 'endDate': '2007-08-31',
+                'bucket': 'month'}
+    )
+    assert resp.is_success
+    series = resp.json()['series']
+    assert [total['period'] for total in series] == \
+        ['2007-06-01', '2007-07-01', '2007-08-01']
+
+    for total, end_date in zip(series,
+                               ('2007-06-30', '2007-07-31', '2007-08-31')):
+        for transaction_type in ('income', 'expense'):
+            resp = await client.get(
+                '/api/v1/transaction/totalByPeriod',
+                headers=headers,
+                params={'startDate': total['period'], 'endDate': end_date,
+                        'type': transaction_type}
+            )
+            assert resp.is_success
+            assert total[transaction_type] == resp.json()['total']
+    assert series[0]['income'] == series[0]['expense'] == 0
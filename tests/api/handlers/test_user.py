@@ -1,5 +1,6 @@
 import pytest
 from httpx import AsyncClient
+from starlette import status
 
 from api.v1.dependencies import AuthProvider
 from finances.database.dao import DAO
@@ -48,6 +49,12 @@ async def test_change_username(client: AsyncClient,
                                auth: AuthProvider,
                                dao: DAO):
     token = auth.create_user_token(user)
+    resp = await client.get(
+        '/api/v1/user/me',
+        headers={'Authorization': 'Bearer ' + token.access_token},
+    )
+    assert resp.is_success
+
     new_username = 'test12345'
     resp = await client.put(
         '/api/v1/user/setusername',
@@ -56,6 +63,12 @@ async def test_change_username(client: AsyncClient,
     )
     assert resp.is_success
 
+    resp = await client.get(
+        '/api/v1/user/me',
+        headers={'Authorization': 'Bearer ' + token.access_token},
+    )
+    assert resp.status_code == 401
+
     user.username = new_username
     token = auth.create_user_token(user)
     resp = await client.get(
@@ -81,6 +94,12 @@ async def test_change_password(client: AsyncClient, user: dto.User,
     )
     assert resp.is_success
 
+    resp = await client.get(
+        '/api/v1/user/me',
+        headers={'Authorization': 'Bearer ' + token.access_token},
+    )
+    assert resp.status_code == 401
+
     resp = await client.post(
         '/api/v1/auth/login',
         data={'username': user.username, 'password': '12345'},
@@ -92,3 +111,132 @@ async def test_change_password(client: AsyncClient, user: dto.User,
         data={'username': user.username, 'password': 'test123!T'},
     )
     assert resp.is_success
+
+    resp = await client.get(
+        '/api/v1/user/me',
+        headers={'Authorization': 'Bearer ' + resp.json()['access_token']},
+    )
+    assert resp.is_success
+
+
+@pytest.mark.asyncio
+async def test_change_username_rejects_old_token(client: AsyncClient,
+                                                 user: dto.User,
+                                                 auth: AuthProvider,
+                                                 dao: DAO):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()['username'] == user.username
+
+    new_username = 'test54321'
+    resp = await client.put('/api/v1/user/setusername', headers=headers,
+                            json={'username': new_username})
+    assert resp.is_success
+
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    user.username = new_username
+    token = auth.create_user_token(user)
+    resp = await client.get(
+        '/api/v1/user/me',
+        headers={'Authorization': 'Bearer ' + token.access_token},
+    )
+    assert resp.status_code == status.HTTP_200_OK
+    assert resp.json()['username'] == new_username
+
+    await dao.user.delete_by_id(user.id)
+    await dao.commit()
+
+
+@pytest.mark.asyncio
+async def test_delete_user(client: AsyncClient,
+                           user: dto.User,
+                           auth: AuthProvider):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.status_code == status.HTTP_200_OK
+
+    resp = await client.delete('/api/v1/user/me', headers=headers)
+    assert resp.is_success
+
+    resp = await client.post(
+        '/api/v1/auth/login',
+        data={'username': user.username, 'password': '12345'},
+    )
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_signup_and_login_through_hash_pool(client: AsyncClient,
+                                                  auth: AuthProvider):
+    username = 'hashpool'
+    password = '123456!Xyz'
+    resp = await client.post('/api/v1/user/signup', json={
+        'username': username,
+        'password': password
+    })
+    assert resp.status_code == status.HTTP_200_OK
+
+    resp = await client.post(
+        '/api/v1/auth/login',
+        data={'username': username, 'password': password},
+    )
+    assert resp.is_success
+    headers = {'Authorization': 'Bearer ' + resp.json()['access_token']}
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.json()['username'] == username
+
+    resp = await client.post(
+        '/api/v1/auth/login',
+        data={'username': username, 'password': password + '1'},
+    )
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+    assert len(auth.password_hash_executor._threads) > 0
+
+    resp = await client.delete('/api/v1/user/me', headers=headers)
+    assert resp.is_success
+
+
+@pytest.mark.asyncio
+async def test_credential_changes_reload(client: AsyncClient,
+                                         user: dto.User,
+                                         auth: AuthProvider,
+                                         dao: DAO):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.is_success
+
+    since = await dao.user.get_server_time()
+    await auth.load_credential_changes(dao, since)
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.is_success
+
+    # a change made through another worker
+    await dao.user.set_password(user, auth.get_password_hash('12345'))
+    await dao.commit()
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.is_success
+
+    await auth.load_credential_changes(dao, since)
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
+
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.is_success
+
+    since = await dao.user.get_server_time()
+    await dao.user.delete_by_id(user.id)
+    await dao.commit()
+    await auth.load_credential_changes(dao, since)
+    resp = await client.get('/api/v1/user/me', headers=headers)
+    assert resp.status_code == status.HTTP_401_UNAUTHORIZED
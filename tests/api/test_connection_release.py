@@ -0,0 +1,41 @@
+from _decimal import Decimal
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.price_providers import StubPriceProvider
+from finances.database.dao import DAO
+from finances.exceptions.base import SessionReleased
+from finances.models import dto
+from finances.services.asset import get_total_assets
+
+
+class PoolRecordingPriceProvider(StubPriceProvider):
+    def __init__(self, sessionmaker: async_sessionmaker):
+        super().__init__()
+        self.pool = sessionmaker.kw['bind'].pool
+        self.checked_out: list[int] = []
+
+    async def get_prices(self, codes: set[str]) -> dict[str, Decimal]:
+        self.checked_out.append(self.pool.checkedout())
+        return await super().get_prices(codes)
+
+
+@pytest.mark.asyncio
+async def test_connection_is_released_before_price_call(
+        sessionmaker: async_sessionmaker,
+        asset: dto.Asset,
+        user: dto.User
+):
+    currency_provider = PoolRecordingPriceProvider(sessionmaker)
+    currency_api = CurrencyAPI(currency_provider, StubPriceProvider())
+    checked_out = currency_provider.pool.checkedout()
+
+    async with sessionmaker() as session:
+        dao = DAO(session=session)
+        await get_total_assets(currency_api, user, dao)
+
+        assert currency_provider.checked_out == [checked_out]
+        with pytest.raises(SessionReleased):
+            await dao.asset.get_all(user)
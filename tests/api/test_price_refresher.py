@@ -0,0 +1,37 @@
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.price_refresher import PriceRefresher
+from finances.models import dto
+from tests.fixtures.price_provider_data import CountingPriceProvider
+
+
+@pytest.mark.asyncio
+async def test_refresher_cycle_warms_cache(
+        sessionmaker: async_sessionmaker,
+        asset: dto.Asset,
+        currency: dto.Currency,
+        crypto_asset: dto.CryptoAsset,
+        crypto_currency: dto.CryptoCurrency
+):
+    currency_provider = CountingPriceProvider()
+    crypto_provider = CountingPriceProvider()
+    currency_api = CurrencyAPI(currency_provider, crypto_provider)
+    refresher = PriceRefresher(sessionmaker, currency_api,
+                               timedelta(minutes=1))
+
+    await refresher.run_once()
+
+    cached_price = currency_api.price_cache.get('USD', currency.code)
+    assert cached_price.price == \
+        currency_provider.get_price(currency.code)
+    cached_price = currency_api.price_cache.get(crypto_currency.code, 'BUSD')
+    assert cached_price.price == \
+        crypto_provider.get_price(crypto_currency.code)
+    assert currency_provider.calls and crypto_provider.calls
+
+    await currency_api.get_crypto_currency_prices([crypto_currency.code])
+    assert len(crypto_provider.calls) == 1
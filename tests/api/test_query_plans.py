@@ -0,0 +1,185 @@
+import json
+import uuid
+from _decimal import Decimal
+from datetime import date, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, text
+
+from finances.database.dao import DAO
+from finances.exceptions.transaction import TransactionNotFound
+from finances.models import dto
+
+SEED_TRANSACTIONS = 500
+SEED_START_ID = 100001
+
+# rows of another user, so that the test user's rows are a small share of
+# each table, as they are in production
+NOISE_ROWS = 50000
+NOISE_USER_ID = uuid.UUID('6d7f2a3e-0c1b-4e5a-9f8d-2b4c6e8a0f13')
+NOISE_ASSET_ID = uuid.UUID('1a9e4c7b-3d2f-4b6a-8e0c-5f7d9b1a3c24')
+NOISE_PORTFOLIO_ID = uuid.UUID('8c3b5d1f-7e9a-4c2b-a6d4-0e2f4a6c8b35')
+SEED_NOISE = [
+    'INSERT INTO "user" (id, username, password, user_type) '
+    "VALUES (:user_id, 'query_plan_noise', '', 'user')",
+    'INSERT INTO transaction_category (title, type, user_id, deleted) '
+    "VALUES ('noise', 'income', :user_id, false)",
+    'INSERT INTO asset (id, user_id, title, amount, deleted) '
+    "VALUES (:asset_id, :user_id, 'noise', 0, false)",
+    'INSERT INTO transaction (user_id, asset_id, category_id, amount, '
+    'created) '
+    'SELECT CAST(:user_id AS uuid), CAST(:asset_id AS uuid), '
+    '(SELECT id FROM transaction_category WHERE user_id = :user_id), 1, '
+    "timestamp '1990-01-01' + i * interval '3 hours' "
+    'FROM generate_series(1, :rows) AS i',
+    'INSERT INTO transaction_daily_total (user_id, day, category_id, '
+    'asset_id, total) '
+    'SELECT user_id, CAST(created AS date), category_id, asset_id, '
+    'sum(amount) FROM transaction WHERE user_id = :user_id '
+    'GROUP BY 1, 2, 3, 4',
+    'INSERT INTO crypto_portfolio (id, user_id, title) '
+    "VALUES (:portfolio_id, :user_id, 'noise')",
+    'INSERT INTO crypto_asset (user_id, portfolio_id, crypto_currency_id, '
+    'amount) VALUES (:user_id, :portfolio_id, :crypto_currency_id, 0)',
+    'INSERT INTO crypto_portfolio_transaction (user_id, portfolio_id, '
+    'crypto_asset_id, type, amount, price, created) '
+    'SELECT CAST(:user_id AS uuid), CAST(:portfolio_id AS uuid), '
+    '(SELECT id FROM crypto_asset WHERE portfolio_id = :portfolio_id), '
+    "'buy', 1, 1, timestamp '1990-01-01' + i * interval '3 hours' "
+    'FROM generate_series(1, :rows) AS i',
+]
+SEED_NOISE_PARAMS = {
+    'user_id': NOISE_USER_ID,
+    'asset_id': NOISE_ASSET_ID,
+    'portfolio_id': NOISE_PORTFOLIO_ID,
+    'rows': NOISE_ROWS,
+}
+
+# small lookup tables are cheaper to scan than to probe, so only the tables
+# that grow with the number of transactions must never be scanned
+INDEXED_TABLES = {'transaction', 'transaction_daily_total',
+                  'crypto_portfolio_transaction'}
+
+START_DATE = date(2002, 1, 1)
+END_DATE = date(2002, 12, 31)
+
+QUERIES = {
+    'transaction.get_all':
+        lambda dao, user, asset, crypto_transaction: dao.transaction.get_all(
+            user, START_DATE, END_DATE),
+    'transaction.get_all_by_type':
+        lambda dao, user, asset, crypto_transaction: dao.transaction.get_all(
+            user, START_DATE, END_DATE, 'income'),
+    'transaction.get_all_filtered':
+        lambda dao, user, asset, crypto_transaction: dao.transaction.get_all(
+            user, START_DATE, END_DATE, None,
+            dto.TransactionFilter(currency_codes=['USD'],
+                                  min_amount=Decimal('1'))),
+    'transaction.get_page':
+        lambda dao, user, asset, crypto_transaction: dao.transaction.get_page(
+            user, START_DATE, END_DATE, 50,
+            dto.TransactionCursor(created=datetime(2002, 6, 1), id=0)),
+    'transaction.get_total_by_period':
+        lambda dao, user, asset, crypto_transaction:
+        dao.transaction.get_total_by_period(
+            user, START_DATE, END_DATE, 'income', 'USD'),
+    'transaction.get_total_categories_by_period':
+        lambda dao, user, asset, crypto_transaction:
+        dao.transaction.get_total_categories_by_period(
+            user, START_DATE, END_DATE, 'income', 'USD'),
+    'transaction.get_total_series':
+        lambda dao, user, asset, crypto_transaction:
+        dao.transaction.get_total_series(
+            user, START_DATE, END_DATE, 'month', 'USD'),
+    'transaction_daily_total.get_asset_delta':
+        lambda dao, user, asset, crypto_transaction:
+        dao.transaction_daily_total.get_asset_delta(
+            asset.id, START_DATE, END_DATE),
+    'crypto_transaction.get_all_by_crypto_asset':
+        lambda dao, user, asset, crypto_transaction:
+        dao.crypto_transaction.get_all_by_crypto_asset(
+            crypto_transaction.crypto_asset_id,
+            crypto_transaction.portfolio_id,
+            user.id),
+}
+
+
+def get_seq_scans(plan: dict) -> list[str]:
+    seq_scans = []
+    if plan['Node Type'] == 'Seq Scan' and \
+            plan['Relation Name'] in INDEXED_TABLES:
+        seq_scans.append(plan['Relation Name'])
+    for child_plan in plan.get('Plans', []):
+        seq_scans.extend(get_seq_scans(child_plan))
+    return seq_scans
+
+
+@pytest_asyncio.fixture
+async def seeded_transactions(
+        dao: DAO,
+        user: dto.User,
+        asset: dto.Asset,
+        transaction_category: dto.TransactionCategory,
+        crypto_currency: dto.CryptoCurrency
+):
+    try:
+        await dao.transaction.get_by_id(SEED_START_ID)
+    except TransactionNotFound:
+        for i in range(SEED_TRANSACTIONS):
+            await dao.transaction.create(dto.Transaction(
+                id=SEED_START_ID + i,
+                user_id=user.id,
+                asset_id=asset.id,
+                category_id=transaction_category.id,
+                amount=Decimal('1'),
+                created=datetime(2002, 1, 1) + timedelta(hours=17 * i)
+            ))
+        await dao.commit()
+
+    noise_user = await dao.session.scalar(
+        text('SELECT id FROM "user" WHERE id = :user_id'),
+        {'user_id': NOISE_USER_ID})
+    if noise_user is None:
+        for statement in SEED_NOISE:
+            await dao.session.execute(
+                text(statement),
+                SEED_NOISE_PARAMS | {'crypto_currency_id': crypto_currency.id})
+        await dao.commit()
+    await dao.session.execute(text('ANALYZE'))
+    await dao.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('query_name', QUERIES)
+async def test_query_uses_indexes(
+        query_name: str,
+        seeded_transactions,
+        crypto_transaction: dto.CryptoTransaction,
+        asset: dto.Asset,
+        user: dto.User,
+        dao: DAO
+):
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+
+    sync_engine = dao.session.bind.sync_engine
+    event.listen(sync_engine, 'before_cursor_execute', capture)
+    try:
+        await QUERIES[query_name](dao, user, asset, crypto_transaction)
+    finally:
+        event.remove(sync_engine, 'before_cursor_execute', capture)
+    assert statements
+
+    connection = await dao.session.connection()
+    for statement, parameters in statements:
+        result = await connection.exec_driver_sql(
+            'EXPLAIN (FORMAT JSON) ' + statement, parameters)
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        assert get_seq_scans(plan[0]['Plan']) == [], statement
+    await dao.session.rollback()
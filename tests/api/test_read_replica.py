@@ -0,0 +1,95 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from alembic.command import upgrade
+from alembic.config import Config as AlembicConfig
+from fastapi import APIRouter
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api import v1
+from api.main_factory import create_app
+from api.v1.dependencies import AuthProvider, CurrencyAPI, PriceHub
+from api.v1.dependencies.db import READ_PRIMARY_HEADER
+from api.v1.dependencies.price_providers import StubPriceProvider
+from finances.models import dto
+from finances.models.dto.config import Config
+
+
+@pytest_asyncio.fixture(scope='session')
+async def replica_sessionmaker(config: Config,
+                               alembic_config: AlembicConfig) \
+        -> AsyncGenerator[async_sessionmaker, None]:
+    if config.replica_db is None:
+        pytest.skip('replica database is not configured')
+    replica_url = config.replica_db.make_url
+    replica_alembic_config = AlembicConfig(alembic_config.config_file_name)
+    replica_alembic_config.set_main_option(
+        'script_location', alembic_config.get_main_option('script_location'))
+    replica_alembic_config.set_main_option(
+        'sqlalchemy.url', replica_url.replace('asyncpg', 'psycopg2'))
+    upgrade(replica_alembic_config, 'head')
+
+    engine = create_async_engine(url=replica_url, echo=False)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(scope='session')
+async def replica_client(
+        config: Config,
+        sessionmaker: async_sessionmaker,
+        replica_sessionmaker: async_sessionmaker
+) -> AsyncGenerator[AsyncClient, None]:
+    app = create_app()
+    api_router_v1 = APIRouter()
+    currency_api = CurrencyAPI(StubPriceProvider(), StubPriceProvider())
+    v1.dependencies.setup(app, api_router_v1, sessionmaker, config,
+                          currency_api, PriceHub(), replica_sessionmaker)
+    v1.routes.setup_routers(api_router_v1)
+    main_api_router = APIRouter(prefix='/api')
+    main_api_router.include_router(api_router_v1, prefix='/v1')
+    app.include_router(main_api_router)
+
+    async with AsyncClient(app=app,
+                           base_url='http://127.0.0.1:8000') as async_client:
+        yield async_client
+
+
+@pytest.mark.asyncio
+async def test_get_routes_read_from_replica(
+        replica_client: AsyncClient,
+        config: Config,
+        user: dto.User,
+        auth: AuthProvider
+):
+    token = auth.create_user_token(user)
+    headers = {'Authorization': 'Bearer ' + token.access_token}
+    resp = await replica_client.post(
+        '/api/v1/currency/add',
+        headers=headers,
+        json={'name': 'replica', 'code': 'RPL', 'rate_to_base_currency': 1},
+    )
+    assert resp.is_success
+    currency_id = resp.json()['id']
+
+    resp = await replica_client.get(f'/api/v1/currency/{currency_id}',
+                                    headers=headers)
+    assert resp.is_success
+
+    await asyncio.sleep(config.replica_lag.total_seconds())
+    resp = await replica_client.get(f'/api/v1/currency/{currency_id}',
+                                    headers=headers)
+    assert resp.status_code == 404
+
+    resp = await replica_client.get(
+        f'/api/v1/currency/{currency_id}',
+        headers={**headers, READ_PRIMARY_HEADER: '1'},
+    )
+    assert resp.is_success
+
+    resp = await replica_client.delete(f'/api/v1/currency/{currency_id}',
+                                       headers=headers)
+    assert resp.is_success
@@ -0,0 +1,19 @@
+from _decimal import Decimal
+
+from api.v1.dependencies.price_providers import PriceCodesRejected, \
+    StubPriceProvider
+
+
+class CountingPriceProvider(StubPriceProvider):
+    def __init__(self, *args, invalid_codes: set[str] | None = None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.invalid_codes = invalid_codes or set()
+        self.calls: list[set[str]] = []
+
+    async def get_prices(self, codes: set[str]) -> dict[str, Decimal]:
+        self.calls.append(set(codes))
+        prices = await super().get_prices(codes)
+        if codes & self.invalid_codes:
+            raise PriceCodesRejected
+        return prices
@@ -9,16 +9,27 @@ from finances.models.dto import Config, DatabaseConfig, AuthConfig
 def load_test_config() -> Config:
     load_dotenv()
 
+    db = DatabaseConfig(
+        host=os.getenv('TEST_PG_HOST'),
+        username=os.getenv('TEST_PG_USERNAME'),
+        password=os.getenv('TEST_PG_PASSWORD'),
+        database=os.getenv('TEST_PG_DATABASE'),
+    )
+    replica_db = None
+    if os.getenv('TEST_PG_REPLICA_DATABASE') is not None:
+        replica_db = DatabaseConfig(
+            host=os.getenv('TEST_PG_REPLICA_HOST', db.host),
+            username=os.getenv('TEST_PG_REPLICA_USERNAME', db.username),
+            password=os.getenv('TEST_PG_REPLICA_PASSWORD', db.password),
+            database=os.getenv('TEST_PG_REPLICA_DATABASE'),
+        )
     return Config(
-        db=DatabaseConfig(
-            host=os.getenv('TEST_PG_HOST'),
-            username=os.getenv('TEST_PG_USERNAME'),
-            password=os.getenv('TEST_PG_PASSWORD'),
-            database=os.getenv('TEST_PG_DATABASE'),
-        ),
+        db=db,
         auth=AuthConfig(
             secret_key=os.getenv('TEST_SECRET_KEY'),
             token_expire=timedelta(days=1)
         ),
-        fcsapi_access_key=os.getenv('FCSAPI_API_KEY')
+        fcsapi_access_key=os.getenv('FCSAPI_API_KEY'),
+        replica_db=replica_db,
+        replica_lag=timedelta(seconds=1)
     )
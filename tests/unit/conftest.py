@@ -0,0 +1,6 @@
+import pytest
+
+
+@pytest.fixture(scope='session', autouse=True)
+def upgrade_schema_db():
+    pass
@@ -0,0 +1,140 @@
+import asyncio
+from _decimal import Decimal
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.currency_api import CantGetPrice
+from api.v1.dependencies.price_providers import StubPriceProvider
+from finances.models import dto
+from finances.services.currency_prices import get_prices
+from tests.fixtures.price_provider_data import CountingPriceProvider
+
+RESET_TIMEOUT = timedelta(milliseconds=50)
+
+
+def make_currency_api(crypto_provider: CountingPriceProvider) -> CurrencyAPI:
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider)
+    currency_api.crypto_breaker.reset_timeout = RESET_TIMEOUT
+    return currency_api
+
+
+async def fail_until_open(currency_api: CurrencyAPI, code: str = 'BTC'):
+    breaker = currency_api.crypto_breaker
+    for _ in range(breaker.failure_threshold):
+        assert not breaker.is_open
+        with pytest.raises(CantGetPrice):
+            await currency_api.get_crypto_currency_price(code)
+    assert breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_breaker_transitions():
+    crypto_provider = CountingPriceProvider(error_rate=1.0)
+    currency_api = make_currency_api(crypto_provider)
+    breaker = currency_api.crypto_breaker
+
+    await fail_until_open(currency_api)
+    assert len(crypto_provider.calls) == breaker.failure_threshold
+
+    with pytest.raises(CantGetPrice):
+        await currency_api.get_crypto_currency_price('BTC')
+    assert len(crypto_provider.calls) == breaker.failure_threshold
+
+    await asyncio.sleep(RESET_TIMEOUT.total_seconds())
+    with pytest.raises(CantGetPrice):
+        await currency_api.get_crypto_currency_price('BTC')
+    assert len(crypto_provider.calls) == breaker.failure_threshold + 1
+    assert breaker.is_open
+
+    crypto_provider.error_rate = 0
+    await asyncio.sleep(RESET_TIMEOUT.total_seconds())
+    price = await currency_api.get_crypto_currency_price('BTC')
+    assert price == crypto_provider.get_price('BTC')
+    assert not breaker.is_open
+    assert breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_half_open_breaker_lets_one_trial_through():
+    crypto_provider = CountingPriceProvider(error_rate=1.0)
+    currency_api = make_currency_api(crypto_provider)
+    await fail_until_open(currency_api)
+    calls = len(crypto_provider.calls)
+
+    crypto_provider.error_rate = 0
+    crypto_provider.latency = 0.02
+    await asyncio.sleep(RESET_TIMEOUT.total_seconds())
+    results = await asyncio.gather(
+        *(currency_api.get_crypto_currency_price('BTC') for _ in range(3)),
+        return_exceptions=True
+    )
+
+    assert len(crypto_provider.calls) == calls + 1
+    assert results[0] == crypto_provider.get_price('BTC')
+    assert all(isinstance(result, CantGetPrice) for result in results[1:])
+    assert not currency_api.crypto_breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_stale_price_is_served_while_breaker_is_open():
+    crypto_provider = CountingPriceProvider()
+    currency_api = make_currency_api(crypto_provider)
+    price = await currency_api.get_crypto_currency_price('BTC')
+
+    crypto_provider.error_rate = 1.0
+    await fail_until_open(currency_api, 'ETH')
+    calls = len(crypto_provider.calls)
+    cached_price = currency_api.price_cache._prices[('BTC', 'BUSD')]
+    cached_price.updated = datetime.utcnow() - timedelta(minutes=30)
+    assert await currency_api.get_crypto_currency_price('BTC') == price
+    assert len(crypto_provider.calls) == calls
+
+    cached_price.updated = datetime.utcnow() - timedelta(hours=2)
+    with pytest.raises(CantGetPrice):
+        await currency_api.get_crypto_currency_price('BTC')
+
+
+@pytest.mark.asyncio
+async def test_timeout_scales_with_request_rounds():
+    crypto_provider = CountingPriceProvider(latency=timedelta(
+        milliseconds=30))
+    crypto_provider.get_request_rounds = lambda codes: len(codes)
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider,
+                               timeout=timedelta(milliseconds=20))
+
+    prices = await currency_api.refresh_crypto_currency_prices(
+        {'BTC', 'ETH'})
+
+    assert set(prices) == {'BTCBUSD', 'ETHBUSD'}
+    assert currency_api.crypto_breaker.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_open_breaker_returns_cached_subset():
+    currency_provider = CountingPriceProvider({'EUR': Decimal('0.9'),
+                                               'GBP': Decimal('0.8')})
+    currency_api = CurrencyAPI(currency_provider, StubPriceProvider())
+    await currency_api.get_currency_prices({'EUR', 'GBP'})
+
+    currency_provider.error_rate = 1.0
+    breaker = currency_api.currency_breaker
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(CantGetPrice):
+            await currency_api.refresh_currency_prices({'CHF'})
+    assert breaker.is_open
+    for cached_price in currency_api.price_cache._prices.values():
+        cached_price.updated = datetime.utcnow() - timedelta(minutes=30)
+
+    base_currency = dto.Currency(id=None, name=None, code='GBP',
+                                 is_custom=False,
+                                 rate_to_base_currency=None, user_id=None)
+    prices = await get_prices(base_currency, {'EUR', 'JPY'}, currency_api)
+    assert prices.prices == {'EUR': Decimal('0.9') / Decimal('0.8'),
+                             'GBP': Decimal('1')}
+    assert prices.missing == {'JPY'}
+    assert prices.stale
+
+    with pytest.raises(CantGetPrice):
+        await currency_api.get_currency_prices({'EUR'}, 'JPY')
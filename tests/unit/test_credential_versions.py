@@ -0,0 +1,46 @@
+import uuid
+
+from api.v1.dependencies.auth import CredentialVersions
+
+
+def test_versions_only_move_forward():
+    credential_versions = CredentialVersions()
+    user_id = uuid.uuid4()
+    assert not credential_versions.is_known(user_id)
+
+    credential_versions.set(user_id, 2)
+    credential_versions.set(user_id, 1)
+
+    assert credential_versions.is_known(user_id)
+    assert credential_versions.get(user_id) == 2
+    assert credential_versions.is_valid(user_id, 2)
+    assert not credential_versions.is_valid(user_id, 1)
+
+
+def test_apply_changes_updates_known_users():
+    credential_versions = CredentialVersions()
+    kept, bumped, unknown = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    credential_versions.set(kept, 3)
+    credential_versions.set(bumped, 0)
+
+    credential_versions.apply_changes({kept: 1, bumped: 2, unknown: 1},
+                                      set())
+
+    assert credential_versions.get(kept) == 3
+    assert credential_versions.get(bumped) == 2
+    assert not credential_versions.is_known(unknown)
+
+
+def test_deleted_users_are_revoked():
+    credential_versions = CredentialVersions()
+    user_id, unknown = uuid.uuid4(), uuid.uuid4()
+    credential_versions.set(user_id, 0)
+    assert credential_versions.is_valid(user_id, 0)
+
+    credential_versions.apply_changes({}, {user_id, unknown})
+
+    assert not credential_versions.is_valid(user_id, 0)
+    assert not credential_versions.is_valid(unknown, 0)
+    assert credential_versions.is_known(unknown)
+    credential_versions.set(user_id, 1)
+    assert not credential_versions.is_valid(user_id, 1)
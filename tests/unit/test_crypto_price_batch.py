@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.currency_api import CantGetPrice
+from api.v1.dependencies.price_providers import StubPriceProvider
+from tests.fixtures.price_provider_data import CountingPriceProvider
+
+
+@pytest.mark.asyncio
+async def test_concurrent_lookups_share_one_request():
+    crypto_provider = CountingPriceProvider()
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider)
+
+    first, second = await asyncio.gather(
+        currency_api.get_crypto_currency_prices(['BTC', 'ETH']),
+        currency_api.get_crypto_currency_prices(['ETH', 'SOL'])
+    )
+
+    assert crypto_provider.calls == [{'BTC', 'ETH', 'SOL'}]
+    assert first == {'BTCBUSD': crypto_provider.get_price('BTC'),
+                     'ETHBUSD': crypto_provider.get_price('ETH')}
+    assert second == {'ETHBUSD': crypto_provider.get_price('ETH'),
+                      'SOLBUSD': crypto_provider.get_price('SOL')}
+    assert currency_api._crypto_batches == {}
+    assert currency_api._pending_crypto_batch is None
+
+
+@pytest.mark.asyncio
+async def test_bad_symbol_does_not_fail_other_caller():
+    crypto_provider = CountingPriceProvider(invalid_codes={'BAD'})
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider)
+
+    first, second = await asyncio.gather(
+        currency_api.get_crypto_currency_prices(['BTC', 'BAD']),
+        currency_api.get_crypto_currency_prices(['ETH']),
+        return_exceptions=True
+    )
+
+    assert isinstance(first, CantGetPrice)
+    assert second == {'ETHBUSD': crypto_provider.get_price('ETH')}
+    assert crypto_provider.calls[0] == {'BTC', 'BAD', 'ETH'}
+    assert sorted(crypto_provider.calls[1:], key=len) == \
+        [{'ETH'}, {'BTC', 'BAD'}]
+    assert currency_api._crypto_batches == {}
+
+
+@pytest.mark.asyncio
+async def test_cached_symbols_skip_the_batch():
+    crypto_provider = CountingPriceProvider()
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider)
+    await currency_api.get_crypto_currency_prices(['BTC'])
+
+    prices = await currency_api.get_crypto_currency_prices(['BTC', 'ETH'])
+
+    assert crypto_provider.calls == [{'BTC'}, {'ETH'}]
+    assert set(prices) == {'BTCBUSD', 'ETHBUSD'}
@@ -0,0 +1,26 @@
+import uuid
+from _decimal import Decimal
+
+import pytest
+
+from api.v1.dependencies import CurrencyAPI, PriceHub
+from api.v1.dependencies.price_providers import StubPriceProvider
+from finances.models import dto
+from finances.services.dashboard import _get_crypto_total
+
+
+@pytest.mark.asyncio
+async def test_crypto_total_is_flagged_without_prices():
+    currency_api = CurrencyAPI(StubPriceProvider(),
+                               StubPriceProvider(error_rate=1))
+    price_hub = PriceHub()
+    price_hub.publish_prices({'BTC': Decimal('20000')})
+    user = dto.User(id=uuid.uuid4(), username='dashboard')
+
+    total = await _get_crypto_total(
+        uuid.uuid4(), {'BTC': Decimal('1'), 'ETH': Decimal('2')}, user,
+        currency_api, price_hub)
+
+    assert total.total is None
+    assert total.stale
+    assert total.missing_prices == ['ETH']
@@ -0,0 +1,87 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from api.v1.dependencies.db import DatabaseProvider, RecentWrites, \
+    READ_PRIMARY_HEADER
+
+WINDOW = timedelta(milliseconds=50)
+
+
+def make_request(method: str, headers: dict[str, str] | None = None) \
+        -> Request:
+    return Request({
+        'type': 'http',
+        'method': method,
+        'headers': [(key.lower().encode(), value.encode()) for key, value in
+                    (headers or {}).items()],
+        'client': ('127.0.0.1', 8000)
+    })
+
+
+@pytest.fixture
+def db_provider() -> DatabaseProvider:
+    primary = create_async_engine('postgresql+asyncpg://test@primary/test')
+    replica = create_async_engine('postgresql+asyncpg://test@replica/test')
+    return DatabaseProvider(async_sessionmaker(primary),
+                            async_sessionmaker(replica), WINDOW)
+
+
+async def get_host(db_provider: DatabaseProvider, request: Request) -> str:
+    dependency = db_provider.dao(request)
+    dao = await anext(dependency)
+    host = dao.session.bind.url.host
+    await dependency.aclose()
+    return host
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_and_writes_to_primary(
+        db_provider: DatabaseProvider
+):
+    headers = {'Authorization': 'Bearer first'}
+
+    assert await get_host(db_provider, make_request('GET', headers)) == \
+        'replica'
+    assert await get_host(db_provider, make_request('POST', headers)) == \
+        'primary'
+    assert await get_host(
+        db_provider, make_request('GET', {'Authorization': 'Bearer second'})
+    ) == 'replica'
+    assert await get_host(
+        db_provider, make_request('GET', {**headers, READ_PRIMARY_HEADER: '1'})
+    ) == 'primary'
+
+
+@pytest.mark.asyncio
+async def test_write_is_marked_before_the_response(
+        db_provider: DatabaseProvider
+):
+    headers = {'Authorization': 'Bearer first'}
+    dependency = db_provider.dao(make_request('PUT', headers))
+    await anext(dependency)
+
+    assert await get_host(db_provider, make_request('GET', headers)) == \
+        'primary'
+    await dependency.aclose()
+
+    await asyncio.sleep(WINDOW.total_seconds())
+    assert await get_host(db_provider, make_request('GET', headers)) == \
+        'replica'
+
+
+@pytest.mark.asyncio
+async def test_recent_writes_drop_expired_clients():
+    recent_writes = RecentWrites(WINDOW)
+    recent_writes.put('first')
+    recent_writes.put('second')
+    assert recent_writes.contains('first')
+    assert not recent_writes.contains('third')
+
+    await asyncio.sleep(WINDOW.total_seconds())
+    recent_writes.put('third')
+    assert list(recent_writes._writes) == ['third']
+    assert not recent_writes.contains('first')
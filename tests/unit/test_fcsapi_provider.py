@@ -0,0 +1,60 @@
+import httpx
+import pytest
+
+from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.price_providers import FCSAPIProvider, \
+    PriceProviderPartiallyUnavailable, StubPriceProvider
+from finances.services.currency_prices import get_prices
+
+CODES = {'AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF'}
+
+
+def make_provider(failing_code: str, status_code: int = 503) \
+        -> FCSAPIProvider:
+    def handle(request: httpx.Request) -> httpx.Response:
+        symbols = request.url.params['symbol'].split(',')
+        if f'USD/{failing_code}' in symbols:
+            if status_code >= 500:
+                return httpx.Response(status_code)
+            return httpx.Response(status_code, json={'status': False})
+        return httpx.Response(200, json={
+            'status': True,
+            'response': [{'s': symbol, 'c': str(len(symbol))} for symbol in
+                         symbols]
+        })
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handle))
+    return FCSAPIProvider('key', client, chunk_size=2, max_concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_unavailable_chunk_keeps_other_prices():
+    provider = make_provider('CCC')
+
+    with pytest.raises(PriceProviderPartiallyUnavailable) as e:
+        await provider.get_prices(CODES)
+
+    assert set(e.value.prices) == CODES - {'CCC', 'DDD'}
+    assert provider.get_request_rounds(CODES) == 2
+
+
+@pytest.mark.asyncio
+async def test_unavailable_chunk_is_missing_and_counts_for_breaker():
+    currency_api = CurrencyAPI(make_provider('CCC'), StubPriceProvider())
+
+    prices = await get_prices(None, set(CODES), currency_api)
+
+    assert prices.missing == {'CCC', 'DDD'}
+    assert set(prices.prices) == CODES - {'CCC', 'DDD'} | {'USD'}
+    assert currency_api.currency_breaker.failures == 1
+
+
+@pytest.mark.asyncio
+async def test_rejected_chunk_is_missing_without_breaker_failure():
+    currency_api = CurrencyAPI(make_provider('EEE', status_code=200),
+                               StubPriceProvider())
+
+    prices = await get_prices(None, set(CODES), currency_api)
+
+    assert prices.missing == {'EEE', 'FFF'}
+    assert currency_api.currency_breaker.failures == 0
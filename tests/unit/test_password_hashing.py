@@ -0,0 +1,56 @@
+import threading
+from datetime import timedelta
+
+import pytest
+from fastapi import APIRouter
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from api import v1
+from api.main_factory import create_app
+from api.v1.dependencies import AuthProvider, CurrencyAPI, PriceHub, \
+    get_auth_provider
+from api.v1.dependencies.price_providers import StubPriceProvider
+from finances.models.dto import Config, DatabaseConfig, AuthConfig
+
+
+def make_auth_config() -> AuthConfig:
+    return AuthConfig(secret_key='secret', token_expire=timedelta(days=1),
+                      password_hash_workers=2)
+
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_in_thread_pool():
+    auth = AuthProvider(make_auth_config())
+    hashing_threads = []
+    get_password_hash = auth.get_password_hash
+
+    def record_thread(password: str) -> str:
+        hashing_threads.append(threading.current_thread().name)
+        return get_password_hash(password)
+
+    auth.get_password_hash = record_thread
+    hashed_password = await auth.get_password_hash_async('12345')
+
+    assert hashing_threads[0].startswith('password-hash')
+    assert await auth.verify_password_async('12345', hashed_password)
+    assert not await auth.verify_password_async('54321', hashed_password)
+    auth.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_password_hash_executor_shuts_down_with_app():
+    app = create_app()
+    config = Config(db=DatabaseConfig(host='localhost', password='',
+                                      username='', database=''),
+                    auth=make_auth_config(), fcsapi_access_key='')
+    v1.dependencies.setup(app, APIRouter(), async_sessionmaker(), config,
+                          CurrencyAPI(StubPriceProvider(),
+                                      StubPriceProvider()),
+                          PriceHub())
+    auth = app.dependency_overrides[get_auth_provider]()
+    await auth.get_password_hash_async('12345')
+
+    await app.router.shutdown()
+
+    with pytest.raises(RuntimeError):
+        await auth.get_password_hash_async('12345')
@@ -0,0 +1,48 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from api.v1.dependencies.periodic_task import PeriodicTask
+
+
+class CountingTask(PeriodicTask):
+    def __init__(self, interval: timedelta, runs: int | None = None,
+                 error: Exception | None = None):
+        super().__init__(interval)
+        self.runs = runs
+        self.error = error
+        self.calls = 0
+
+    async def run_once(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+
+    def is_done(self) -> bool:
+        return self.runs is not None and self.calls >= self.runs
+
+
+@pytest.mark.asyncio
+async def test_runs_until_stopped():
+    task = CountingTask(timedelta(milliseconds=10),
+                        error=RuntimeError('refresh failed'))
+    await task.start()
+    await asyncio.sleep(0.055)
+    await task.stop()
+
+    calls = task.calls
+    assert calls >= 3
+    await asyncio.sleep(0.03)
+    assert task.calls == calls
+    await task.stop()
+
+
+@pytest.mark.asyncio
+async def test_stops_when_done():
+    task = CountingTask(timedelta(), runs=3)
+    await task.start()
+    await asyncio.wait_for(task._task, timeout=1)
+
+    assert task.calls == 3
+    await task.stop()
@@ -0,0 +1,76 @@
+import asyncio
+from _decimal import Decimal
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.price_providers import StubPriceProvider
+from tests.fixtures.price_provider_data import CountingPriceProvider
+
+
+def make_stale(currency_api: CurrencyAPI):
+    for cached_price in currency_api.price_cache._prices.values():
+        cached_price.updated = datetime.utcnow() - timedelta(minutes=10)
+
+
+async def wait_background_tasks(currency_api: CurrencyAPI):
+    await asyncio.gather(*currency_api._background_tasks)
+
+
+@pytest.mark.asyncio
+async def test_stale_price_is_served_while_revalidating():
+    currency_provider = CountingPriceProvider({'EUR': Decimal('0.9')})
+    currency_api = CurrencyAPI(currency_provider, StubPriceProvider())
+
+    prices = await currency_api.get_currency_prices({'EUR'})
+    assert prices == {'EUR': Decimal('0.9')}
+    assert len(currency_provider.calls) == 1
+
+    make_stale(currency_api)
+    currency_provider.prices['EUR'] = Decimal('0.95')
+    currency_provider.latency = 0.05
+    started = datetime.utcnow()
+    prices = await currency_api.get_currency_prices({'EUR'})
+    assert datetime.utcnow() - started < timedelta(seconds=0.05)
+    assert prices == {'EUR': Decimal('0.9')}
+    assert currency_api.is_stale(
+        currency_api.get_currency_prices_updated({'EUR'}))
+
+    await wait_background_tasks(currency_api)
+    assert len(currency_provider.calls) == 2
+    prices = await currency_api.get_currency_prices({'EUR'})
+    assert prices == {'EUR': Decimal('0.95')}
+    assert not currency_api.is_stale(
+        currency_api.get_currency_prices_updated({'EUR'}))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stale_reads_refresh_once():
+    currency_provider = CountingPriceProvider({'EUR': Decimal('0.9')},
+                                              latency=timedelta(
+                                                  milliseconds=50))
+    currency_api = CurrencyAPI(currency_provider, StubPriceProvider())
+    await currency_api.get_currency_prices({'EUR'})
+    make_stale(currency_api)
+
+    await asyncio.gather(*(currency_api.get_currency_prices({'EUR'})
+                           for _ in range(5)))
+    assert len(currency_api._background_tasks) == 1
+    assert currency_api.price_cache._refreshing == {('USD', 'EUR')}
+
+    await wait_background_tasks(currency_api)
+    assert len(currency_provider.calls) == 2
+    assert currency_api.price_cache._refreshing == set()
+
+
+@pytest.mark.asyncio
+async def test_cross_rate_with_non_usd_base_currency():
+    currency_provider = CountingPriceProvider({'EUR': Decimal('0.9'),
+                                               'GBP': Decimal('0.8')})
+    currency_api = CurrencyAPI(currency_provider, StubPriceProvider())
+
+    prices = await currency_api.get_currency_prices({'GBP', 'USD'}, 'EUR')
+    assert prices == {'GBP': Decimal('0.8') / Decimal('0.9'),
+                      'USD': 1 / Decimal('0.9')}
+    assert currency_provider.calls == [{'EUR', 'GBP'}]
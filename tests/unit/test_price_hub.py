@@ -0,0 +1,131 @@
+import json
+import uuid
+from _decimal import Decimal
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from api.v1.dependencies import CurrencyAPI, PriceHub
+from api.v1.dependencies.price_hub import ReplayPriceFeed
+from api.v1.dependencies.price_providers import StubPriceProvider
+from finances.models import dto
+from finances.services.crypto_portfolio import get_total_by_holdings
+
+HOLDINGS = {'BTC': Decimal('0.5'), 'ETH': Decimal('3'), 'SOL': Decimal('10')}
+TICKS = [
+    ('BTC', '20000'), ('ETH', '1500'), ('SOL', '20'), ('BTC', '20500.5'),
+    ('ETH', '1490.25'), ('BTC', '19999.99'), ('SOL', '21.3'), ('ETH', '1600'),
+]
+
+
+def write_ticks(path: Path, ticks: list[tuple[str, str]]) -> Path:
+    started = datetime(2023, 1, 1)
+    with open(path, 'w') as ticks_file:
+        for i, (code, price) in enumerate(ticks):
+            ticks_file.write(json.dumps({
+                'code': code,
+                'price': price,
+                'time': (started + timedelta(seconds=i)).isoformat()
+            }) + '\n')
+    return path
+
+
+def get_expected_total(holdings: dict[str, Decimal],
+                       ticks: list[tuple[str, str]]) -> Decimal:
+    prices = {code: Decimal(price) for code, price in ticks}
+    return sum(amount * prices[code] for code, amount in holdings.items())
+
+
+@pytest.fixture
+def user() -> dto.User:
+    return dto.User(id=uuid.uuid4(), username='hub')
+
+
+@pytest.mark.asyncio
+async def test_incremental_valuation_matches_full_valuation(
+        tmp_path: Path,
+        user: dto.User
+):
+    price_hub = PriceHub()
+    currency_api = CurrencyAPI(StubPriceProvider(), StubPriceProvider())
+    portfolio_id = uuid.uuid4()
+    price_hub.track(user.id, portfolio_id, HOLDINGS)
+    assert price_hub.get_valuation(user.id, portfolio_id) is None
+
+    feed = ReplayPriceFeed(price_hub, write_ticks(tmp_path / 'ticks.jsonl',
+                                                  TICKS), speed=1000)
+    assert await feed.replay() == len(TICKS)
+
+    incremental_total = await get_total_by_holdings(
+        portfolio_id, None, user, currency_api, price_hub)
+    full_total = await get_total_by_holdings(
+        portfolio_id, HOLDINGS, user, currency_api, price_hub)
+    assert incremental_total.total == full_total.total == \
+        get_expected_total(HOLDINGS, TICKS)
+
+
+@pytest.mark.asyncio
+async def test_invalidate_after_holdings_change(tmp_path: Path,
+                                                user: dto.User):
+    price_hub = PriceHub()
+    currency_api = CurrencyAPI(StubPriceProvider(), StubPriceProvider())
+    portfolio_id = uuid.uuid4()
+    feed = ReplayPriceFeed(price_hub, write_ticks(tmp_path / 'ticks.jsonl',
+                                                  TICKS), speed=1000)
+    await feed.replay()
+    price_hub.track(user.id, portfolio_id, HOLDINGS)
+
+    price_hub.invalidate(user.id, portfolio_id)
+    assert price_hub.get_valuation(user.id, portfolio_id) is None
+    assert price_hub._holders == {}
+
+    holdings = {**HOLDINGS, 'BTC': Decimal('1')}
+    total = await get_total_by_holdings(portfolio_id, holdings, user,
+                                        currency_api, price_hub)
+    assert total.total == get_expected_total(holdings, TICKS)
+
+    price_hub.publish_prices({'BTC': Decimal('21000')})
+    total = await get_total_by_holdings(portfolio_id, None, user,
+                                        currency_api, price_hub)
+    expected_total = get_expected_total(holdings, TICKS + [('BTC', '21000')])
+    assert total.total == expected_total
+
+
+def test_get_missing_codes():
+    price_hub = PriceHub()
+    price_hub.publish_prices({'BTC': Decimal('20000')})
+
+    assert price_hub.get_missing_codes({'BTC', 'ETH'}) == {'ETH'}
+    assert price_hub.get_missing_codes({'BTC'}) == set()
+
+
+def test_valuations_are_bounded():
+    price_hub = PriceHub(max_valuations=2)
+    price_hub.publish_prices({'BTC': Decimal('20000')})
+    user_id = uuid.uuid4()
+    first, second, third = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    holdings = {'BTC': Decimal('1')}
+
+    price_hub.track(user_id, first, holdings)
+    price_hub.track(user_id, second, holdings)
+    assert price_hub.get_valuation(user_id, first) is not None
+    price_hub.track(user_id, third, holdings)
+
+    assert price_hub.get_valuation(user_id, second) is None
+    assert price_hub.get_valuation(user_id, first) is not None
+    assert price_hub.get_valuation(user_id, third) is not None
+    assert price_hub._holders['BTC'] == {(user_id, first), (user_id, third)}
+
+
+def test_tracked_holdings_expire():
+    price_hub = PriceHub(holdings_ttl=timedelta(minutes=1))
+    price_hub.publish_prices({'BTC': Decimal('20000')})
+    user_id, portfolio_id = uuid.uuid4(), uuid.uuid4()
+    price_hub.track(user_id, portfolio_id, {'BTC': Decimal('1')})
+    assert price_hub.get_valuation(user_id, portfolio_id) is not None
+
+    price_hub._valuations[(user_id, portfolio_id)].tracked -= 61
+    assert price_hub.get_valuation(user_id, portfolio_id) is None
+    assert price_hub._valuations == {}
+    assert price_hub._holders == {}
@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+import pytest
+
+from api.v1.dependencies import CurrencyAPI
+from api.v1.dependencies.price_providers import StubPriceProvider
+from finances.services.currency_prices import refresh_crypto_prices
+from tests.fixtures.price_provider_data import CountingPriceProvider
+
+
+@pytest.mark.asyncio
+async def test_invalid_symbol_does_not_fail_the_refresh():
+    crypto_provider = CountingPriceProvider(invalid_codes={'BAD'})
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider)
+    codes = ['ADA', 'BAD', 'BTC', 'DOT', 'ETH', 'SOL']
+
+    failed_codes = await refresh_crypto_prices(codes, currency_api)
+
+    assert failed_codes == {'BAD'}
+    for code in codes:
+        cached_price = currency_api.price_cache.get(code, 'BUSD')
+        if code == 'BAD':
+            assert cached_price is None
+        else:
+            assert cached_price.price == crypto_provider.get_price(code)
+    assert len(crypto_provider.calls) < 2 * len(codes)
+    assert not currency_api.crypto_breaker.is_open
+
+
+@pytest.mark.asyncio
+async def test_unavailable_provider_stops_splitting():
+    crypto_provider = CountingPriceProvider(error_rate=1)
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider)
+    codes = ['ADA', 'BTC', 'DOT', 'ETH', 'SOL', 'XRP', 'LTC', 'TRX']
+
+    failed_codes = await refresh_crypto_prices(codes, currency_api)
+
+    assert failed_codes == set(codes)
+    assert len(crypto_provider.calls) == \
+        currency_api.crypto_breaker.failure_threshold
+
+
+@pytest.mark.asyncio
+async def test_rejected_symbol_is_skipped_until_cooldown():
+    crypto_provider = CountingPriceProvider(invalid_codes={'BAD'})
+    currency_api = CurrencyAPI(StubPriceProvider(), crypto_provider,
+                               rejected_code_cooldown=timedelta(hours=1))
+    codes = ['BAD', 'BTC', 'ETH']
+    assert await refresh_crypto_prices(codes, currency_api) == {'BAD'}
+
+    crypto_provider.calls.clear()
+    assert await refresh_crypto_prices(codes, currency_api) == {'BAD'}
+    assert crypto_provider.calls == [{'BTC', 'ETH'}]
+
+    currency_api.rejected_code_cooldown = 0
+    crypto_provider.calls.clear()
+    assert await refresh_crypto_prices(codes, currency_api) == {'BAD'}
+    assert {'BAD'} in crypto_provider.calls
@@ -0,0 +1,18 @@
+import time
+from datetime import datetime
+
+from api.v1.models.response.total_result import TotalResult, \
+    TotalSeriesResult
+from finances.models import dto
+
+
+def test_server_time_is_set_per_response():
+    started = datetime.utcnow()
+    time.sleep(0.01)
+
+    total_result = TotalResult.from_dto(dto.Total(total=0))
+    total_series_result = TotalSeriesResult.from_dto(
+        dto.TotalSeries(series=[]))
+
+    assert total_result.server_time > started
+    assert total_series_result.server_time >= total_result.server_time